@@ -0,0 +1,209 @@
+"""
+Benchmark suite for the read and write throughput of the TensorStore.
+
+The benchmarks run against the local SQLite backend (`LocalSession`), thus they are
+reproducible without network access and measure the client-side cost of the store:
+upload throughput of `__setitem__`, read latency of `StoreSlicer` for full, first-axis
+and inner-axis point slices, the serialization cost of the payload formats, and the
+peak memory of each case. The results are written as JSON, along with the commit they
+were measured on, and can be compared to an earlier run.
+
+Example:
+
+    .. code-block:: bash
+        # measure and store the results
+        python benchmarks/run.py --output before.json
+
+        # measure again after a change and compare
+        python benchmarks/run.py --output after.json --compare before.json
+"""
+from typing import Callable, Dict, List, Optional
+import argparse
+import base64
+import io
+import json
+import os
+import platform
+import subprocess
+import sys
+import time
+import tracemalloc
+
+import numpy as np
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from tensorage.backend.database import encode_float4  # noqa: E402
+from tensorage.codecs import Codec  # noqa: E402
+from tensorage.session import LocalSession  # noqa: E402
+from tensorage.store import TensorStore  # noqa: E402
+
+
+# the dataset shapes, from small to large
+SIZES = {
+    'small': (100, 32, 32),
+    'medium': (500, 64, 64),
+    'large': (1000, 128, 128),
+}
+
+# the storage layouts of the uploaded datasets
+LAYOUTS = {
+    'rows': dict(),
+    'tiled': dict(chunk_shape=(100, 32, 32)),
+    'compressed': dict(compressor='shuffle+zlib'),
+}
+
+
+def measure(func: Callable[[], object], repeat: int) -> Dict[str, float]:
+    """
+    Runs the function repeat times and records the wall time and peak memory.
+
+    Args:
+        func (Callable[[], object]): The benchmarked function.
+        repeat (int): The number of runs.
+
+    Returns:
+        Dict[str, float]: The minimum, median and maximum time in seconds and the peak memory in MB.
+    """
+    times = []
+    peak = 0
+    for _ in range(repeat):
+        tracemalloc.start()
+        start = time.perf_counter()
+        func()
+        times.append(time.perf_counter() - start)
+        peak = max(peak, tracemalloc.get_traced_memory()[1])
+        tracemalloc.stop()
+
+    return dict(min=min(times), median=float(np.median(times)), max=max(times), peak_mb=peak / 2**20)
+
+
+def bench_serialization(data: np.ndarray, repeat: int) -> Dict[str, Dict[str, float]]:
+    """
+    Measures the encoding cost and payload size of the transport formats.
+    """
+    formats = {
+        'json': lambda: json.dumps([row.tolist() for row in data]),
+        'binary': lambda: [encode_float4(row) for row in data],
+        'shuffle+zlib': lambda: [base64.b64encode(Codec.from_spec('shuffle+zlib').encode(row)) for row in data],
+    }
+
+    # netCDF needs an optional xarray backend
+    try:
+        import xarray as xr
+
+        def netcdf():
+            buf = io.BytesIO()
+            xr.Dataset({'data': xr.DataArray(data)}).to_netcdf(buf)
+            return buf.getvalue()
+        netcdf()
+        formats['netcdf'] = netcdf
+    except (ImportError, ValueError):
+        pass
+
+    results = dict()
+    for name, func in formats.items():
+        payload = func()
+        results[name] = measure(func, repeat)
+        results[name]['payload_mb'] = (len(payload) if isinstance(payload, (str, bytes)) else sum(len(p) for p in payload)) / 2**20
+    return results
+
+
+def bench_store(shape: tuple, layout: dict, repeat: int) -> Dict[str, Dict[str, float]]:
+    """
+    Measures the upload of a dataset and the reads of different slice shapes.
+    """
+    data = np.random.random(shape).astype(np.float32)
+    results = dict()
+
+    # a fresh in-memory database for each upload
+    def upload():
+        store = TensorStore(LocalSession(), engine='local', quiet=True, **layout)
+        store['bench'] = data
+        return store
+
+    results['upload'] = measure(upload, repeat)
+    results['upload']['throughput_mb_s'] = data.nbytes / 2**20 / results['upload']['median']
+
+    # read from one store
+    store = upload()
+    reads = {
+        'read_full': lambda: store['bench'],
+        'read_first_axis': lambda: store['bench', 10:20],
+        'read_point_series': lambda: store['bench', :, 4, 4],
+    }
+    for name, func in reads.items():
+        results[name] = measure(func, repeat)
+
+    return results
+
+
+def git_commit() -> Optional[str]:
+    try:
+        return subprocess.check_output(['git', 'rev-parse', '--short', 'HEAD'], cwd=os.path.dirname(os.path.abspath(__file__)), stderr=subprocess.DEVNULL).decode().strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def compare(results: dict, baseline: dict, threshold: float) -> List[str]:
+    """
+    Compares the median times of two runs.
+
+    Returns:
+        List[str]: A line for each case that is slower than threshold times the baseline.
+    """
+    lines = []
+    for group, cases in results['benchmarks'].items():
+        for case, metrics in cases.items():
+            for name, values in metrics.items():
+                base = baseline.get('benchmarks', {}).get(group, {}).get(case, {}).get(name)
+                if base is None or base['median'] == 0:
+                    continue
+                ratio = values['median'] / base['median']
+                print(f"{group:>24s} {case:>12s} {name:>18s} {ratio:6.2f}x")
+                if ratio > threshold:
+                    lines.append(f"{group}/{case}/{name} is {ratio:.2f}x slower")
+    return lines
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('--sizes', nargs='+', default=['small', 'medium'], choices=list(SIZES.keys()))
+    parser.add_argument('--layouts', nargs='+', default=list(LAYOUTS.keys()), choices=list(LAYOUTS.keys()))
+    parser.add_argument('--repeat', type=int, default=3)
+    parser.add_argument('--output', default=None, help='Path of the JSON results. Defaults to benchmark-<commit>.json')
+    parser.add_argument('--compare', default=None, help='Path of the JSON results of an earlier run')
+    parser.add_argument('--threshold', type=float, default=1.2, help='Slowdown ratio reported as regression')
+    args = parser.parse_args(argv)
+
+    commit = git_commit()
+    results = dict(
+        commit=commit,
+        python=platform.python_version(),
+        numpy=np.__version__,
+        machine=platform.machine(),
+        benchmarks=dict(),
+    )
+
+    for size in args.sizes:
+        data = np.random.random(SIZES[size]).astype(np.float32)
+        results['benchmarks'][f'serialization/{size}'] = {'formats': bench_serialization(data, args.repeat)}
+        results['benchmarks'][f'store/{size}'] = {layout: bench_store(SIZES[size], LAYOUTS[layout], args.repeat) for layout in args.layouts}
+
+    output = args.output or f"benchmark-{commit or 'local'}.json"
+    with open(output, 'w') as f:
+        json.dump(results, f, indent=2)
+    print(f"Results written to {output}")
+
+    if args.compare is not None:
+        with open(args.compare, 'r') as f:
+            regressions = compare(results, json.load(f), args.threshold)
+        for line in regressions:
+            print(f"REGRESSION: {line}")
+        return 1 if len(regressions) > 0 else 0
+
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -3,4 +3,4 @@ TensOrage is a Python library for storing tensor data into a Supabase backend da
 """
 from .__version__ import __version__
 
-from .auth import login, signup
\ No newline at end of file
+from .auth import login, alogin, signup, open_local
\ No newline at end of file
@@ -0,0 +1,295 @@
+"""
+This module defines the AsyncTensorStore class, the asyncio-native counterpart of the TensorStore.
+All methods talking to the backend are coroutines, thus many slice reads can run concurrently
+on one event loop without blocking it.
+
+Example:
+
+    .. code-block:: python
+        # login
+        store = await alogin('email', 'password')
+
+        # insert a new dataset into the store
+        await store.set('my_dataset', np.random.random((500, 10, 10)))
+
+        # read slices concurrently
+        first, series = await asyncio.gather(
+            store.get('my_dataset', slice(0, 12)),
+            store.get('my_dataset', slice(None), 4, 4)
+        )
+
+        # iterate over batches along the first axis
+        async for batch in store.iter_batches('my_dataset', 100):
+            ...
+"""
+from typing import TYPE_CHECKING, Any, AsyncIterator, Dict, Optional, Tuple, Union, List
+from typing_extensions import Literal
+from dataclasses import dataclass, field
+import asyncio
+import warnings
+
+import numpy as np
+
+from tensorage.store import split_batches
+from tensorage.tiles import split_tiles, batch_tiles, row_chunk_shape
+from tensorage.types import Dataset
+from tensorage.indexing import apply_steps, resolve_selection
+
+if TYPE_CHECKING:  # pragma: no cover
+    from tensorage.session import AsyncBackendSession
+
+
+@dataclass
+class AsyncTensorStore(object):
+    """
+    A class representing an async tensor store for storing and retrieving tensor data from a backend.
+
+    Attributes:
+        backend (AsyncBackendSession): The async backend session to use for interacting with the backend.
+        engine (str): The engine to use for storing and retrieving tensor data.
+        chunk_size (int): The chunk size to use for uploading tensor data.
+        chunk_shape (Optional[Tuple[int]]): If set, new datasets are stored in the tiled layout with tiles of this shape.
+        compressor (Optional[str]): The codec spec, like 'shuffle+zlib', to compress new datasets with.
+        max_workers (int): The maximum number of batches uploaded, or datasets read by get_many, concurrently.
+
+    """
+    backend: 'AsyncBackendSession' = field(repr=False)
+
+    engine: Union[Literal['database'], Literal['storage']] = field(default='database')
+
+    # some stuff for upload
+    chunk_size: int = field(default=100000, repr=False)
+    chunk_shape: Optional[Tuple[int]] = field(default=None, repr=False)
+    compressor: Optional[str] = field(default=None, repr=False)
+    max_workers: int = field(default=8, repr=False)
+    allow_overwrite: bool = False
+
+    # add some internal metadata
+    _keys: List[str] = field(default_factory=list, repr=False)
+
+    def context(self):
+        """
+        Get the async context manager of the backend for the configured engine.
+        """
+        return self.backend.storage() if self.engine == 'storage' else self.backend.database()
+
+    async def check_schema(self) -> bool:
+        """
+        Checks if the schema is installed in the database and warns if not.
+
+        Returns:
+            bool: True if the schema is installed, False otherwise.
+        """
+        async with self.backend.database() as db:
+            installed = await db.check_schema_installed()
+
+        if not installed:
+            from tensorage.sql.sql import INIT
+            warnings.warn(f"The schema for the TensorStore is not installed. Please connect the database and run the following script:\n\n--------8<--------\n{INIT()}\n\n--------8<--------\n")
+
+        return installed
+
+    async def keys(self) -> List[str]:
+        """
+        Retrieves a list of all dataset keys in the database.
+
+        Returns:
+            List[str]: A list of all dataset keys in the database.
+        """
+        async with self.context() as db:
+            self._keys = await db.list_dataset_keys()
+
+        return self._keys
+
+    async def contains(self, key: str) -> bool:
+        """
+        Checks if a tensor with the given key exists in the database.
+
+        Args:
+            key (str): The unique identifier for the tensor.
+
+        Returns:
+            bool: True if the tensor with the given key exists in the database, False otherwise.
+        """
+        return key in await self.keys()
+
+    async def get_dataset(self, key: str) -> Dataset:
+        """
+        Retrieves the dataset metadata of the given key.
+
+        Args:
+            key (str): The unique identifier for the tensor.
+
+        Returns:
+            Dataset: The dataset with the given key.
+        """
+        async with self.context() as db:
+            return await db.get_dataset(key)
+
+    async def get(self, key: str, *slices: Union[int, slice], dataset: Dataset = None) -> np.ndarray:
+        """
+        Retrieves a tensor from the database with the given key and iloc-style slices.
+        The slices follow the same rules as the StoreSlicer of the TensorStore.
+
+        Args:
+            key (str): The unique identifier for the tensor.
+            *slices (Union[int, slice]): The NumPy basic index selecting the tensor data.
+            dataset (Dataset): The dataset metadata, if already known. Saves one round trip.
+
+        Returns:
+            np.ndarray: The tensor data with the given iloc-style arguments.
+        """
+        async with self.context() as db:
+            if dataset is None:
+                dataset = await db.get_dataset(key)
+
+            selection = resolve_selection(slices, tuple(dataset.shape))
+            if selection.empty:
+                return selection.finalize(np.empty(selection.box_shape, dtype=np.float32))
+            index, slc = selection.index, selection.slices
+            kwargs = dict(step=selection.steps) if selection.strided else dict()
+
+            # load the tensor, the rows of an array index are taken from the bounding tiles
+            if dataset.chunk_shape is not None:
+                arr = await db.get_tiled_tensor(dataset, index[0], index[1], [s[0] for s in slc], [s[1] for s in slc], **kwargs)
+                if selection.fancy_rows:
+                    arr = arr[selection.take[0] - selection.start[0]]
+            elif selection.fancy_rows:
+                arr = apply_steps(await db.take_tensor(key, selection.rows, [s[0] for s in slc], [s[1] for s in slc]), selection.steps)
+            else:
+                arr = await db.get_tensor(key, index[0], index[1], [s[0] for s in slc], [s[1] for s in slc], **kwargs)
+            return selection.finalize(arr)
+
+    async def get_many(self, requests: List[Union[str, Tuple[str, Tuple[Any, ...]]]]) -> Dict[str, np.ndarray]:
+        """
+        Reads from several datasets at once, like TensorStore.get_many. The metadata is
+        resolved in a single query and the reads run concurrently, bounded by max_workers.
+
+        Args:
+            requests (List[Union[str, Tuple[str, Tuple[Any, ...]]]]): The keys, or pairs of a key and
+                the index selecting from the dataset.
+
+        Returns:
+            Dict[str, np.ndarray]: The tensor data by key.
+
+        Raises:
+            KeyError: If any of the datasets does not exist.
+            ValueError: If a key is requested more than once.
+        """
+        keys, indices = [], []
+        for request in requests:
+            key, index = (request, ()) if isinstance(request, str) else request
+            keys.append(key)
+            indices.append(index if isinstance(index, tuple) else (index, ))
+
+        if len(set(keys)) != len(keys):
+            raise ValueError('Each key can only be requested once.')
+        if len(keys) == 0:
+            return {}
+
+        async with self.context() as db:
+            datasets = {dataset.key: dataset for dataset in await db.get_datasets(keys)}
+        unknown = [key for key in keys if key not in datasets]
+        if len(unknown) > 0:
+            raise KeyError(f"Datasets not found: {', '.join(unknown)}")
+
+        semaphore = asyncio.Semaphore(self.max_workers)
+
+        async def read(key: str, index: Tuple[Any, ...]) -> np.ndarray:
+            async with semaphore:
+                return await self.get(key, *index, dataset=datasets[key])
+
+        arrays = await asyncio.gather(*[read(key, index) for key, index in zip(keys, indices)])
+        return dict(zip(keys, arrays))
+
+    async def iter_batches(self, key: str, batch_size: int, *slices: Union[int, slice]) -> AsyncIterator[np.ndarray]:
+        """
+        Iterates over consecutive batches along the first axis of the tensor.
+
+        Args:
+            key (str): The unique identifier for the tensor.
+            batch_size (int): The number of elements along the first axis per batch.
+            *slices (Union[int, slice]): Slices applied to the inner axes of every batch.
+
+        Yields:
+            np.ndarray: The next batch of the tensor.
+        """
+        dataset = await self.get_dataset(key)
+
+        for start in range(0, dataset.shape[0], batch_size):
+            yield await self.get(key, slice(start, min(start + batch_size, dataset.shape[0])), *slices, dataset=dataset)
+
+    async def set(self, key: str, value: Union[List[list], np.ndarray]):
+        """
+        Uploads a dataset into the backend with the given key and value.
+        The batches are uploaded concurrently, bounded by max_workers.
+
+        Args:
+            key (str): The unique identifier for the tensor.
+            value (Union[List[list], np.ndarray]): The tensor data to be set.
+
+        Raises:
+            ValueError: If the key already exists and allow_overwrite is False.
+        """
+        # check if the key is already in the database
+        if await self.contains(key):
+            # check if we are allowed to overwrite
+            if not self.allow_overwrite:
+                raise ValueError(f"The key '{key}' already exists in the TensorStore. Set allow_overwrite=True to overwrite the existing dataset.")
+
+            # otherwise delete the dataset
+            await self.delete(key)
+
+        # first make a numpy array from it
+        if isinstance(value, list):
+            value = np.asarray(value)
+
+        # make at least 2D
+        if value.ndim == 1:
+            value = value.reshape(1, -1)
+
+        # split into batches for upload, tiles do not have an offset
+        tiled = self.chunk_shape is not None or self.compressor is not None
+        if tiled:
+            chunk_shape = tuple(self.chunk_shape) if self.chunk_shape is not None else row_chunk_shape(value.shape, self.chunk_size)
+            batches = [(None, batch) for batch in batch_tiles(split_tiles(value, chunk_shape), self.chunk_size)]
+        else:
+            batches, _ = split_batches(value, self.chunk_size)
+
+        async with self.context() as db:
+            # insert the dataset
+            if tiled:
+                dataset = await db.insert_dataset(key, value.shape, value.ndim, chunk_shape=chunk_shape, compressor=self.compressor)
+            else:
+                dataset = await db.insert_dataset(key, value.shape, value.ndim)
+
+            # bound the number of concurrent uploads
+            semaphore = asyncio.Semaphore(self.max_workers)
+
+            async def upload(offset: Optional[int], batch: Union[np.ndarray, list]):
+                async with semaphore:
+                    if offset is None:
+                        return await db.insert_tiles(dataset.id, batch, compressor=self.compressor)
+                    return await db.insert_tensor(dataset.id, [tensor for tensor in batch], offset=offset)
+
+            # upload all batches, the first failure cancels the others
+            tasks = [asyncio.ensure_future(upload(offset, batch)) for offset, batch in batches]
+            try:
+                await asyncio.gather(*tasks)
+            except BaseException:
+                for task in tasks:
+                    task.cancel()
+                raise
+
+            # finally update the keys
+            self._keys = await db.list_dataset_keys()
+
+    async def delete(self, key: str):
+        """
+        Deletes a tensor from the database with the given key.
+
+        Args:
+            key (str): The unique identifier for the tensor.
+        """
+        async with self.context() as db:
+            await db.remove_dataset(key)
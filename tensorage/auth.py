@@ -13,7 +13,8 @@ import json
 from gotrue.types import AuthResponse
 
 from .store import TensorStore
-from .session import BackendSession
+from .async_store import AsyncTensorStore
+from .session import BackendSession, AsyncBackendSession, LocalSession
 
 
 # supabase connection file
@@ -132,6 +133,39 @@ def login(email: Optional[str] = None, password: Optional[str] = None, backend_u
     return store
 
 
+async def alogin(email: Optional[str] = None, password: Optional[str] = None, backend_url: Optional[str] = None, backend_key: Optional[str] = None) -> AsyncTensorStore:
+    """
+    Log in to the Supabase backend using email and password authentication, using the async client.
+
+    This function works like `login`, but returns an `AsyncTensorStore` bound to an `AsyncBackendSession`.
+    The session is logged in right away, so that authentication errors are raised here.
+
+    :param email: The email address of the user to log in.
+    :param password: The password of the user to log in.
+    :param backend_url: The URL of the Supabase backend. Defaults to `None`.
+    :param backend_key: The API key for the Supabase backend. Defaults to `None`.
+    :return: The async tensor store instance for the backend session.
+    :raises RuntimeError: If the login fails.
+    """
+    # get the environment variables
+    backend_url, backend_key, email, password = _get_auth_info(backend_url=backend_url, backend_key=backend_key, email=email, password=password)
+
+    # check that email and password are supplied
+    if email is None or password is None:
+        raise RuntimeError(f"Email and password are not saved in {SUPA_FILE} and must therfore be supplied for login.")
+
+    # get a session and log in
+    session = AsyncBackendSession(email, password, backend_url, backend_key)
+    await session.ensure_session()
+
+    # bind the session to the Store
+    store = AsyncTensorStore(session)
+    await store.check_schema()
+
+    # return the store
+    return store
+
+
 def signup(email: str, password: str, backend_url: Optional[str] = None, backend_key: Optional[str] = None) -> AuthResponse:
     """
     Sign up a new user to the Supabase backend using email and password authentication.
@@ -154,3 +188,13 @@ def signup(email: str, password: str, backend_url: Optional[str] = None, backend
     # register
     response = session.register_by_mail(email, password)
     return response
+
+
+def open_local(path: str = ':memory:') -> TensorStore:
+    """
+    Open a TensorStore on a local SQLite database, which does not need any network access.
+
+    :param path: The path of the SQLite database file. Use ':memory:' for a temporary database.
+    :return: A TensorStore working on the local database.
+    """
+    return LocalSession(path)()
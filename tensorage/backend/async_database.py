@@ -0,0 +1,396 @@
+"""This module defines the AsyncDatabaseContext class, the asyncio-native counterpart of the DatabaseContext."""
+from typing import Tuple, List, Optional
+import base64
+
+from postgrest.exceptions import APIError
+import numpy as np
+
+from tensorage.types import Dataset
+from tensorage.tiles import Coords, resolve_bounds, tile_range, tile_shape, assemble_tiles
+from tensorage.indexing import apply_steps
+from tensorage.codecs import Codec, encode_chunks, decode_chunks
+from .base import AsyncBaseContext
+from .database import FUNCTION_NOT_FOUND, encode_float4, decode_float4
+
+
+class AsyncDatabaseContext(AsyncBaseContext):
+    """
+    A class representing an async database context for interacting with the Supabase backend and its underlying Postgres database.
+    All methods are coroutines and can be awaited concurrently on the same event loop.
+    """
+    async def __setup_auth(self):
+        """
+        Sets up the authentication for the async Supabase client using the JWT of the long-lived session.
+        """
+        # make sure the borrowed session is still valid
+        session = await self.backend.ensure_session()
+
+        # set the JWT of the authenticated user as the new token
+        self.backend.client.postgrest.auth(session.access_token)
+
+    async def check_schema_installed(self) -> bool:
+        """
+        Checks if the required schema is installed in the database.
+        Right now, only the tables 'datasets' and 'tensors_float4' are checked for exitence.
+
+        Returns:
+            bool: True if the schema is installed, False otherwise.
+        """
+        # setup auth token
+        await self.__setup_auth()
+
+        # check if the datasets and tensor_float4 tables exist
+        missing_table = False
+
+        for table in ('datasets', 'tensors_float4'):
+            try:
+                await self.backend.client.table(table).select('*', count='exact').limit(1).execute()
+            except APIError as e:
+                if e.code == '42P01':
+                    missing_table = True
+                else:  # pragma: no cover
+                    raise e
+
+        # check if any of the needed tables was not found
+        return not missing_table
+
+    async def insert_dataset(self, key: str, shape: Tuple[int], dim: int, chunk_shape: Optional[Tuple[int]] = None, compressor: Optional[str] = None) -> Dataset:
+        """
+        Inserts a new dataset into the database with the given key, shape, and dimension.
+
+        Args:
+            key (str): The unique identifier for the dataset.
+            shape (Tuple[int]): The shape of the dataset.
+            dim (int): The dimension of the dataset.
+            chunk_shape (Optional[Tuple[int]]): The shape of the tiles, if the dataset is stored in the tiled layout.
+            compressor (Optional[str]): The codec spec the tiles are compressed with.
+
+        Returns:
+            Dataset: The newly created dataset object.
+        """
+        record = {'key': key, 'shape': shape, 'ndim': dim, 'user_id': self.user_id}
+        if chunk_shape is not None:
+            record['chunk_shape'] = list(chunk_shape)
+        if compressor is not None:
+            record['compressor'] = compressor
+
+        # run the insert
+        await self.__setup_auth()
+        response = await self.backend.client.table('datasets').insert(record).execute()
+
+        # return an instance of Dataset
+        data = response.data[0]
+        return Dataset(id=data['id'], key=data['key'], shape=data['shape'], ndim=data['ndim'], is_shared=data['is_shared'], type=data['type'], chunk_shape=data.get('chunk_shape'), compressor=data.get('compressor'))
+
+    async def insert_tensor(self, data_id: int, data: List[np.ndarray], offset: int = 0) -> bool:
+        """
+        Inserts a tensor into the database with the given data ID, data, and offset.
+        Each chunk is sent as binary float32 buffer, like in DatabaseContext.insert_tensor.
+
+        Args:
+            data_id (int): The unique identifier for the tensor data.
+            data (List[np.ndarray]): The tensor data to be inserted.
+            offset (int): The offset to start inserting the tensor data.
+
+        Returns:
+            bool: True if the tensor data was successfully inserted, False otherwise.
+        """
+        # setup auth token
+        await self.__setup_auth()
+
+        # encode the chunks as binary buffers
+        tensors = [encode_float4(chunk) for chunk in data]
+        dims = list(np.shape(data[0]))
+
+        # run the insert
+        try:
+            await self.backend.client.rpc('tensor_float4_insert', {'data_id': data_id, 'index_offset': int(offset), 'dims': dims, 'tensors': tensors}).execute()
+        except APIError as e:
+            # the database schema is outdated, fall back to the JSON insert
+            if e.code == FUNCTION_NOT_FOUND:
+                await self.backend.client.table('tensors_float4').insert([{'data_id': data_id, 'index': int(i + 1 + offset), 'user_id': self.user_id, 'tensor': chunk.tolist()} for i, chunk in enumerate(data)]).execute()
+            else:
+                raise e
+
+        return True
+
+    async def get_dataset(self, key: str) -> Dataset:
+        """
+        Retrieves the dataset with the given key from the database.
+
+        Args:
+            key (str): The unique identifier for the dataset.
+
+        Returns:
+            Dataset: The dataset object with the given key.
+        """
+        # setup auth token
+        await self.__setup_auth()
+
+        # get the dataset
+        response = await self.backend.client.table('datasets').select('*').eq('key', key).execute()
+
+        # grab the data
+        data = response.data[0]
+
+        # return as Dataset
+        # TODO -> here we hardcode the type to float32 as nothing else is implemented so far
+        return Dataset(id=data['id'], key=data['key'], shape=data['shape'], ndim=data['ndim'], is_shared=data['is_shared'], type='float32', chunk_shape=data.get('chunk_shape'), compressor=data.get('compressor'))
+
+    async def get_datasets(self, keys: List[str]) -> List[Dataset]:
+        """
+        Retrieves the datasets with the given keys in a single query, like in DatabaseContext.get_datasets.
+
+        Args:
+            keys (List[str]): The unique identifiers of the datasets.
+
+        Returns:
+            List[Dataset]: The existing datasets, in no particular order.
+        """
+        # setup auth token
+        await self.__setup_auth()
+
+        # get all datasets at once
+        response = await self.backend.client.table('datasets').select('*').in_('key', list(keys)).execute()
+
+        return [
+            Dataset(id=data['id'], key=data['key'], shape=data['shape'], ndim=data['ndim'], is_shared=data['is_shared'], type='float32', chunk_shape=data.get('chunk_shape'), compressor=data.get('compressor'))
+            for data in response.data
+        ]
+
+    async def get_tensor(self, key: str, index_low: int, index_up: int, slice_low: List[int], slice_up: List[int], step: Optional[List[int]] = None) -> np.ndarray:
+        """
+        Retrieves a tensor from the database with the given key, index range, and slice range.
+        The slice is transferred as packed binary buffer and decoded into a float32 array,
+        like in DatabaseContext.get_tensor.
+
+        Args:
+            key (str): The unique identifier for the tensor.
+            index_low (int): The lower index bound for the tensor.
+            index_up (int): The upper index bound for the tensor.
+            slice_low (List[int]): The lower slice bound for the tensor.
+            slice_up (List[int]): The upper slice bound for the tensor.
+            step (Optional[List[int]]): The step along each axis, counted from the lower bounds.
+
+        Returns:
+            np.ndarray: The tensor data with the given key, index range, and slice range.
+        """
+        # setup auth token
+        await self.__setup_auth()
+
+        params = {'name': key, 'index_low': index_low, 'index_up': index_up, 'slice_low': slice_low, 'slice_up': slice_up}
+
+        # only the elements on the steps are transferred
+        if step is not None:
+            try:
+                response = await self.backend.client.rpc('tensor_float4_slice_strided', {**params, 'steps': step}).execute()
+            except APIError as e:
+                # the database schema is outdated, stride the full slice
+                if e.code == FUNCTION_NOT_FOUND:
+                    return apply_steps(await self.get_tensor(key, index_low, index_up, slice_low, slice_up), step)
+                raise e
+
+            data = response.data[0]
+            if data['tensor'] is None:
+                return decode_float4(None, [0, *[len(range(low, up + 1, st)) for low, up, st in zip(slice_low, slice_up, step[1:])]])
+            return decode_float4(data['tensor'], data['shape'])
+
+        # get the requested chunk as packed binary buffer
+        try:
+            response = await self.backend.client.rpc('tensor_float4_slice_binary', params).execute()
+        except APIError as e:
+            # the database schema is outdated, fall back to the JSON slice
+            if e.code == FUNCTION_NOT_FOUND:
+                response = await self.backend.client.rpc('tensor_float4_slice', params).execute()
+                return np.asarray(response.data[0]['tensor'], dtype=np.float32)
+            raise e
+
+        # grab the data
+        data = response.data[0]
+
+        # empty slices do not report the inner dimensions
+        if data['tensor'] is None:
+            return decode_float4(None, [0, *[up - low + 1 for low, up in zip(slice_low, slice_up)]])
+
+        # return as np.ndarray
+        return decode_float4(data['tensor'], data['shape'])
+
+    async def take_tensor(self, key: str, indices: List[int], slice_low: List[int], slice_up: List[int]) -> np.ndarray:
+        """
+        Retrieves the rows at the given indices along the first axis in a single request,
+        like in DatabaseContext.take_tensor.
+
+        Args:
+            key (str): The unique identifier for the tensor.
+            indices (List[int]): The sorted, unique database indices of the rows.
+            slice_low (List[int]): The lower slice bound for the tensor.
+            slice_up (List[int]): The upper slice bound for the tensor.
+
+        Returns:
+            np.ndarray: The rows of the tensor data.
+        """
+        # setup auth token
+        await self.__setup_auth()
+
+        try:
+            response = await self.backend.client.rpc('tensor_float4_take', {'name': key, 'indices': list(indices), 'slice_low': slice_low, 'slice_up': slice_up}).execute()
+        except APIError as e:
+            # the database schema is outdated, load the runs of consecutive rows
+            if e.code == FUNCTION_NOT_FOUND:
+                return await super().take_tensor(key, indices, slice_low, slice_up)
+            raise e
+
+        data = response.data[0]
+        if data['tensor'] is None:
+            return decode_float4(None, [0, *[up - low + 1 for low, up in zip(slice_low, slice_up)]])
+        return decode_float4(data['tensor'], data['shape'])
+
+    async def insert_tiles(self, data_id: int, tiles: List[Tuple[Coords, np.ndarray]], compressor: Optional[str] = None) -> bool:
+        """
+        Inserts tiles of a dataset stored in the tiled layout, like in DatabaseContext.insert_tiles.
+
+        Args:
+            data_id (int): The unique identifier for the tensor data.
+            tiles (List[Tuple[Coords, np.ndarray]]): The coordinates of the tiles and the tiles.
+            compressor (Optional[str]): The codec spec to compress the tiles with.
+
+        Returns:
+            bool: True if the tiles were successfully inserted, False otherwise.
+        """
+        # setup auth token
+        await self.__setup_auth()
+
+        # the coordinates are sent flat, as all tiles have the same number of dimensions
+        coords = [int(c) for tile_coords, _ in tiles for c in tile_coords]
+        if compressor is not None:
+            tensors = [base64.b64encode(buf).decode('ascii') for buf in encode_chunks(Codec.from_spec(compressor), [tile for _, tile in tiles])]
+        else:
+            tensors = [encode_float4(tile) for _, tile in tiles]
+
+        # run the insert
+        await self.backend.client.rpc('tensor_float4_tiles_insert', {'data_id': data_id, 'coords': coords, 'tensors': tensors}).execute()
+
+        return True
+
+    async def get_tiled_tensor(self, dataset: Dataset, index_low: int, index_up: int, slice_low: List[int], slice_up: List[int], step: Optional[List[int]] = None) -> np.ndarray:
+        """
+        Retrieves a tensor of a dataset stored in the tiled layout, like in DatabaseContext.get_tiled_tensor.
+
+        Args:
+            dataset (Dataset): The tiled dataset.
+            index_low (int): The lower index bound for the tensor.
+            index_up (int): The upper index bound for the tensor.
+            slice_low (List[int]): The lower slice bound for the tensor.
+            slice_up (List[int]): The upper slice bound for the tensor.
+            step (Optional[List[int]]): The step along each axis, applied to the assembled tensor.
+
+        Returns:
+            np.ndarray: The tensor data with the given index range, and slice range.
+        """
+        # resolve the tiles involved
+        bounds = resolve_bounds(dataset.shape, index_low, index_up, slice_low, slice_up)
+        tile_coords = tile_range(bounds, dataset.chunk_shape)
+        if tile_coords is None:
+            return apply_steps(assemble_tiles(bounds, dataset.chunk_shape, []), step)
+
+        # setup auth token
+        await self.__setup_auth()
+
+        # load the tiles
+        response = await self.backend.client.rpc('tensor_float4_tiles', {'data_id': dataset.id, 'coords_low': list(tile_coords[0]), 'coords_up': list(tile_coords[1])}).execute()
+
+        coords = [tuple(row['coords']) for row in response.data]
+        shapes = [tile_shape(c, dataset.shape, dataset.chunk_shape) for c in coords]
+
+        # decode the tiles, compressed tiles are decompressed in the thread pool
+        if dataset.compressor is not None:
+            arrays = decode_chunks(Codec.from_spec(dataset.compressor), [base64.b64decode(row['tensor']) for row in response.data], shapes)
+        else:
+            arrays = [decode_float4(row['tensor'], shape, dtype='<f4') for row, shape in zip(response.data, shapes)]
+        tiles = list(zip(coords, arrays))
+
+        return apply_steps(assemble_tiles(bounds, dataset.chunk_shape, tiles), step)
+
+    async def remove_dataset(self, key: str) -> bool:
+        """
+        Removes the dataset with the given key from the database.
+
+        Args:
+            key (str): The unique identifier for the dataset.
+
+        Returns:
+            bool: True if the dataset was successfully removed, False otherwise.
+        """
+        # setup auth token
+        await self.__setup_auth()
+
+        # remove the dataset
+        await self.backend.client.table('datasets').delete().eq('key', key).execute()
+
+        # return
+        return True
+
+    async def list_dataset_keys(self) -> List[str]:
+        """
+        Retrieves a list of all dataset keys in the database.
+
+        Returns:
+            List[str]: A list of all dataset keys in the database.
+        """
+        # setup auth token
+        await self.__setup_auth()
+
+        # get the keys
+        response = await self.backend.client.table('datasets').select('key').execute()
+
+        return [row['key'] for row in response.data]
+
+    async def append_tensor(self, key: str, data: List[np.ndarray]) -> bool:
+        """
+        Appends a tensor to the existing tensor data with the given key.
+
+        Args:
+            key (str): The unique identifier for the tensor data.
+            data (List[np.ndarray]): The batches to be appended along the first axis.
+
+        Returns:
+            bool: True if the tensor data was successfully appended, False otherwise.
+
+        Raises:
+            KeyError: If the tensor data with the given ID does not exist in the database.
+        """
+        # first, get the dataset
+        try:
+            dataset = await self.get_dataset(key)
+        except (KeyError, IndexError):
+            raise KeyError(f"Dataset '{key}' not found. You cannot append to a non-existing datasets.")
+
+        # append the rows of each batch right after the last index
+        offset = dataset.shape[0]
+        for chunk in data:
+            await self.insert_tensor(data_id=dataset.id, data=[row for row in chunk], offset=offset)
+            offset += len(chunk)
+
+        # if there was no error, update the dataset
+        await self.set_dataset_shape(dataset.id, [offset, *dataset.shape[1:]])
+
+        return True
+
+    async def set_dataset_shape(self, data_id: int, shape: List[int]) -> bool:
+        """
+        Updates the shape of the dataset with the given id, after its tensor data was extended.
+
+        Args:
+            data_id (int): The unique identifier for the tensor data.
+            shape (List[int]): The new shape of the dataset.
+
+        Returns:
+            bool: True if the shape was successfully updated, False otherwise.
+        """
+        # setup auth token
+        await self.__setup_auth()
+
+        # update the dataset
+        await self.backend.client.table('datasets').update({'shape': tuple(int(size) for size in shape)}).eq('id', data_id).execute()
+
+        return True
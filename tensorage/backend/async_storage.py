@@ -0,0 +1,175 @@
+"""This module defines the AsyncStorageContext class, the asyncio-native counterpart of the StorageContext."""
+from typing import Any, Dict, List, Optional, Tuple
+import asyncio
+import io
+import json
+
+import numpy as np
+from storage3.utils import StorageException
+
+from tensorage.types import Dataset
+
+from .base import AsyncBaseContext
+from .storage import DOWNLOAD_WORKERS, LIST_LIMIT, decode_netcdf, encode_netcdf, is_not_found
+
+
+class AsyncStorageContext(AsyncBaseContext):
+    async def __setup_auth(self):
+        # make sure the borrowed session is still valid
+        session = await self.backend.ensure_session()
+
+        # add the authenticated JWT to the headers
+        self.backend.client.storage._client.headers['Authorization'] = f"Bearer {session.access_token}"
+
+    async def _ensure_bucket(self):
+        # the bucket cannot be created in __post_init__, as that cannot be awaited
+        if not await self.has_bucket():
+            await self._create_user_bucket()
+
+    async def _create_user_bucket(self) -> bool:
+        # setup auth token
+        await self.__setup_auth()
+
+        # create the bucket
+        res = await self.backend.client.storage.create_bucket(id=self.user_id, name=self.backend._user.email)
+
+        return 'error' not in res
+
+    async def has_bucket(self) -> bool:
+        # setup auth token
+        await self.__setup_auth()
+
+        # try to find the bucket
+        try:
+            await self.backend.client.storage.get_bucket(self.user_id)
+        except StorageException:
+            return False
+        return True
+
+    async def get_dataset(self, key: str) -> Dataset:
+        # setup auth token
+        await self.__setup_auth()
+
+        # download the metadata
+        buf = io.BytesIO()
+        try:
+            content = await self.backend.client.storage.from_(self.user_id).download(f"{key}/dataset.json")
+            buf.write(content)
+        except StorageException as e:
+            if is_not_found(e):
+                raise FileNotFoundError(f"Dataset with key '{key}' not found")
+            else:
+                raise e
+
+        # rewind
+        buf.seek(0)
+        return Dataset(**json.load(buf))
+
+    async def get_tensor(self, key: str, index_low: int, index_up: int, slice_low: List[int], slice_up: List[int], step: Optional[List[int]] = None) -> np.ndarray:
+        # the metadata bounds the rows, which have an object, this also sets up the auth token
+        dataset = await self.get_dataset(key)
+        index_up = min(index_up, dataset.shape[0] + 1)
+        bucket = self.backend.client.storage.from_(self.user_id)
+
+        # only the objects of the selected rows are downloaded
+        step = step or [1] * (len(slice_low) + 1)
+        indices = range(index_low, index_up, step[0])
+        inner = tuple(slice(low - 1, up, st) for low, up, st in zip(slice_low, slice_up, step[1:]))
+        shape = (len(indices), *[len(range(low - 1, up, st)) for low, up, st in zip(slice_low, slice_up, step[1:])])
+        tensor = np.empty(shape, dtype=np.float32)
+
+        # limit the number of concurrent downloads
+        semaphore = asyncio.Semaphore(DOWNLOAD_WORKERS)
+
+        async def load(position: int, index: int):
+            async with semaphore:
+                try:
+                    content = await bucket.download(f"{key}/index_{index}.nc")
+                except StorageException as e:
+                    # all rows within the shape of the dataset need to be there
+                    if is_not_found(e):
+                        raise FileNotFoundError(f"Row {index} of dataset '{key}' not found")
+                    raise e
+            tensor[position] = decode_netcdf(content)[inner]
+
+        await asyncio.gather(*[load(position, index) for position, index in enumerate(indices)])
+
+        return tensor
+
+    async def insert_dataset(self, key: str, shape: Tuple[int], dim: int, type: str = 'float32', is_shared: bool = False) -> Dataset:
+        await self._ensure_bucket()
+
+        # create the dataset metadata as a json
+        dataset = Dataset(id=key, key=key, shape=[int(size) for size in shape], ndim=dim, type=type, is_shared=is_shared)
+        await self._upload_metadata(dataset)
+
+        return dataset
+
+    async def _upload_metadata(self, dataset: Dataset):
+        # the metadata is overwritten, whenever the shape changes
+        metadata = json.dumps(dict(id=dataset.id, key=dataset.key, shape=list(dataset.shape), ndim=dataset.ndim, type=dataset.type, is_shared=dataset.is_shared))
+        await self.backend.client.storage.from_(self.user_id).upload(f"{dataset.key}/dataset.json", metadata.encode('utf-8'), file_options={'upsert': 'true'})
+
+    async def _list_objects(self, path: str) -> List[Dict[str, Any]]:
+        # the storage API lists the objects of a folder in pages
+        bucket = self.backend.client.storage.from_(self.user_id)
+        objects, offset = [], 0
+        while True:
+            page = await bucket.list(path, {'limit': LIST_LIMIT, 'offset': offset})
+            objects.extend(page)
+            if len(page) < LIST_LIMIT:
+                return objects
+            offset += LIST_LIMIT
+
+    async def insert_tensor(self, data_id: int, data: List[np.ndarray], offset: int = 0) -> bool:
+        await self._ensure_bucket()
+
+        # upload each netcdf chunk
+        for i, arr in enumerate(data):
+            await self.backend.client.storage.from_(self.user_id).upload(f"{data_id}/index_{int(i + 1 + offset)}.nc", encode_netcdf(data_id, arr))
+
+        return True
+
+    async def append_tensor(self, key: str, data: List[np.ndarray]) -> bool:
+        # first, get the dataset
+        try:
+            dataset = await self.get_dataset(key)
+        except FileNotFoundError:
+            raise KeyError(f"Dataset '{key}' not found. You cannot append to a non-existing datasets.")
+
+        # append the rows of each batch right after the last index
+        offset = dataset.shape[0]
+        for chunk in data:
+            await self.insert_tensor(data_id=dataset.id, data=[row for row in chunk], offset=offset)
+            offset += len(chunk)
+
+        # if there was no error, update the dataset
+        await self.set_dataset_shape(dataset.id, [offset, *dataset.shape[1:]])
+
+        return True
+
+    async def set_dataset_shape(self, data_id: int, shape: List[int]) -> bool:
+        # the id of a dataset in the storage is its key
+        dataset = await self.get_dataset(data_id)
+        dataset.shape = [int(size) for size in shape]
+        await self._upload_metadata(dataset)
+
+        return True
+
+    async def remove_dataset(self, key: str) -> bool:
+        # setup auth token
+        await self.__setup_auth()
+
+        # a folder is removed along with its last object
+        paths = [f"{key}/{obj['name']}" for obj in await self._list_objects(key)]
+        if len(paths) > 0:
+            await self.backend.client.storage.from_(self.user_id).remove(paths)
+
+        return True
+
+    async def list_dataset_keys(self) -> List[str]:
+        # setup auth token
+        await self.__setup_auth()
+
+        # each dataset is a folder at the root of the bucket, folders have no id
+        return [obj['name'] for obj in await self._list_objects('') if obj.get('id') is None]
@@ -3,23 +3,26 @@ This module provides the base context class for working with tensors and dataset
 
 It provides a `BaseContext` class that defines the interface for working with tensors and datasets in Supabase.
 This class is designed to be subclassed by specific implementations of the Supabase backend, such as the `DatabaseContext` class.
+The `AsyncBaseContext` class defines the same interface with coroutines, for the asyncio-native backends.
 
 """
-from typing import TYPE_CHECKING, List, Tuple
+from typing import TYPE_CHECKING, List, Optional, Tuple
 from abc import ABC, abstractmethod
 from dataclasses import dataclass, field
 
 import numpy as np
 
+from tensorage.indexing import contiguous_runs
+from tensorage.reduce import reduce_array
+
 if TYPE_CHECKING:  # pragma: no cover
-    from tensorage.session import BackendSession
+    from tensorage.session import BackendSession, AsyncBackendSession
     from tensorage.types import Dataset    
 
 
 @dataclass
 class BaseContext(ABC):
     backend: 'BackendSession' = field(repr=False)
-    _anon_key: str = field(init=False, repr=False)
 
     @property
     def user_id(self) -> str:
@@ -30,8 +33,12 @@ class BaseContext(ABC):
         raise NotImplementedError
 
     @abstractmethod
-    def get_tensor(self, key: str, index_low: int, index_up: int, slice_low: List[int], slice_up: List[int]) -> np.ndarray:
+    def get_tensor(self, key: str, index_low: int, index_up: int, slice_low: List[int], slice_up: List[int], step: Optional[List[int]] = None, out: Optional[np.ndarray] = None) -> np.ndarray:
         raise NotImplementedError
+
+    def get_datasets(self, keys: List[str]) -> List['Dataset']:
+        # contexts without batched metadata queries load each dataset
+        return [self.get_dataset(key) for key in keys]
     
     @abstractmethod
     def insert_dataset(self, key: str, shape: Tuple[int], dim: int, type: str, is_shared: bool) -> 'Dataset':
@@ -52,6 +59,75 @@ class BaseContext(ABC):
     @abstractmethod
     def list_dataset_keys(self) -> List[str]:
         raise NotImplementedError
+
+    def set_dataset_shape(self, data_id: int, shape: List[int]) -> bool:
+        raise NotImplementedError(f"{self.__class__.__name__} does not support changing the shape of datasets.")
+
+    def insert_tiles(self, data_id: int, tiles: List[Tuple[Tuple[int, ...], np.ndarray]], compressor: Optional[str] = None) -> bool:
+        raise NotImplementedError(f"{self.__class__.__name__} does not support the tiled layout.")
+
+    def get_tiled_tensor(self, dataset: 'Dataset', index_low: int, index_up: int, slice_low: List[int], slice_up: List[int], step: Optional[List[int]] = None) -> np.ndarray:
+        raise NotImplementedError(f"{self.__class__.__name__} does not support the tiled layout.")
+
+    def reduce_tensor(self, key: str, op: str, axis: List[int], index_low: int, index_up: int, slice_low: List[int], slice_up: List[int]) -> np.ndarray:
+        # contexts without server-side reductions load the slice and reduce it locally
+        return reduce_array(self.get_tensor(key, index_low, index_up, slice_low, slice_up), op, axis)
+
+    def take_tensor(self, key: str, indices: List[int], slice_low: List[int], slice_up: List[int]) -> np.ndarray:
+        # contexts without point reads load each run of consecutive rows
+        return np.concatenate([self.get_tensor(key, low, up, slice_low, slice_up) for low, up in contiguous_runs(indices)])
+
+
+@dataclass
+class AsyncBaseContext(ABC):
+    backend: 'AsyncBackendSession' = field(repr=False)
+
+    @property
+    def user_id(self) -> str:
+        return self.backend._user.id
+
+    @abstractmethod
+    async def get_dataset(self, key: str) -> 'Dataset':
+        raise NotImplementedError
+
+    @abstractmethod
+    async def get_tensor(self, key: str, index_low: int, index_up: int, slice_low: List[int], slice_up: List[int], step: Optional[List[int]] = None) -> np.ndarray:
+        raise NotImplementedError
+
+    async def get_datasets(self, keys: List[str]) -> List['Dataset']:
+        # contexts without batched metadata queries load each dataset
+        return [await self.get_dataset(key) for key in keys]
+    
+    @abstractmethod
+    async def insert_dataset(self, key: str, shape: Tuple[int], dim: int, type: str, is_shared: bool) -> 'Dataset':
+        raise NotImplementedError
+    
+    @abstractmethod
+    async def insert_tensor(self, data_id: int, data: List[np.ndarray], offset: int = 0) -> bool:
+        raise NotImplementedError
+
+    @abstractmethod
+    async def append_tensor(self, key: str, data: List[np.ndarray]) -> bool:
+        raise NotImplementedError
     
-    def __del__(self):
-        self.backend.logout()
+    @abstractmethod
+    async def remove_dataset(self, key: str) -> bool:
+        raise NotImplementedError
+
+    @abstractmethod
+    async def list_dataset_keys(self) -> List[str]:
+        raise NotImplementedError
+
+    async def set_dataset_shape(self, data_id: int, shape: List[int]) -> bool:
+        raise NotImplementedError(f"{self.__class__.__name__} does not support changing the shape of datasets.")
+
+    async def insert_tiles(self, data_id: int, tiles: List[Tuple[Tuple[int, ...], np.ndarray]], compressor: Optional[str] = None) -> bool:
+        raise NotImplementedError(f"{self.__class__.__name__} does not support the tiled layout.")
+
+    async def get_tiled_tensor(self, dataset: 'Dataset', index_low: int, index_up: int, slice_low: List[int], slice_up: List[int], step: Optional[List[int]] = None) -> np.ndarray:
+        raise NotImplementedError(f"{self.__class__.__name__} does not support the tiled layout.")
+
+    async def take_tensor(self, key: str, indices: List[int], slice_low: List[int], slice_up: List[int]) -> np.ndarray:
+        # contexts without point reads load each run of consecutive rows
+        return np.concatenate([await self.get_tensor(key, low, up, slice_low, slice_up) for low, up in contiguous_runs(indices)])
+
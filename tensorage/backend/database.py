@@ -1,13 +1,66 @@
 """This module defines the DatabaseContext class which is responsible for interacting with the Supabase backend and its underlying Postgres database."""
-from typing import Tuple, List
+from typing import Tuple, List, Optional
+import base64
 
 from postgrest.exceptions import APIError
 import numpy as np
 
 from tensorage.types import Dataset
+from tensorage.tiles import Coords, resolve_bounds, tile_range, tile_shape, assemble_tiles
+from tensorage.codecs import Codec, encode_chunks, decode_chunks
+from tensorage.tracing import span
+from tensorage.indexing import apply_steps, write_into
 from .base import BaseContext
 
 
+# PostgREST error code for a database function that is not in the schema cache
+FUNCTION_NOT_FOUND = 'PGRST202'
+
+
+def encode_float4(chunk: np.ndarray) -> str:
+    """
+    Encodes a tensor chunk as base64 string of its packed little-endian float32 buffer.
+
+    Args:
+        chunk (np.ndarray): The tensor chunk to encode.
+
+    Returns:
+        str: The base64 encoded buffer.
+    """
+    return base64.b64encode(np.ascontiguousarray(chunk, dtype='<f4').tobytes()).decode('ascii')
+
+
+def decode_float4(tensor: Optional[str], shape: List[int], dtype: str = '>f4', out: Optional[np.ndarray] = None) -> np.ndarray:
+    """
+    Decodes a base64 encoded big-endian float32 buffer, as returned by the database, into a float32 array.
+
+    Args:
+        tensor (Optional[str]): The base64 encoded buffer. None, if the slice is empty.
+        shape (List[int]): The shape of the tensor.
+        dtype (str): The byte order and type of the buffer. Tiles are stored as sent, in little-endian order.
+        out (Optional[np.ndarray]): The array to decode into, instead of a new one. May be strided.
+
+    Returns:
+        np.ndarray: The decoded float32 tensor.
+
+    Raises:
+        ValueError: If out does not have the shape of the tensor.
+    """
+    if out is not None and tuple(out.shape) != tuple(shape):
+        raise ValueError(f"The output array of shape {tuple(out.shape)} does not match the tensor of shape {tuple(shape)}.")
+
+    # the slice did not contain any element
+    if tensor is None:
+        return out if out is not None else np.empty(shape, dtype=np.float32)
+
+    buf = np.frombuffer(base64.b64decode(tensor), dtype=dtype).reshape(shape)
+
+    # the byte order is converted while copying into the output
+    if out is not None:
+        out[...] = buf
+        return out
+    return buf.astype(np.float32)
+
 
 class DatabaseContext(BaseContext):
     """
@@ -15,26 +68,19 @@ class DatabaseContext(BaseContext):
     """
     def __setup_auth(self):
         """
-        Sets up the authentication for the Supabase client using the provided API key and URL.
+        Sets up the authentication for the Supabase client using the JWT of the long-lived session.
+        The token is refreshed transparently by the session, if it is about to expire. The 
+        anonymous key is restored by the session on logout.
 
         Raises:
             ValueError: If the API key or URL is not provided.
         """
-        # store the current JWT token
-        self._anon_key = self.backend.client.supabase_key
+        with span('setup_auth', 'auth'):
+            # make sure the borrowed session is still valid
+            session = self.backend.ensure_session()
 
-        # set the JWT of the authenticated user as the new token
-        self.backend.client.postgrest.auth(self.backend._session.access_token)
-    
-    def __restore_auth(self):
-        """
-        Restores the authentication for the Supabase client using the stored anonymous key.
-
-        Raises:
-            ValueError: If the session token is not provided.
-        """
-        # restore the original JWT
-        self.backend.client.postgrest.auth(self._anon_key)
+            # set the JWT of the authenticated user as the new token
+            self.backend.client.postgrest.auth(session.access_token)
 
     def check_schema_installed(self) -> bool:
         """
@@ -62,7 +108,7 @@ class DatabaseContext(BaseContext):
         # check if any of the needed tables was not found
         return not missing_table
 
-    def insert_dataset(self, key: str, shape: Tuple[int], dim: int) -> Dataset:
+    def insert_dataset(self, key: str, shape: Tuple[int], dim: int, chunk_shape: Optional[Tuple[int]] = None, compressor: Optional[str] = None) -> Dataset:
         """
         Inserts a new dataset into the database with the given key, shape, and dimension.
 
@@ -70,24 +116,34 @@ class DatabaseContext(BaseContext):
             key (str): The unique identifier for the dataset.
             shape (Tuple[int]): The shape of the dataset.
             dim (int): The dimension of the dataset.
+            chunk_shape (Optional[Tuple[int]]): The shape of the tiles, if the dataset is stored in the tiled layout.
+            compressor (Optional[str]): The codec spec the tiles are compressed with.
 
         Returns:
             Dataset: The newly created dataset object.
         """
+        record = {'key': key, 'shape': shape, 'ndim': dim, 'user_id': self.user_id}
+        if chunk_shape is not None:
+            record['chunk_shape'] = list(chunk_shape)
+        if compressor is not None:
+            record['compressor'] = compressor
+
         # run the insert
         self.__setup_auth()
-        response = self.backend.client.table('datasets').insert({'key': key, 'shape': shape, 'ndim': dim, 'user_id': self.user_id}).execute()
-        self.__restore_auth()
+        with span('request', 'network', table='datasets'):
+            response = self.backend.client.table('datasets').insert(record).execute()
 
         # return an instance of Dataset
         data = response.data[0]
-        return Dataset(id=data['id'], key=data['key'], shape=data['shape'], ndim=data['ndim'], is_shared=data['is_shared'], type=data['type'])
+        return Dataset(id=data['id'], key=data['key'], shape=data['shape'], ndim=data['ndim'], is_shared=data['is_shared'], type=data['type'], chunk_shape=data.get('chunk_shape'), compressor=data.get('compressor'))
     
     def insert_tensor(self, data_id: int, data: List[np.ndarray], offset: int = 0) -> bool:
         """
         Inserts a tensor into the database with the given data ID, data, and offset.
         The offset is the position along the main (first) axis, at with the chunks given
         as data should be inserted.
+        Each chunk is sent as base64 encoded little-endian float32 buffer and unpacked into 
+        the float4[] column by the tensor_float4_insert database function.
 
         Args:
             data_id (int): The unique identifier for the tensor data.
@@ -100,19 +156,48 @@ class DatabaseContext(BaseContext):
         # setup auth token
         self.__setup_auth()
 
+        # encode the chunks as binary buffers
+        with span('serialize', 'serialize', rows=len(data)):
+            tensors = [encode_float4(chunk) for chunk in data]
+            dims = list(np.shape(data[0]))
+
         # run the insert
         try:
-            self.backend.client.table('tensors_float4').insert([{'data_id': data_id, 'index': int(i + 1 + offset), 'user_id': self.user_id, 'tensor': chunk.tolist()} for i, chunk in enumerate(data)]).execute()
+            with span('request', 'network', rpc='tensor_float4_insert'):
+                self.backend.client.rpc('tensor_float4_insert', {'data_id': data_id, 'index_offset': int(offset), 'dims': dims, 'tensors': tensors}).execute()
         except APIError as e:
-            # TODO check if we expired here and refresh the token
+            # the database schema is outdated, fall back to the JSON insert
+            if e.code == FUNCTION_NOT_FOUND:
+                return self.__insert_tensor_json(data_id, data, offset=offset)
+
+            # expired tokens and transient errors are retried by the RetryPolicy of the TensorStore
             raise e
-        
-        # restore old token
-        self.__restore_auth()
 
         # return 
         return True
 
+    def __insert_tensor_json(self, data_id: int, data: List[np.ndarray], offset: int = 0) -> bool:
+        """
+        Inserts a tensor into the database by sending each chunk as a JSON float array.
+        This is considerably slower than the binary insert and only used if the database
+        does not provide the tensor_float4_insert function.
+
+        Args:
+            data_id (int): The unique identifier for the tensor data.
+            data (List[np.ndarray]): The tensor data to be inserted.
+            offset (int): The offset to start inserting the tensor data.
+
+        Returns:
+            bool: True if the tensor data was successfully inserted, False otherwise.
+        """
+        with span('serialize', 'serialize', rows=len(data), format='json'):
+            records = [{'data_id': data_id, 'index': int(i + 1 + offset), 'user_id': self.user_id, 'tensor': chunk.tolist()} for i, chunk in enumerate(data)]
+
+        with span('request', 'network', table='tensors_float4'):
+            self.backend.client.table('tensors_float4').insert(records).execute()
+
+        return True
+
     def get_dataset(self, key: str) -> Dataset:
         """
         Retrieves the dataset with the given key from the database.
@@ -130,24 +215,48 @@ class DatabaseContext(BaseContext):
         self.__setup_auth()
 
         # get the dataset
-        response = self.backend.client.table('datasets').select('*').eq('key', key).execute()
-
-        # restore old token
-        self.__restore_auth()
+        with span('request', 'network', table='datasets'):
+            response = self.backend.client.table('datasets').select('*').eq('key', key).execute()
 
         # grab the data
         data = response.data[0]
 
         # return as Dataset
         # TODO -> here we hardcode the type to float32 as nothing else is implemented so far
-        return Dataset(id=data['id'], key=data['key'], shape=data['shape'], ndim=data['ndim'], is_shared=data['is_shared'], type='float32')
+        return Dataset(id=data['id'], key=data['key'], shape=data['shape'], ndim=data['ndim'], is_shared=data['is_shared'], type='float32', chunk_shape=data.get('chunk_shape'), compressor=data.get('compressor'))
 
-    def get_tensor(self, key: str, index_low: int, index_up: int, slice_low: List[int], slice_up: List[int]) -> np.ndarray:
+    def get_datasets(self, keys: List[str]) -> List[Dataset]:
+        """
+        Retrieves the datasets with the given keys in a single query.
+        Keys that do not exist are not part of the result.
+
+        Args:
+            keys (List[str]): The unique identifiers of the datasets.
+
+        Returns:
+            List[Dataset]: The existing datasets, in no particular order.
+        """
+        # setup auth token
+        self.__setup_auth()
+
+        # get all datasets at once
+        with span('request', 'network', table='datasets', keys=len(keys)):
+            response = self.backend.client.table('datasets').select('*').in_('key', list(keys)).execute()
+
+        # TODO -> here we hardcode the type to float32 as nothing else is implemented so far
+        return [
+            Dataset(id=data['id'], key=data['key'], shape=data['shape'], ndim=data['ndim'], is_shared=data['is_shared'], type='float32', chunk_shape=data.get('chunk_shape'), compressor=data.get('compressor'))
+            for data in response.data
+        ]
+
+    def get_tensor(self, key: str, index_low: int, index_up: int, slice_low: List[int], slice_up: List[int], step: Optional[List[int]] = None, out: Optional[np.ndarray] = None) -> np.ndarray:
         """
         Retrieves a tensor from the database with the given key, index range, and slice range.
         The index is the numeric index along the main axis, while the slice is marking the index ranges
         along the other axes. Please note, that all existing axes have to be covered, even if all data
         is requested.
+        The slice is transferred as packed binary buffer and decoded into a float32 array.
+        If a step is given, only every n-th element along each axis is selected in the database.
 
         Args:
             key (str): The unique identifier for the tensor.
@@ -155,6 +264,8 @@ class DatabaseContext(BaseContext):
             index_up (int): The upper index bound for the tensor.
             slice_low (List[int]): The lower slice bound for the tensor.
             slice_up (List[int]): The upper slice bound for the tensor.
+            step (Optional[List[int]]): The step along each axis, counted from the lower bounds.
+            out (Optional[np.ndarray]): The float32 array to decode the tensor into, instead of a new one.
 
         Returns:
             np.ndarray: The tensor data with the given key, index range, and slice range.
@@ -164,17 +275,227 @@ class DatabaseContext(BaseContext):
         """        # setup auth token
         self.__setup_auth()
 
-        # get the requested chunk
-        response = self.backend.client.rpc('tensor_float4_slice', {'name': key, 'index_low': index_low, 'index_up': index_up, 'slice_low': slice_low, 'slice_up': slice_up}).execute()
+        if step is not None:
+            return self.__get_tensor_strided(key, index_low, index_up, slice_low, slice_up, step, out)
+
+        # get the requested chunk as packed binary buffer
+        try:
+            with span('request', 'network', rpc='tensor_float4_slice_binary'):
+                response = self.backend.client.rpc('tensor_float4_slice_binary', {'name': key, 'index_low': index_low, 'index_up': index_up, 'slice_low': slice_low, 'slice_up': slice_up}).execute()
+        except APIError as e:
+            # the database schema is outdated, fall back to the JSON slice
+            if e.code == FUNCTION_NOT_FOUND:
+                return write_into(out, self.__get_tensor_json(key, index_low, index_up, slice_low, slice_up))
+            raise e
+
+        # grab the data
+        data = response.data[0]
+
+        # empty slices do not report the inner dimensions
+        if data['tensor'] is None:
+            return decode_float4(None, [0, *[up - low + 1 for low, up in zip(slice_low, slice_up)]], out=out)
+
+        # return as np.ndarray
+        with span('decode', 'deserialize'):
+            return decode_float4(data['tensor'], data['shape'], out=out)
+
+    def __get_tensor_strided(self, key: str, index_low: int, index_up: int, slice_low: List[int], slice_up: List[int], step: List[int], out: Optional[np.ndarray] = None) -> np.ndarray:
+        """
+        Retrieves every n-th element of a slice. The rows and elements off the steps are dropped
+        by the tensor_float4_slice_strided database function, thus they are not transferred.
+        If the database does not provide the function, the full slice is loaded and strided locally.
+        """
+        try:
+            with span('request', 'network', rpc='tensor_float4_slice_strided'):
+                response = self.backend.client.rpc('tensor_float4_slice_strided', {'name': key, 'index_low': index_low, 'index_up': index_up, 'slice_low': slice_low, 'slice_up': slice_up, 'steps': step}).execute()
+        except APIError as e:
+            # the database schema is outdated, stride the full slice
+            if e.code == FUNCTION_NOT_FOUND:
+                return write_into(out, apply_steps(self.get_tensor(key, index_low, index_up, slice_low, slice_up), step))
+            raise e
+
+        data = response.data[0]
+
+        # empty slices do not report the inner dimensions
+        if data['tensor'] is None:
+            return decode_float4(None, [0, *[len(range(low, up + 1, st)) for low, up, st in zip(slice_low, slice_up, step[1:])]], out=out)
+
+        with span('decode', 'deserialize'):
+            return decode_float4(data['tensor'], data['shape'], out=out)
+
+    def __get_tensor_json(self, key: str, index_low: int, index_up: int, slice_low: List[int], slice_up: List[int]) -> np.ndarray:
+        """
+        Retrieves a tensor from the database as nested JSON float arrays.
+        This is considerably slower than the binary slice and only used if the database
+        does not provide the tensor_float4_slice_binary function.
+
+        Args:
+            key (str): The unique identifier for the tensor.
+            index_low (int): The lower index bound for the tensor.
+            index_up (int): The upper index bound for the tensor.
+            slice_low (List[int]): The lower slice bound for the tensor.
+            slice_up (List[int]): The upper slice bound for the tensor.
 
-        # restore old token
-        self.__restore_auth()
+        Returns:
+            np.ndarray: The tensor data with the given key, index range, and slice range.
+        """
+        # get the requested chunk
+        with span('request', 'network', rpc='tensor_float4_slice'):
+            response = self.backend.client.rpc('tensor_float4_slice', {'name': key, 'index_low': index_low, 'index_up': index_up, 'slice_low': slice_low, 'slice_up': slice_up}).execute()
 
         # grab the data
         data = response.data[0]['tensor']
 
         # return as np.ndarray
-        return np.asarray(data)
+        with span('decode', 'deserialize', format='json'):
+            return np.asarray(data, dtype=np.float32)
+
+    def reduce_tensor(self, key: str, op: str, axis: List[int], index_low: int, index_up: int, slice_low: List[int], slice_up: List[int]) -> np.ndarray:
+        """
+        Reduces a slice of the tensor along the given axes in the database, thus only the reduced
+        tensor is transferred. The index and slices follow get_tensor.
+
+        Args:
+            key (str): The unique identifier for the tensor.
+            op (str): The reduction, one of 'sum', 'mean', 'min', 'max', 'std' or 'var'.
+            axis (List[int]): The axes of the dataset to reduce.
+            index_low (int): The lower index bound for the tensor.
+            index_up (int): The upper index bound for the tensor.
+            slice_low (List[int]): The lower slice bound for the tensor.
+            slice_up (List[int]): The upper slice bound for the tensor.
+
+        Returns:
+            np.ndarray: The reduced tensor.
+
+        Raises:
+            ValueError: If the selection is empty.
+        """
+        # setup auth token
+        self.__setup_auth()
+
+        try:
+            with span('request', 'network', rpc='tensor_float4_reduce'):
+                response = self.backend.client.rpc('tensor_float4_reduce', {'name': key, 'op': op, 'axis': list(axis), 'index_low': index_low, 'index_up': index_up, 'slice_low': slice_low, 'slice_up': slice_up}).execute()
+        except APIError as e:
+            # the database schema is outdated, reduce the slice locally
+            if e.code == FUNCTION_NOT_FOUND:
+                return super().reduce_tensor(key, op, axis, index_low, index_up, slice_low, slice_up)
+            raise e
+
+        data = response.data[0]
+        if data['tensor'] is None:
+            raise ValueError('Cannot reduce an empty selection.')
+
+        with span('decode', 'deserialize'):
+            return decode_float4(data['tensor'], data['shape'])
+
+    def take_tensor(self, key: str, indices: List[int], slice_low: List[int], slice_up: List[int]) -> np.ndarray:
+        """
+        Retrieves the rows at the given indices along the first axis in a single request.
+        The rows are selected by the tensor_float4_take database function and returned in
+        ascending order of their index. The inner axes are sliced like in get_tensor.
+
+        Args:
+            key (str): The unique identifier for the tensor.
+            indices (List[int]): The sorted, unique database indices of the rows.
+            slice_low (List[int]): The lower slice bound for the tensor.
+            slice_up (List[int]): The upper slice bound for the tensor.
+
+        Returns:
+            np.ndarray: The rows of the tensor data.
+        """
+        # setup auth token
+        self.__setup_auth()
+
+        try:
+            with span('request', 'network', rpc='tensor_float4_take', rows=len(indices)):
+                response = self.backend.client.rpc('tensor_float4_take', {'name': key, 'indices': list(indices), 'slice_low': slice_low, 'slice_up': slice_up}).execute()
+        except APIError as e:
+            # the database schema is outdated, load the runs of consecutive rows
+            if e.code == FUNCTION_NOT_FOUND:
+                return super().take_tensor(key, indices, slice_low, slice_up)
+            raise e
+
+        data = response.data[0]
+        if data['tensor'] is None:
+            return decode_float4(None, [0, *[up - low + 1 for low, up in zip(slice_low, slice_up)]])
+
+        with span('decode', 'deserialize'):
+            return decode_float4(data['tensor'], data['shape'])
+
+    def insert_tiles(self, data_id: int, tiles: List[Tuple[Coords, np.ndarray]], compressor: Optional[str] = None) -> bool:
+        """
+        Inserts tiles of a dataset stored in the tiled layout. Each tile is sent as base64
+        encoded little-endian float32 buffer and stored as is by the tensor_float4_tiles_insert
+        database function.
+
+        Args:
+            data_id (int): The unique identifier for the tensor data.
+            tiles (List[Tuple[Coords, np.ndarray]]): The coordinates of the tiles and the tiles.
+            compressor (Optional[str]): The codec spec to compress the tiles with.
+
+        Returns:
+            bool: True if the tiles were successfully inserted, False otherwise.
+        """
+        # setup auth token
+        self.__setup_auth()
+
+        # the coordinates are sent flat, as all tiles have the same number of dimensions
+        coords = [int(c) for tile_coords, _ in tiles for c in tile_coords]
+        with span('serialize', 'serialize', tiles=len(tiles), compressor=compressor):
+            if compressor is not None:
+                tensors = [base64.b64encode(buf).decode('ascii') for buf in encode_chunks(Codec.from_spec(compressor), [tile for _, tile in tiles])]
+            else:
+                tensors = [encode_float4(tile) for _, tile in tiles]
+
+        # run the insert
+        with span('request', 'network', rpc='tensor_float4_tiles_insert'):
+            self.backend.client.rpc('tensor_float4_tiles_insert', {'data_id': data_id, 'coords': coords, 'tensors': tensors}).execute()
+
+        return True
+
+    def get_tiled_tensor(self, dataset: Dataset, index_low: int, index_up: int, slice_low: List[int], slice_up: List[int], step: Optional[List[int]] = None) -> np.ndarray:
+        """
+        Retrieves a tensor of a dataset stored in the tiled layout. The arguments follow get_tensor,
+        but only the tiles touched by the index and slices are loaded and the tensor is cut out
+        and strided locally.
+
+        Args:
+            dataset (Dataset): The tiled dataset.
+            index_low (int): The lower index bound for the tensor.
+            index_up (int): The upper index bound for the tensor.
+            slice_low (List[int]): The lower slice bound for the tensor.
+            slice_up (List[int]): The upper slice bound for the tensor.
+            step (Optional[List[int]]): The step along each axis, counted from the lower bounds.
+
+        Returns:
+            np.ndarray: The tensor data with the given index range, and slice range.
+        """
+        # resolve the tiles involved
+        bounds = resolve_bounds(dataset.shape, index_low, index_up, slice_low, slice_up)
+        tile_coords = tile_range(bounds, dataset.chunk_shape)
+        if tile_coords is None:
+            return apply_steps(assemble_tiles(bounds, dataset.chunk_shape, []), step)
+
+        # setup auth token
+        self.__setup_auth()
+
+        # load the tiles
+        with span('request', 'network', rpc='tensor_float4_tiles'):
+            response = self.backend.client.rpc('tensor_float4_tiles', {'data_id': dataset.id, 'coords_low': list(tile_coords[0]), 'coords_up': list(tile_coords[1])}).execute()
+
+        coords = [tuple(row['coords']) for row in response.data]
+        shapes = [tile_shape(c, dataset.shape, dataset.chunk_shape) for c in coords]
+
+        # decode the tiles, compressed tiles are decompressed in the thread pool
+        with span('decode', 'deserialize', tiles=len(coords), compressor=dataset.compressor):
+            if dataset.compressor is not None:
+                arrays = decode_chunks(Codec.from_spec(dataset.compressor), [base64.b64decode(row['tensor']) for row in response.data], shapes)
+            else:
+                arrays = [decode_float4(row['tensor'], shape, dtype='<f4') for row, shape in zip(response.data, shapes)]
+            tiles = list(zip(coords, arrays))
+
+            return apply_steps(assemble_tiles(bounds, dataset.chunk_shape, tiles), step)
 
     def remove_dataset(self, key: str) -> bool:
         """
@@ -193,10 +514,8 @@ class DatabaseContext(BaseContext):
         self.__setup_auth()
 
         # remove the dataset
-        self.backend.client.table('datasets').delete().eq('key', key).execute()
-
-        # restore old token
-        self.__restore_auth()
+        with span('request', 'network', table='datasets'):
+            self.backend.client.table('datasets').delete().eq('key', key).execute()
         
         # return
         return True
@@ -212,10 +531,8 @@ class DatabaseContext(BaseContext):
         self.__setup_auth()
 
         # get the keys
-        response = self.backend.client.table('datasets').select('key').execute()
-
-        # restore old token
-        self.__restore_auth()
+        with span('request', 'network', table='datasets'):
+            response = self.backend.client.table('datasets').select('key').execute()
 
         return [row['key'] for row in response.data]
 
@@ -225,7 +542,7 @@ class DatabaseContext(BaseContext):
 
         Args:
             key (str): The unique identifier for the tensor data.
-            data (List[np.ndarray]): The tensor data to be appended.
+            data (List[np.ndarray]): The batches to be appended along the first axis.
 
         Returns:
             bool: True if the tensor data was successfully appended, False otherwise.
@@ -238,18 +555,39 @@ class DatabaseContext(BaseContext):
             dataset = self.get_dataset(key)
             if dataset is None:  # pragma: no cover
                 raise KeyError()
-        except KeyError:
+        except (KeyError, IndexError):
             raise KeyError(f"Dataset '{key}' not found. You cannot append to a non-existing datasets.")
 
         # if the above dit not raise a KeyError, we can assume the dataset exists
         self.__setup_auth()
         
-        # append the tensor with the correct offset
-        self.insert_tensor(data_id=dataset.id, data=data, offset=dataset.shape[0] + 1)
+        # append the rows of each batch right after the last index
+        offset = dataset.shape[0]
+        for chunk in data:
+            self.insert_tensor(data_id=dataset.id, data=[row for row in chunk], offset=offset)
+            offset += len(chunk)
 
         # if there was no error, update the dataset
-        new_shape = tuple([dataset.shape[0] + sum([chunk.shape[0] for chunk in data]), *dataset.shape[1:]])
-        self.backend.client.table('datasets').update({'shape': new_shape}).eq('id', dataset.id).execute()
+        self.set_dataset_shape(dataset.id, [offset, *dataset.shape[1:]])
+
+        return True
+
+    def set_dataset_shape(self, data_id: int, shape: List[int]) -> bool:
+        """
+        Updates the shape of the dataset with the given id, after its tensor data was extended.
+
+        Args:
+            data_id (int): The unique identifier for the tensor data.
+            shape (List[int]): The new shape of the dataset.
 
-        # restore old token
-        self.__restore_auth()
\ No newline at end of file
+        Returns:
+            bool: True if the shape was successfully updated, False otherwise.
+        """
+        # setup auth token
+        self.__setup_auth()
+
+        # update the dataset
+        with span('request', 'network', table='datasets'):
+            self.backend.client.table('datasets').update({'shape': tuple(int(size) for size in shape)}).eq('id', data_id).execute()
+
+        return True
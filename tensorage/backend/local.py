@@ -0,0 +1,353 @@
+"""This module defines the LocalContext class, which stores datasets in a local SQLite database without any network access."""
+from typing import TYPE_CHECKING, Tuple, List, Optional
+import itertools
+import json
+
+import numpy as np
+
+from tensorage.types import Dataset
+from tensorage.tiles import Coords, resolve_bounds, tile_range, tile_shape, assemble_tiles
+from tensorage.codecs import Codec, encode_chunks, decode_chunks
+from tensorage.indexing import apply_steps, write_into
+from .base import BaseContext
+
+if TYPE_CHECKING:  # pragma: no cover
+    from tensorage.session import LocalSession
+
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS datasets (
+    id INTEGER PRIMARY KEY AUTOINCREMENT,
+    key TEXT NOT NULL UNIQUE,
+    ndim INTEGER NOT NULL,
+    shape TEXT NOT NULL,
+    chunk_shape TEXT NULL,
+    compressor TEXT NULL
+);
+CREATE TABLE IF NOT EXISTS tensors_float4 (
+    data_id INTEGER NOT NULL REFERENCES datasets (id) ON DELETE CASCADE,
+    "index" INTEGER NOT NULL,
+    tensor BLOB NOT NULL,
+    PRIMARY KEY (data_id, "index")
+);
+CREATE TABLE IF NOT EXISTS tiles_float4 (
+    data_id INTEGER NOT NULL REFERENCES datasets (id) ON DELETE CASCADE,
+    coords TEXT NOT NULL,
+    tensor BLOB NOT NULL,
+    PRIMARY KEY (data_id, coords)
+);
+"""
+
+
+class LocalContext(BaseContext):
+    """
+    A class representing a local context, storing datasets in the SQLite database of a `LocalSession`.
+    Each row along the first axis is stored as little-endian float32 blob, tiles of the tiled
+    layout are stored as blobs keyed by their coordinates. The context follows the index and
+    slice conventions of the `DatabaseContext`, thus it can be used in place of it.
+    """
+    backend: 'LocalSession'
+
+    @property
+    def user_id(self) -> str:
+        return 'local'
+
+    def check_schema_installed(self) -> bool:
+        """
+        Creates the tables in the local database, if they do not exist yet.
+
+        Returns:
+            bool: True, as the schema is always installed.
+        """
+        with self.backend.transaction() as con:
+            con.executescript(SCHEMA)
+        return True
+
+    def _dataset(self, row: tuple) -> Dataset:
+        id, key, ndim, shape, chunk_shape, compressor = row
+        return Dataset(id=id, key=key, shape=json.loads(shape), ndim=ndim, type='float32', is_shared=False, chunk_shape=json.loads(chunk_shape) if chunk_shape is not None else None, compressor=compressor)
+
+    def insert_dataset(self, key: str, shape: Tuple[int], dim: int, chunk_shape: Optional[Tuple[int]] = None, compressor: Optional[str] = None) -> Dataset:
+        """
+        Inserts a new dataset into the local database with the given key, shape, and dimension.
+
+        Args:
+            key (str): The unique identifier for the dataset.
+            shape (Tuple[int]): The shape of the dataset.
+            dim (int): The dimension of the dataset.
+            chunk_shape (Optional[Tuple[int]]): The shape of the tiles, if the dataset is stored in the tiled layout.
+            compressor (Optional[str]): The codec spec the tiles are compressed with.
+
+        Returns:
+            Dataset: The newly created dataset object.
+        """
+        with self.backend.transaction() as con:
+            cursor = con.execute(
+                'INSERT INTO datasets (key, ndim, shape, chunk_shape, compressor) VALUES (?, ?, ?, ?, ?)',
+                (key, int(dim), json.dumps([int(s) for s in shape]), json.dumps([int(c) for c in chunk_shape]) if chunk_shape is not None else None, compressor)
+            )
+            data_id = cursor.lastrowid
+
+        return Dataset(id=data_id, key=key, shape=[int(s) for s in shape], ndim=int(dim), type='float32', is_shared=False, chunk_shape=list(chunk_shape) if chunk_shape is not None else None, compressor=compressor)
+
+    def insert_tensor(self, data_id: int, data: List[np.ndarray], offset: int = 0) -> bool:
+        """
+        Inserts a tensor into the local database with the given data ID, data, and offset.
+
+        Args:
+            data_id (int): The unique identifier for the tensor data.
+            data (List[np.ndarray]): The tensor data to be inserted.
+            offset (int): The offset to start inserting the tensor data.
+
+        Returns:
+            bool: True if the tensor data was successfully inserted, False otherwise.
+        """
+        with self.backend.transaction() as con:
+            con.executemany(
+                'INSERT INTO tensors_float4 (data_id, "index", tensor) VALUES (?, ?, ?)',
+                [(data_id, int(i + 1 + offset), np.ascontiguousarray(chunk, dtype='<f4').tobytes()) for i, chunk in enumerate(data)]
+            )
+        return True
+
+    def get_dataset(self, key: str) -> Dataset:
+        """
+        Retrieves the dataset with the given key from the local database.
+
+        Args:
+            key (str): The unique identifier for the dataset.
+
+        Returns:
+            Dataset: The dataset object with the given key.
+
+        Raises:
+            KeyError: If the dataset with the given key does not exist.
+        """
+        with self.backend.transaction() as con:
+            row = con.execute('SELECT id, key, ndim, shape, chunk_shape, compressor FROM datasets WHERE key = ?', (key, )).fetchone()
+
+        if row is None:
+            raise KeyError(f"Dataset '{key}' not found.")
+        return self._dataset(row)
+
+    def get_datasets(self, keys: List[str]) -> List[Dataset]:
+        """
+        Retrieves the datasets with the given keys in a single query.
+        Keys that do not exist are not part of the result.
+
+        Args:
+            keys (List[str]): The unique identifiers of the datasets.
+
+        Returns:
+            List[Dataset]: The existing datasets, in no particular order.
+        """
+        with self.backend.transaction() as con:
+            rows = con.execute(
+                f'SELECT id, key, ndim, shape, chunk_shape, compressor FROM datasets WHERE key IN ({", ".join("?" for _ in keys)})',
+                tuple(keys)
+            ).fetchall()
+
+        return [self._dataset(row) for row in rows]
+
+    def get_tensor(self, key: str, index_low: int, index_up: int, slice_low: List[int], slice_up: List[int], step: Optional[List[int]] = None, out: Optional[np.ndarray] = None) -> np.ndarray:
+        """
+        Retrieves a tensor from the local database with the given key, index range, and slice range.
+        The index excludes index_up, while the slices include slice_up, like in DatabaseContext.get_tensor.
+        Rows off the step are not read from the database.
+
+        Args:
+            key (str): The unique identifier for the tensor.
+            index_low (int): The lower index bound for the tensor.
+            index_up (int): The upper index bound for the tensor.
+            slice_low (List[int]): The lower slice bound for the tensor.
+            slice_up (List[int]): The upper slice bound for the tensor.
+            step (Optional[List[int]]): The step along each axis, counted from the lower bounds.
+            out (Optional[np.ndarray]): The float32 array to write the tensor into, instead of a new one.
+
+        Returns:
+            np.ndarray: The tensor data with the given key, index range, and slice range.
+        """
+        dataset = self.get_dataset(key)
+        step = step if step is not None else [1] * dataset.ndim
+
+        with self.backend.transaction() as con:
+            rows = con.execute(
+                'SELECT tensor FROM tensors_float4 WHERE data_id = ? AND "index" >= ? AND "index" < ? AND ("index" - ?) % ? = 0 ORDER BY "index"',
+                (dataset.id, int(index_low), int(index_up), int(index_low), int(step[0]))
+            ).fetchall()
+
+        # empty slices do not report the inner dimensions
+        if len(rows) == 0:
+            return write_into(out, np.empty([0, *[len(range(low, up + 1, st)) for low, up, st in zip(slice_low, slice_up, step[1:])]], dtype=np.float32))
+
+        # decode the rows and slice the inner axes like the database does
+        arr = np.frombuffer(b''.join(row[0] for row in rows), dtype='<f4').reshape(len(rows), *dataset.shape[1:])
+        arr = arr[(slice(None), *[slice(max(low - 1, 0), up, st) for low, up, st in zip(slice_low, slice_up, step[1:])])]
+        return write_into(out, arr) if out is not None else arr.astype(np.float32)
+
+    def take_tensor(self, key: str, indices: List[int], slice_low: List[int], slice_up: List[int]) -> np.ndarray:
+        """
+        Retrieves the rows at the given indices along the first axis, in ascending order of their index.
+
+        Args:
+            key (str): The unique identifier for the tensor.
+            indices (List[int]): The sorted, unique database indices of the rows.
+            slice_low (List[int]): The lower slice bound for the tensor.
+            slice_up (List[int]): The upper slice bound for the tensor.
+
+        Returns:
+            np.ndarray: The rows of the tensor data.
+        """
+        dataset = self.get_dataset(key)
+
+        with self.backend.transaction() as con:
+            rows = []
+            for start in range(0, len(indices), 500):
+                part = [int(i) for i in indices[start:start + 500]]
+                rows.extend(con.execute(
+                    f'SELECT tensor FROM tensors_float4 WHERE data_id = ? AND "index" IN ({", ".join("?" for _ in part)}) ORDER BY "index"',
+                    (dataset.id, *part)
+                ).fetchall())
+
+        if len(rows) == 0:
+            return np.empty([0, *[up - low + 1 for low, up in zip(slice_low, slice_up)]], dtype=np.float32)
+
+        arr = np.stack([np.frombuffer(row[0], dtype='<f4').reshape(dataset.shape[1:]) for row in rows]).astype(np.float32)
+        return arr[(slice(None), *[slice(max(low - 1, 0), up) for low, up in zip(slice_low, slice_up)])]
+
+    def insert_tiles(self, data_id: int, tiles: List[Tuple[Coords, np.ndarray]], compressor: Optional[str] = None) -> bool:
+        """
+        Inserts tiles of a dataset stored in the tiled layout.
+
+        Args:
+            data_id (int): The unique identifier for the tensor data.
+            tiles (List[Tuple[Coords, np.ndarray]]): The coordinates of the tiles and the tiles.
+            compressor (Optional[str]): The codec spec to compress the tiles with.
+
+        Returns:
+            bool: True if the tiles were successfully inserted, False otherwise.
+        """
+        if compressor is not None:
+            buffers = encode_chunks(Codec.from_spec(compressor), [tile for _, tile in tiles])
+        else:
+            buffers = [np.ascontiguousarray(tile, dtype='<f4').tobytes() for _, tile in tiles]
+
+        with self.backend.transaction() as con:
+            con.executemany(
+                'INSERT INTO tiles_float4 (data_id, coords, tensor) VALUES (?, ?, ?)',
+                [(data_id, json.dumps([int(c) for c in coords]), buf) for (coords, _), buf in zip(tiles, buffers)]
+            )
+        return True
+
+    def get_tiled_tensor(self, dataset: Dataset, index_low: int, index_up: int, slice_low: List[int], slice_up: List[int], step: Optional[List[int]] = None) -> np.ndarray:
+        """
+        Retrieves a tensor of a dataset stored in the tiled layout, loading only the tiles involved.
+        The step is applied to the assembled tensor.
+
+        Args:
+            dataset (Dataset): The tiled dataset.
+            index_low (int): The lower index bound for the tensor.
+            index_up (int): The upper index bound for the tensor.
+            slice_low (List[int]): The lower slice bound for the tensor.
+            slice_up (List[int]): The upper slice bound for the tensor.
+            step (Optional[List[int]]): The step along each axis, counted from the lower bounds.
+
+        Returns:
+            np.ndarray: The tensor data with the given index range, and slice range.
+        """
+        bounds = resolve_bounds(dataset.shape, index_low, index_up, slice_low, slice_up)
+        tile_coords = tile_range(bounds, dataset.chunk_shape)
+        if tile_coords is None:
+            return apply_steps(assemble_tiles(bounds, dataset.chunk_shape, []), step)
+
+        # the tiles are keyed by their coordinates
+        grid = [range(low, up + 1) for low, up in zip(*tile_coords)]
+        wanted = [json.dumps(list(coords)) for coords in itertools.product(*grid)]
+
+        with self.backend.transaction() as con:
+            rows = []
+            for start in range(0, len(wanted), 500):
+                part = wanted[start:start + 500]
+                rows.extend(con.execute(
+                    f'SELECT coords, tensor FROM tiles_float4 WHERE data_id = ? AND coords IN ({", ".join("?" for _ in part)})',
+                    (dataset.id, *part)
+                ).fetchall())
+
+        coords = [tuple(json.loads(row[0])) for row in rows]
+        shapes = [tile_shape(c, dataset.shape, dataset.chunk_shape) for c in coords]
+        if dataset.compressor is not None:
+            arrays = decode_chunks(Codec.from_spec(dataset.compressor), [row[1] for row in rows], shapes)
+        else:
+            arrays = [np.frombuffer(row[1], dtype='<f4').astype(np.float32).reshape(shape) for row, shape in zip(rows, shapes)]
+
+        return apply_steps(assemble_tiles(bounds, dataset.chunk_shape, list(zip(coords, arrays))), step)
+
+    def append_tensor(self, key: str, data: List[np.ndarray]) -> bool:
+        """
+        Appends a tensor to the existing tensor data with the given key.
+
+        Args:
+            key (str): The unique identifier for the tensor data.
+            data (List[np.ndarray]): The batches to be appended along the first axis.
+
+        Returns:
+            bool: True if the tensor data was successfully appended, False otherwise.
+
+        Raises:
+            KeyError: If the dataset with the given key does not exist.
+        """
+        try:
+            dataset = self.get_dataset(key)
+        except KeyError:
+            raise KeyError(f"Dataset '{key}' not found. You cannot append to a non-existing datasets.")
+
+        # append the rows of each batch right after the last index
+        offset = dataset.shape[0]
+        for chunk in data:
+            self.insert_tensor(data_id=dataset.id, data=[row for row in chunk], offset=offset)
+            offset += len(chunk)
+
+        # if there was no error, update the dataset
+        self.set_dataset_shape(dataset.id, [offset, *dataset.shape[1:]])
+
+        return True
+
+    def set_dataset_shape(self, data_id: int, shape: List[int]) -> bool:
+        """
+        Updates the shape of the dataset with the given id, after its tensor data was extended.
+
+        Args:
+            data_id (int): The unique identifier for the tensor data.
+            shape (List[int]): The new shape of the dataset.
+
+        Returns:
+            bool: True if the shape was successfully updated, False otherwise.
+        """
+        with self.backend.transaction() as con:
+            con.execute('UPDATE datasets SET shape = ? WHERE id = ?', (json.dumps([int(s) for s in shape]), data_id))
+        return True
+
+    def remove_dataset(self, key: str) -> bool:
+        """
+        Removes the dataset with the given key, along with its tensor data.
+
+        Args:
+            key (str): The unique identifier for the dataset.
+
+        Returns:
+            bool: True if the dataset was successfully removed, False otherwise.
+        """
+        with self.backend.transaction() as con:
+            for table in ('tensors_float4', 'tiles_float4'):
+                con.execute(f'DELETE FROM {table} WHERE data_id IN (SELECT id FROM datasets WHERE key = ?)', (key, ))
+            con.execute('DELETE FROM datasets WHERE key = ?', (key, ))
+        return True
+
+    def list_dataset_keys(self) -> List[str]:
+        """
+        Retrieves a list of all dataset keys in the local database.
+
+        Returns:
+            List[str]: A list of all dataset keys in the local database.
+        """
+        with self.backend.transaction() as con:
+            return [row[0] for row in con.execute('SELECT key FROM datasets ORDER BY id').fetchall()]
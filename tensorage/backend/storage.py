@@ -1,4 +1,5 @@
-from typing import List, Tuple
+from typing import Any, Dict, List, Optional, Tuple
+from concurrent.futures import ThreadPoolExecutor
 import io
 import json
 
@@ -6,26 +7,61 @@ import numpy as np
 import xarray as xr
 from storage3.utils import StorageException
 
+from tensorage.indexing import write_into
 from tensorage.types import Dataset
 
 from .base import BaseContext
 
+
+# the number of objects downloaded concurrently, sharing the pooled connections of the storage client
+DOWNLOAD_WORKERS = 8
+
+# the page size used to list the objects of a bucket folder
+LIST_LIMIT = 1000
+
+
+def encode_netcdf(data_id: str, arr: np.ndarray) -> bytes:
+    """
+    Encodes a single row of a dataset as netCDF, stored as one object per row.
+    """
+    netcdf = xr.Dataset({data_id: xr.DataArray(arr, dims=[f"dim_{i + 2}" for i in range(arr.ndim)])})
+
+    # buffer and get the bytes
+    buf = io.BytesIO()
+    netcdf.to_netcdf(buf)
+    buf.seek(0)
+    return buf.getvalue()
+
+
+def decode_netcdf(content: bytes) -> np.ndarray:
+    """
+    Decodes a single row of a dataset from the bytes of its netCDF object.
+    """
+    with xr.open_dataset(io.BytesIO(content)) as netcdf:
+        # each object holds exactly one variable, named after the dataset
+        variable = next(iter(netcdf.data_vars.values()))
+        return np.asarray(variable.values, dtype=np.float32)
+
+
+def is_not_found(e: StorageException) -> bool:
+    """
+    True, if the storage API could not find the requested object.
+    """
+    return len(e.args) > 0 and isinstance(e.args[0], dict) and e.args[0].get('error') == 'not_found'
+
+
 class StorageContext(BaseContext):
     def __setup_auth(self):
-        # store the current JWT token
-        self._anon_key = self.backend.client.supabase_key
+        # make sure the borrowed session is still valid
+        session = self.backend.ensure_session()
 
         # add the authenticated JWT to the headers
-        self.backend.client.storage._client.headers['Authorization'] = f"Bearer {self.backend._session.access_token}"
+        self.backend.client.storage._client.headers['Authorization'] = f"Bearer {session.access_token}"
 
     def __post_init__(self):
         if not self.has_bucket():
             self._create_user_bucket()
 
-    def __restore_auth(self):
-        # restore the original JWT
-        self.backend.client.storage._client.headers['Authorization'] = f"Bearer {self._anon_key}"
-
     def _create_user_bucket(self) -> bool:
         # setup auth token
         self.__setup_auth()
@@ -35,9 +71,6 @@ class StorageContext(BaseContext):
         
         # create the bucket
         res = self.backend.client.storage.create_bucket(id=self.user_id, name=self.backend._user.email)
-        
-        # restore the original auth token
-        self.__restore_auth()
 
         return 'error' not in res
 
@@ -62,7 +95,7 @@ class StorageContext(BaseContext):
             content = self.backend.client.storage.from_(self.user_id).download(f"{key}/dataset.json")
             buf.write(content)
         except StorageException as e:
-            if len(e.args) > 0 and e.args[0]['error'] == 'not_found':
+            if is_not_found(e):
                 raise FileNotFoundError(f"Dataset with key '{key}' not found")
             else:
                 raise e
@@ -71,28 +104,84 @@ class StorageContext(BaseContext):
         buf.seek(0)
         dataset = Dataset(**json.load(buf))
 
-        # restore the original auth token
-        self.__restore_auth()
-
         return dataset
 
-    def get_tensor(self, key: str, index_low: int, index_up: int, slice_low: List[int], slice_up: List[int]) -> np.ndarray:
-        return super().get_tensor(key, index_low, index_up, slice_low, slice_up)
-    
-    def insert_dataset(self, key: str, shape: Tuple[int], dim: int, type: str, is_shared: bool) -> Dataset:
+    def get_tensor(self, key: str, index_low: int, index_up: int, slice_low: List[int], slice_up: List[int], step: Optional[List[int]] = None, out: Optional[np.ndarray] = None) -> np.ndarray:
+        """
+        Downloads the row objects covering the first axis concurrently and stacks their slices.
+
+        Args:
+            key (str): The key of the dataset.
+            index_low (int): The lower bound of the first axis, 1-based.
+            index_up (int): The upper bound of the first axis, exclusive.
+            slice_low (List[int]): The lower bounds of the inner axes, 1-based.
+            slice_up (List[int]): The upper bounds of the inner axes, inclusive.
+            step (Optional[List[int]]): The step along each axis.
+            out (Optional[np.ndarray]): The array the tensor is written into.
+
+        Returns:
+            np.ndarray: The sliced tensor.
+
+        Raises:
+            FileNotFoundError: If the dataset, or the object of a row within its shape, does not exist.
+        """
+        # the metadata bounds the rows, which have an object, this also sets up the auth token
+        dataset = self.get_dataset(key)
+        index_up = min(index_up, dataset.shape[0] + 1)
+        bucket = self.backend.client.storage.from_(self.user_id)
+
+        # only the objects of the selected rows are downloaded
+        step = step or [1] * (len(slice_low) + 1)
+        indices = range(index_low, index_up, step[0])
+        inner = tuple(slice(low - 1, up, st) for low, up, st in zip(slice_low, slice_up, step[1:]))
+        shape = (len(indices), *[len(range(low - 1, up, st)) for low, up, st in zip(slice_low, slice_up, step[1:])])
+
+        # decode the rows straight into the output array, if it fits
+        if out is not None and out.shape == shape:
+            tensor = out
+        else:
+            tensor = np.empty(shape, dtype=np.float32)
+
+        def load(position: int, index: int):
+            try:
+                content = bucket.download(f"{key}/index_{index}.nc")
+            except StorageException as e:
+                # all rows within the shape of the dataset need to be there
+                if is_not_found(e):
+                    raise FileNotFoundError(f"Row {index} of dataset '{key}' not found")
+                raise e
+            tensor[position] = decode_netcdf(content)[inner]
+
+        with ThreadPoolExecutor(max_workers=max(1, min(DOWNLOAD_WORKERS, len(indices)))) as executor:
+            list(executor.map(load, range(len(indices)), indices))
+
+        return write_into(out, tensor)
+
+    def insert_dataset(self, key: str, shape: Tuple[int], dim: int, type: str = 'float32', is_shared: bool = False) -> Dataset:
         # setup auth token
         self.__setup_auth()
 
         # create the dataset metadata as a json
-        metadata = json.dumps(dict(id=key, key=key, shape=shape, ndim=dim, type=type, is_shared=is_shared))
+        dataset = Dataset(id=key, key=key, shape=[int(size) for size in shape], ndim=dim, type=type, is_shared=is_shared)
+        self._upload_metadata(dataset)
 
-        # upload the metadata
-        res = self.backend.client.storage.from_(self.user_id).upload(f"{key}/dataset.json", metadata.encode('utf-8'))
-
-        # restore the original auth token
-        self.__restore_auth()
+        return dataset
 
-        return res.json()
+    def _upload_metadata(self, dataset: Dataset):
+        # the metadata is overwritten, whenever the shape changes
+        metadata = json.dumps(dict(id=dataset.id, key=dataset.key, shape=list(dataset.shape), ndim=dataset.ndim, type=dataset.type, is_shared=dataset.is_shared))
+        self.backend.client.storage.from_(self.user_id).upload(f"{dataset.key}/dataset.json", metadata.encode('utf-8'), file_options={'upsert': 'true'})
+
+    def _list_objects(self, path: str) -> List[Dict[str, Any]]:
+        # the storage API lists the objects of a folder in pages
+        bucket = self.backend.client.storage.from_(self.user_id)
+        objects, offset = [], 0
+        while True:
+            page = bucket.list(path, {'limit': LIST_LIMIT, 'offset': offset})
+            objects.extend(page)
+            if len(page) < LIST_LIMIT:
+                return objects
+            offset += LIST_LIMIT
     
     def insert_tensor(self, data_id: int, data: List[np.ndarray], offset: int = 0) -> bool:
         # setup auth token
@@ -100,37 +189,50 @@ class StorageContext(BaseContext):
 
         # upload each netcdf chunk
         for i, arr in enumerate(data):
-            # build the netcdf
-            netcdf = xr.Dataset({data_id: xr.DataArray(arr, dims=[f"dim_{i + 2}" for i in range(arr.ndim)])})
-            
-            # buffer and get the bytes
-            buf = io.BytesIO()
-            netcdf.to_netcdf(buf)
-            buf.seek(0)
-            b_netcdf = buf.getvalue()
+            self.backend.client.storage.from_(self.user_id).upload(f"{data_id}/index_{int(i + 1 + offset)}.nc", encode_netcdf(data_id, arr))
 
-            # upload the netcdf
-            self.backend.client.storage.from_(self.user_id).upload(f"{data_id}/index_{int(i + 1 + offset)}.nc", b_netcdf)
+        return True
 
-        # restore the original auth token
-        self.__restore_auth()
+    def append_tensor(self, key: str, data: List[np.ndarray]) -> bool:
+        # first, get the dataset
+        try:
+            dataset = self.get_dataset(key)
+        except FileNotFoundError:
+            raise KeyError(f"Dataset '{key}' not found. You cannot append to a non-existing datasets.")
+
+        # append the rows of each batch right after the last index
+        offset = dataset.shape[0]
+        for chunk in data:
+            self.insert_tensor(data_id=dataset.id, data=[row for row in chunk], offset=offset)
+            offset += len(chunk)
+
+        # if there was no error, update the dataset
+        self.set_dataset_shape(dataset.id, [offset, *dataset.shape[1:]])
+
+        return True
+
+    def set_dataset_shape(self, data_id: int, shape: List[int]) -> bool:
+        # the id of a dataset in the storage is its key
+        dataset = self.get_dataset(data_id)
+        dataset.shape = [int(size) for size in shape]
+        self._upload_metadata(dataset)
 
         return True
 
-    def append_tensor(self, key: str, data: List[np.ndarray]) -> bool:
-        return super().append_tensor(key, data)
-    
     def remove_dataset(self, key: str) -> bool:
         # setup auth token
         self.__setup_auth()
 
-        # remove the dataset
-        self.backend.client.storage.from_(self.user_id).remove(f"{key}")
+        # a folder is removed along with its last object
+        paths = [f"{key}/{obj['name']}" for obj in self._list_objects(key)]
+        if len(paths) > 0:
+            self.backend.client.storage.from_(self.user_id).remove(paths)
 
-        # restore the original auth token
-        self.__restore_auth()
-        
         return True
-    
+
     def list_dataset_keys(self) -> List[str]:
-        return super().list_dataset_keys()
+        # setup auth token
+        self.__setup_auth()
+
+        # each dataset is a folder at the root of the bucket, folders have no id
+        return [obj['name'] for obj in self._list_objects('') if obj.get('id') is None]
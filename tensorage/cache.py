@@ -0,0 +1,262 @@
+"""
+This module provides the client-side caches of the TensorStore.
+
+The `ChunkCache` keeps rows along the first axis of datasets in memory, keyed by
+dataset id and index. The cache is bounded by a byte budget and evicts the least
+recently used rows first.
+
+The `MetadataCache` keeps the `Dataset` objects and the list of dataset keys for
+a limited time, so that slicing a dataset in a loop does not hit the backend for
+metadata on every access.
+
+Example:
+
+    .. code-block:: python
+        # enable a cache of 256 MB
+        store = TensorStore(backend, cache_size=256 * 2**20)
+
+        # the second read is served from memory
+        store.my_dataset[0:12]
+        store.my_dataset[4:8, 2]
+
+        print(store.cache.info())
+"""
+from typing import Dict, List, Optional, Tuple
+from collections import OrderedDict
+from dataclasses import dataclass, field
+import threading
+import time
+
+import numpy as np
+
+from tensorage.types import Dataset
+
+
+@dataclass
+class ChunkCache(object):
+    """
+    A least recently used cache for rows along the first axis of datasets.
+
+    Args:
+        max_bytes (int): The maximum number of bytes held by the cache.
+
+    Attributes:
+        hits (int): The number of rows served from the cache.
+        misses (int): The number of rows that had to be loaded from the backend.
+        nbytes (int): The number of bytes currently held by the cache.
+
+    """
+    max_bytes: int
+    hits: int = field(default=0, init=False)
+    misses: int = field(default=0, init=False)
+    nbytes: int = field(default=0, init=False)
+
+    _rows: 'OrderedDict[Tuple[int, int], np.ndarray]' = field(default_factory=OrderedDict, init=False, repr=False)
+    _keys: Dict[int, str] = field(default_factory=dict, init=False, repr=False)
+    _lock: threading.RLock = field(default_factory=threading.RLock, init=False, repr=False)
+
+    def get(self, dataset: Dataset, index: int) -> Optional[np.ndarray]:
+        """
+        Get a row of the dataset from the cache.
+
+        Args:
+            dataset (Dataset): The dataset the row belongs to.
+            index (int): The database index of the row along the first axis.
+
+        Returns:
+            Optional[np.ndarray]: The cached row, or None if it is not cached.
+        """
+        with self._lock:
+            row = self._rows.get((dataset.id, index))
+
+            if row is None:
+                self.misses += 1
+                return None
+
+            # mark as recently used
+            self._rows.move_to_end((dataset.id, index))
+            self.hits += 1
+            return row
+
+    def put(self, dataset: Dataset, index: int, row: np.ndarray):
+        """
+        Put a row of the dataset into the cache and evict the least recently used rows,
+        until the cache fits into max_bytes again. Rows larger than the cache are not stored.
+
+        Args:
+            dataset (Dataset): The dataset the row belongs to.
+            index (int): The database index of the row along the first axis.
+            row (np.ndarray): The full row, covering all inner axes. Views are stored as a copy.
+        """
+        if row.nbytes > self.max_bytes:
+            return
+
+        # a view would keep the whole fetched batch alive, beyond the counted bytes
+        if row.base is not None:
+            row = row.copy()
+
+        with self._lock:
+            # replace an existing entry
+            old = self._rows.pop((dataset.id, index), None)
+            if old is not None:
+                self.nbytes -= old.nbytes
+
+            self._rows[(dataset.id, index)] = row
+            self._keys[dataset.id] = dataset.key
+            self.nbytes += row.nbytes
+
+            # evict the least recently used rows
+            while self.nbytes > self.max_bytes:
+                _, evicted = self._rows.popitem(last=False)
+                self.nbytes -= evicted.nbytes
+
+    def invalidate(self, key: str):
+        """
+        Remove all rows of the dataset with the given key from the cache.
+
+        Args:
+            key (str): The unique identifier of the dataset.
+        """
+        with self._lock:
+            ids = [data_id for data_id, data_key in self._keys.items() if data_key == key]
+
+            for cache_key in [cache_key for cache_key in self._rows if cache_key[0] in ids]:
+                self.nbytes -= self._rows.pop(cache_key).nbytes
+
+            for data_id in ids:
+                del self._keys[data_id]
+
+    def clear(self):
+        """
+        Remove all rows from the cache and reset the counters.
+        """
+        with self._lock:
+            self._rows.clear()
+            self._keys.clear()
+            self.nbytes = 0
+            self.hits = 0
+            self.misses = 0
+
+    def info(self) -> Dict[str, int]:
+        """
+        Get the counters of the cache.
+
+        Returns:
+            Dict[str, int]: The hits, misses, number of rows and bytes held by the cache.
+        """
+        with self._lock:
+            return dict(hits=self.hits, misses=self.misses, rows=len(self._rows), nbytes=self.nbytes, max_bytes=self.max_bytes)
+
+
+@dataclass
+class MetadataCache(object):
+    """
+    A time-to-live cache for the dataset metadata and the list of dataset keys.
+
+    Args:
+        ttl (float): The number of seconds an entry is valid. 0 disables the cache.
+
+    """
+    ttl: float
+
+    _datasets: Dict[str, Tuple[float, Dataset]] = field(default_factory=dict, init=False, repr=False)
+    _keys: Optional[Tuple[float, List[str]]] = field(default=None, init=False, repr=False)
+    _lock: threading.RLock = field(default_factory=threading.RLock, init=False, repr=False)
+
+    def _valid(self, stored_at: float) -> bool:
+        return time.monotonic() - stored_at < self.ttl
+
+    def get_dataset(self, key: str) -> Optional[Dataset]:
+        """
+        Get the dataset with the given key, if it is cached and not expired.
+
+        Args:
+            key (str): The unique identifier of the dataset.
+
+        Returns:
+            Optional[Dataset]: The cached dataset, or None.
+        """
+        with self._lock:
+            entry = self._datasets.get(key)
+            if entry is None or not self._valid(entry[0]):
+                return None
+            return entry[1]
+
+    def put_dataset(self, dataset: Dataset):
+        """
+        Put a dataset into the cache.
+
+        Args:
+            dataset (Dataset): The dataset to cache.
+        """
+        if self.ttl <= 0:
+            return
+
+        with self._lock:
+            self._datasets[dataset.key] = (time.monotonic(), dataset)
+
+    def get_keys(self) -> Optional[List[str]]:
+        """
+        Get the list of dataset keys, if it is cached and not expired.
+
+        Returns:
+            Optional[List[str]]: The cached keys, or None.
+        """
+        with self._lock:
+            if self._keys is None or not self._valid(self._keys[0]):
+                return None
+            return list(self._keys[1])
+
+    def put_keys(self, keys: List[str]):
+        """
+        Put the list of dataset keys into the cache.
+
+        Args:
+            keys (List[str]): The dataset keys.
+        """
+        if self.ttl <= 0:
+            return
+
+        with self._lock:
+            self._keys = (time.monotonic(), list(keys))
+
+    def add_key(self, key: str):
+        """
+        Add a key to the cached list of keys, without changing its expiry.
+
+        Args:
+            key (str): The unique identifier of the new dataset.
+        """
+        with self._lock:
+            if self._keys is not None and key not in self._keys[1]:
+                self._keys[1].append(key)
+
+    def remove_key(self, key: str):
+        """
+        Remove a key and its dataset from the cache, without changing the expiry of the keys.
+
+        Args:
+            key (str): The unique identifier of the removed dataset.
+        """
+        with self._lock:
+            self._datasets.pop(key, None)
+            if self._keys is not None and key in self._keys[1]:
+                self._keys[1].remove(key)
+
+    def invalidate(self, key: str):
+        """
+        Remove the dataset with the given key from the cache.
+
+        Args:
+            key (str): The unique identifier of the dataset.
+        """
+        with self._lock:
+            self._datasets.pop(key, None)
+
+    def clear(self):
+        """
+        Remove all datasets and keys from the cache.
+        """
+        with self._lock:
+            self._datasets.clear()
+            self._keys = None
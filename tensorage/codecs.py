@@ -0,0 +1,186 @@
+"""
+This module provides the compression codecs for tensor chunks.
+
+A codec is given by a spec string of the form ``[shuffle+]name[:level]``, like ``'zlib'``,
+``'lzma:6'`` or ``'shuffle+zstd:3'``. The optional byte-shuffle groups the bytes of all
+float32 values by their significance before compression, which makes smooth fields
+compress a lot better. The spec is recorded with the dataset, thus chunks are decoded
+transparently on read.
+The ``zlib`` and ``lzma`` codecs are part of the standard library, ``zstd`` needs the
+``zstandard`` package. Further codecs can be added with `register_codec`.
+
+Example:
+
+    .. code-block:: python
+        # store new datasets compressed
+        store = TensorStore(backend, compressor='shuffle+zlib')
+        store['my_dataset'] = np.random.random((500, 10, 10))
+"""
+from typing import Callable, Dict, List, Optional, Tuple
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass
+import threading
+import zlib
+import lzma
+import os
+
+import numpy as np
+
+
+# the compress and decompress functions of all known codecs
+_CODECS: Dict[str, Tuple[Callable[[bytes, Optional[int]], bytes], Callable[[bytes], bytes]]] = {
+    'zlib': (lambda buf, level: zlib.compress(buf, level if level is not None else 6), zlib.decompress),
+    'lzma': (lambda buf, level: lzma.compress(buf, preset=level), lzma.decompress),
+}
+
+
+def _zstd_module():
+    try:
+        import zstandard
+    except ImportError:
+        raise ImportError("The 'zstd' codec needs the zstandard package. Install it like: pip install zstandard")
+    return zstandard
+
+
+_CODECS['zstd'] = (
+    lambda buf, level: _zstd_module().ZstdCompressor(level=level if level is not None else 3).compress(buf),
+    lambda buf: _zstd_module().ZstdDecompressor().decompress(buf),
+)
+
+
+def register_codec(name: str, compress: Callable[[bytes, Optional[int]], bytes], decompress: Callable[[bytes], bytes]):
+    """
+    Registers a new compression codec, which can then be used in codec specs.
+
+    Args:
+        name (str): The name of the codec.
+        compress (Callable[[bytes, Optional[int]], bytes]): Compresses a buffer with an optional level.
+        decompress (Callable[[bytes], bytes]): Decompresses a buffer.
+    """
+    _CODECS[name] = (compress, decompress)
+
+
+@dataclass(frozen=True)
+class Codec(object):
+    """
+    A compression codec for float32 chunks.
+
+    Args:
+        name (str): The name of the registered codec.
+        level (Optional[int]): The compression level. None uses the default of the codec.
+        shuffle (bool): If True, the bytes are shuffled before compression.
+
+    """
+    name: str
+    level: Optional[int] = None
+    shuffle: bool = False
+
+    @classmethod
+    def from_spec(cls, spec: str) -> 'Codec':
+        """
+        Parses a codec spec like 'shuffle+zstd:3'.
+
+        Args:
+            spec (str): The codec spec.
+
+        Returns:
+            Codec: The codec.
+
+        Raises:
+            ValueError: If the spec names an unknown codec or has an invalid level.
+        """
+        shuffle = spec.startswith('shuffle+')
+        name, _, level = spec[8 if shuffle else 0:].partition(':')
+
+        if name not in _CODECS:
+            raise ValueError(f"Unknown compressor '{name}'. Available are: {', '.join(_CODECS.keys())}")
+        if level != '' and not level.isdigit():
+            raise ValueError(f"The compression level needs to be an integer, got '{level}'.")
+
+        return cls(name=name, level=int(level) if level != '' else None, shuffle=shuffle)
+
+    @property
+    def spec(self) -> str:
+        """
+        The spec string of the codec, as recorded with the dataset.
+        """
+        return f"{'shuffle+' if self.shuffle else ''}{self.name}{f':{self.level}' if self.level is not None else ''}"
+
+    def encode(self, chunk: np.ndarray) -> bytes:
+        """
+        Compresses a chunk as little-endian float32 buffer.
+
+        Args:
+            chunk (np.ndarray): The chunk to compress.
+
+        Returns:
+            bytes: The compressed buffer.
+        """
+        buf = np.ascontiguousarray(chunk, dtype='<f4')
+        if self.shuffle:
+            buf = np.ascontiguousarray(buf.view(np.uint8).reshape(-1, 4).T)
+
+        return _CODECS[self.name][0](buf.tobytes(), self.level)
+
+    def decode(self, buf: bytes, shape: Tuple[int, ...]) -> np.ndarray:
+        """
+        Decompresses a buffer into a float32 chunk.
+
+        Args:
+            buf (bytes): The compressed buffer.
+            shape (Tuple[int, ...]): The shape of the chunk.
+
+        Returns:
+            np.ndarray: The decompressed chunk.
+        """
+        raw = np.frombuffer(_CODECS[self.name][1](buf), dtype=np.uint8)
+        if self.shuffle:
+            raw = np.ascontiguousarray(raw.reshape(4, -1).T)
+
+        return raw.view('<f4').astype(np.float32).reshape(shape)
+
+
+# the thread pool shared by all encode and decode calls, compression releases the GIL
+_POOL: Optional[ThreadPoolExecutor] = None
+_POOL_LOCK = threading.Lock()
+
+
+def _pool() -> ThreadPoolExecutor:
+    global _POOL
+    with _POOL_LOCK:
+        if _POOL is None:
+            _POOL = ThreadPoolExecutor(max_workers=min(8, os.cpu_count() or 1), thread_name_prefix='tensorage-codec')
+        return _POOL
+
+
+def encode_chunks(codec: Codec, chunks: List[np.ndarray]) -> List[bytes]:
+    """
+    Compresses the chunks in the shared thread pool.
+
+    Args:
+        codec (Codec): The codec to use.
+        chunks (List[np.ndarray]): The chunks to compress.
+
+    Returns:
+        List[bytes]: The compressed buffers, in order.
+    """
+    if len(chunks) <= 1:
+        return [codec.encode(chunk) for chunk in chunks]
+    return list(_pool().map(codec.encode, chunks))
+
+
+def decode_chunks(codec: Codec, buffers: List[bytes], shapes: List[Tuple[int, ...]]) -> List[np.ndarray]:
+    """
+    Decompresses the buffers in the shared thread pool.
+
+    Args:
+        codec (Codec): The codec to use.
+        buffers (List[bytes]): The compressed buffers.
+        shapes (List[Tuple[int, ...]]): The shape of each chunk.
+
+    Returns:
+        List[np.ndarray]: The decompressed chunks, in order.
+    """
+    if len(buffers) <= 1:
+        return [codec.decode(buf, shape) for buf, shape in zip(buffers, shapes)]
+    return list(_pool().map(codec.decode, buffers, shapes))
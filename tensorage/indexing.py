@@ -0,0 +1,341 @@
+"""
+This module resolves NumPy indexing on datasets of the TensorStore.
+
+A key like ``[::24, ..., -1, None]`` is resolved into a `Selection`: the bounding box of
+the selected elements along each axis of the dataset, the step along each axis, which is
+applied by the backend, and the index applied to the loaded box afterwards. The latter
+drops the axes indexed by integers, reverses axes sliced with a negative step and
+inserts new axes for None, following the NumPy semantics.
+
+Integer arrays and boolean masks are resolved into the sorted, unique positions to load
+and the inverse index into them. Along the first axis, only the rows at these positions
+are loaded in a single request. Along the inner axes, the bounding range is loaded and
+the positions are taken locally. As the inverse indices take the place of the arrays in
+the key, NumPy places the resulting axes just like for the dataset itself.
+
+The database index of the box is 1-based: the index along the first axis excludes its
+upper bound, while the slices along the inner axes include it, like Postgres array slices.
+"""
+from typing import Any, List, Optional, Tuple, Union
+from dataclasses import dataclass, field
+
+import numpy as np
+
+
+@dataclass
+class Selection(object):
+    """
+    The resolved selection of a dataset.
+
+    Args:
+        start (List[int]): The first selected element along each axis, zero-based.
+        stop (List[int]): One past the last selected element along each axis. Equals start, if nothing is selected.
+        step (List[int]): The positive step along each axis.
+        flip (List[bool]): True for axes selected with a negative step.
+        post (Tuple[Any, ...]): The index applied to the loaded box.
+        take (List[Optional[np.ndarray]]): The sorted, unique positions along axes indexed by an array.
+        inverse (List[Optional[np.ndarray]]): The index into take reproducing the requested positions.
+
+    """
+    start: List[int]
+    stop: List[int]
+    step: List[int]
+    flip: List[bool]
+    post: Tuple[Any, ...]
+    take: List[Optional[np.ndarray]] = field(default_factory=list)
+    inverse: List[Optional[np.ndarray]] = field(default_factory=list)
+
+    @property
+    def box_shape(self) -> Tuple[int, ...]:
+        """
+        The shape of the loaded box, before post is applied. Along the first axis,
+        an array index loads only the rows at its positions.
+        """
+        shape = [len(range(start, stop, step)) for start, stop, step in zip(self.start, self.stop, self.step)]
+        if self.fancy_rows:
+            shape[0] = len(self.take[0])
+        return tuple(shape)
+
+    @property
+    def fancy(self) -> bool:
+        """
+        True, if any axis is indexed by an integer array or boolean mask.
+        """
+        return any(take is not None for take in self.take)
+
+    @property
+    def fancy_rows(self) -> bool:
+        """
+        True, if the first axis is indexed by an integer array or boolean mask.
+        """
+        return len(self.take) > 0 and self.take[0] is not None
+
+    @property
+    def rows(self) -> Optional[List[int]]:
+        """
+        The sorted database indices of the rows to load, None if the first axis is not indexed by an array.
+        """
+        return [int(i) + 1 for i in self.take[0]] if self.fancy_rows else None
+
+    @property
+    def empty(self) -> bool:
+        """
+        True, if no element is selected.
+        """
+        return any(size == 0 for size in self.box_shape)
+
+    @property
+    def strided(self) -> bool:
+        """
+        True, if any axis is selected with a step.
+        """
+        return any(step != 1 for step in self.step)
+
+    @property
+    def index(self) -> List[int]:
+        """
+        The lower and upper (exclusive) database index along the first axis.
+        """
+        return [self.start[0] + 1, self.stop[0] + 1]
+
+    @property
+    def slices(self) -> List[List[int]]:
+        """
+        The lower and upper (inclusive) database index along each inner axis.
+        """
+        return [[start + 1, stop] for start, stop in zip(self.start[1:], self.stop[1:])]
+
+    @property
+    def steps(self) -> Optional[List[int]]:
+        """
+        The steps passed to the backend, None if there is no step.
+        """
+        return list(self.step) if self.strided else None
+
+    @property
+    def shape(self) -> Tuple[int, ...]:
+        """
+        The shape of the selected tensor, after post is applied.
+        """
+        # index a zero-strided box, which does not allocate the tensor
+        box = np.lib.stride_tricks.as_strided(np.zeros(1, dtype=np.float32), self.box_shape, [0] * len(self.box_shape))
+        return self.finalize(box).shape
+
+    @property
+    def direct(self) -> bool:
+        """
+        True, if the loaded box already is the selected tensor, thus it can be loaded into an output array.
+        """
+        return not self.fancy and all(isinstance(p, slice) for p in self.post) and not any(self.flip) and len(self.post) == len(self.start)
+
+    def gather(self, box: np.ndarray) -> np.ndarray:
+        """
+        Takes the positions of the array indices along the inner axes of the loaded box.
+        The rows along the first axis are already selected by the backend.
+
+        Args:
+            box (np.ndarray): The loaded box.
+
+        Returns:
+            np.ndarray: The box holding only the unique positions along each axis.
+        """
+        for axis, take in enumerate(self.take[1:], start=1):
+            if take is not None:
+                box = np.take(box, take - self.start[axis], axis=axis)
+        return box
+
+    def finalize(self, box: np.ndarray) -> np.ndarray:
+        """
+        Applies the integer indices, array indices, negative steps and new axes to the loaded box.
+
+        Args:
+            box (np.ndarray): The loaded box.
+
+        Returns:
+            np.ndarray: The selected tensor.
+        """
+        return self.gather(box)[self.post]
+
+
+def resolve_selection(args: Tuple[Any, ...], shape: Tuple[int, ...]) -> Selection:
+    """
+    Resolves a NumPy basic index, made of integers, slices, Ellipsis and None, on a dataset.
+
+    Args:
+        args (Tuple[Any, ...]): The index.
+        shape (Tuple[int, ...]): The shape of the dataset.
+
+    Returns:
+        Selection: The resolved selection.
+
+    Raises:
+        IndexError: If there are too many indices, more than one Ellipsis, an integer is out of bounds
+            or a boolean mask does not match its axis.
+        KeyError: If an index is neither an integer, slice, integer array, boolean mask, Ellipsis nor None.
+    """
+    ndim = len(shape)
+
+    # the number of axes indexed explicitly
+    ellipses = sum(1 for arg in args if arg is Ellipsis)
+    if ellipses > 1:
+        raise IndexError("An index can only have a single ellipsis ('...').")
+    indexed = sum(1 for arg in args if arg is not None and arg is not Ellipsis)
+    if indexed > ndim:
+        raise IndexError(f"Too many indices: the dataset is {ndim}-dimensional, but {indexed} were indexed.")
+
+    # expand the Ellipsis, or append the missing axes
+    expanded = []
+    for arg in args:
+        if arg is Ellipsis:
+            expanded.extend([slice(None)] * (ndim - indexed))
+        else:
+            expanded.append(arg)
+    if ellipses == 0:
+        expanded.extend([slice(None)] * (ndim - indexed))
+
+    start, stop, step, flip, post, take, inverse = [], [], [], [], [], [], []
+    axis = 0
+    for arg in expanded:
+        if arg is None:
+            post.append(np.newaxis)
+            continue
+
+        size = shape[axis]
+        if isinstance(arg, (int, np.integer)) and not isinstance(arg, (bool, np.bool_)):
+            i = int(arg) + size if arg < 0 else int(arg)
+            if not 0 <= i < size:
+                raise IndexError(f"The index {arg} is out of bounds for axis {axis} with size {size}.")
+            start.append(i)
+            stop.append(i + 1)
+            step.append(1)
+            flip.append(False)
+            post.append(0)
+            take.append(None)
+            inverse.append(None)
+        elif isinstance(arg, (list, np.ndarray)):
+            positions = _resolve_array(arg, axis, size)
+
+            # load the unique positions in ascending order, the inverse restores the requested order
+            unique, inv = np.unique(positions, return_inverse=True)
+            inv = inv.reshape(positions.shape)
+            start.append(int(unique[0]) if unique.size > 0 else 0)
+            stop.append(int(unique[-1]) + 1 if unique.size > 0 else 0)
+            step.append(1)
+            flip.append(False)
+            post.append(inv)
+            take.append(unique)
+            inverse.append(inv.ravel())
+        elif isinstance(arg, slice):
+            selected = range(*arg.indices(size))
+            if len(selected) == 0:
+                start.append(0)
+                stop.append(0)
+                step.append(1)
+                flip.append(False)
+            elif selected.step > 0:
+                start.append(selected[0])
+                stop.append(selected[-1] + 1)
+                step.append(selected.step)
+                flip.append(False)
+            else:
+                # load the same elements in ascending order and reverse them afterwards
+                start.append(selected[-1])
+                stop.append(selected[0] + 1)
+                step.append(-selected.step)
+                flip.append(True)
+            post.append(slice(None, None, -1) if flip[-1] else slice(None))
+            take.append(None)
+            inverse.append(None)
+        elif axis == 0:
+            raise KeyError('Batch index needs to be passed as int or slice, integer array or boolean mask.')
+        else:
+            raise KeyError('Slice needs to be passed as int or slice, integer array, boolean mask, Ellipsis or None.')
+
+        axis += 1
+
+    return Selection(start=start, stop=stop, step=step, flip=flip, post=tuple(post), take=take, inverse=inverse)
+
+
+def _resolve_array(arg: Union[list, np.ndarray], axis: int, size: int) -> np.ndarray:
+    """
+    Resolves an integer array or boolean mask along one axis into non-negative positions.
+
+    Raises:
+        IndexError: If a position is out of bounds or the mask does not match the axis.
+        KeyError: If the array is neither of integer nor boolean type.
+    """
+    arr = np.asarray(arg)
+
+    # an empty list has a float dtype in numpy
+    if arr.size == 0 and arr.dtype.kind not in 'biu':
+        arr = arr.astype(np.intp)
+
+    if arr.dtype.kind == 'b':
+        if arr.ndim != 1 or arr.shape[0] != size:
+            raise IndexError(f"The boolean mask of shape {arr.shape} does not match axis {axis} with size {size}.")
+        return np.flatnonzero(arr)
+    if arr.dtype.kind not in 'iu':
+        raise KeyError(f"Array indices need to be of integer or boolean type, got {arr.dtype}.")
+
+    positions = np.where(arr < 0, arr + size, arr).astype(np.intp)
+    if positions.size > 0 and (positions.min() < 0 or positions.max() >= size):
+        raise IndexError(f"An index of the array is out of bounds for axis {axis} with size {size}.")
+    return positions
+
+
+def write_into(out: Optional[np.ndarray], arr: np.ndarray) -> np.ndarray:
+    """
+    Copies a loaded tensor into the output array, if there is one.
+
+    Args:
+        out (Optional[np.ndarray]): The output array. None returns the tensor as is.
+        arr (np.ndarray): The loaded tensor.
+
+    Returns:
+        np.ndarray: The output array, or the tensor if there is no output array.
+
+    Raises:
+        ValueError: If the output array does not have the shape of the tensor.
+    """
+    if out is None or arr is out:
+        return arr
+    if out.shape != arr.shape:
+        raise ValueError(f"The output array of shape {out.shape} does not match the tensor of shape {arr.shape}.")
+    out[...] = arr
+    return out
+
+
+def apply_steps(arr: np.ndarray, step: Optional[List[int]]) -> np.ndarray:
+    """
+    Applies the steps to a loaded box, for backends that cannot stride themselves.
+
+    Args:
+        arr (np.ndarray): The box, starting at the first selected element along each axis.
+        step (Optional[List[int]]): The step along each axis.
+
+    Returns:
+        np.ndarray: The strided box.
+    """
+    if step is None:
+        return arr
+    return arr[tuple(slice(None, None, s) for s in step)]
+
+
+def contiguous_runs(indices: List[int], step: int = 1) -> List[Tuple[int, int]]:
+    """
+    Groups sorted indices into runs of indices, which are step apart.
+
+    Args:
+        indices (List[int]): The sorted indices.
+        step (int): The distance of consecutive indices within a run.
+
+    Returns:
+        List[Tuple[int, int]]: The lower (inclusive) and upper (exclusive) bound of each run.
+    """
+    runs = []
+    for idx in indices:
+        if len(runs) > 0 and runs[-1][1] - 1 + step == idx:
+            runs[-1][1] = idx + 1
+        else:
+            runs.append([idx, idx + 1])
+    return [(low, up) for low, up in runs]
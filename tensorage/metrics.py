@@ -0,0 +1,232 @@
+"""
+This module provides the per-operation metrics of the TensorStore.
+
+If metrics are enabled, every call to a backend context method is timed and recorded
+along with the bytes sent and received, the number of rows touched and whether it
+failed. The time spent borrowing the authenticated session is recorded as the
+``session`` operation. The cumulative counters are available from `TensorStore.stats`,
+and callbacks receive each `OperationEvent`, e.g. to feed them into Prometheus.
+If metrics are disabled, which is the default, the backend contexts are not wrapped at all.
+
+Example:
+
+    .. code-block:: python
+        store = TensorStore(backend, metrics=True)
+        store.my_dataset[0:12]
+
+        print(store.stats()['get_tensor'])
+
+        # forward each operation to a prometheus histogram
+        store.metrics.add_callback(lambda event: LATENCY.labels(event.operation).observe(event.seconds))
+"""
+from typing import Any, Callable, ContextManager, Dict, Iterator, List
+from contextlib import contextmanager
+from dataclasses import dataclass, field, asdict
+import threading
+import time
+
+import numpy as np
+
+
+@dataclass(frozen=True)
+class OperationEvent(object):
+    """
+    A single recorded backend operation.
+
+    Args:
+        operation (str): The name of the backend context method.
+        seconds (float): The wall time of the call.
+        rows (int): The number of rows along the first axis, or tiles, sent or received.
+        bytes_sent (int): The tensor payload passed to the call in bytes.
+        bytes_received (int): The tensor payload returned by the call in bytes.
+        error (bool): True if the call raised an exception.
+        retries (int): The number of retries of the call.
+
+    """
+    operation: str
+    seconds: float
+    rows: int = 0
+    bytes_sent: int = 0
+    bytes_received: int = 0
+    error: bool = False
+    retries: int = 0
+
+
+@dataclass
+class OperationStats(object):
+    """
+    The cumulative counters of one operation.
+    """
+    calls: int = 0
+    errors: int = 0
+    retries: int = 0
+    seconds: float = 0.0
+    rows: int = 0
+    bytes_sent: int = 0
+    bytes_received: int = 0
+
+
+@dataclass
+class Metrics(object):
+    """
+    A registry of per-operation counters and callbacks.
+
+    Args:
+        callbacks (List[Callable[[OperationEvent], None]]): Called with every recorded event.
+
+    """
+    callbacks: List[Callable[[OperationEvent], None]] = field(default_factory=list)
+    _stats: Dict[str, OperationStats] = field(default_factory=dict, init=False, repr=False)
+    _lock: threading.Lock = field(default_factory=threading.Lock, init=False, repr=False)
+
+    def add_callback(self, callback: Callable[[OperationEvent], None]):
+        """
+        Registers a callback, which is called with every recorded event.
+
+        Args:
+            callback (Callable[[OperationEvent], None]): The callback.
+        """
+        self.callbacks.append(callback)
+
+    def record(self, event: OperationEvent):
+        """
+        Adds the event to the counters of its operation and passes it to the callbacks.
+
+        Args:
+            event (OperationEvent): The recorded operation.
+        """
+        with self._lock:
+            stats = self._stats.setdefault(event.operation, OperationStats())
+            stats.calls += 1
+            stats.errors += int(event.error)
+            stats.retries += event.retries
+            stats.seconds += event.seconds
+            stats.rows += event.rows
+            stats.bytes_sent += event.bytes_sent
+            stats.bytes_received += event.bytes_received
+
+        for callback in self.callbacks:
+            callback(event)
+
+    def record_retry(self, operation: str):
+        """
+        Counts a retry of the operation.
+
+        Args:
+            operation (str): The name of the retried backend context method.
+        """
+        with self._lock:
+            self._stats.setdefault(operation, OperationStats()).retries += 1
+
+    def stats(self) -> Dict[str, Dict[str, float]]:
+        """
+        Get a snapshot of the cumulative counters.
+
+        Returns:
+            Dict[str, Dict[str, float]]: The counters of each operation.
+        """
+        with self._lock:
+            return {operation: asdict(stats) for operation, stats in self._stats.items()}
+
+    def reset(self):
+        """
+        Resets all counters to zero.
+        """
+        with self._lock:
+            self._stats.clear()
+
+
+def payload_nbytes(value: Any) -> int:
+    """
+    Get the size of the tensor payload in a value, which may be an array or a
+    (nested) list of arrays, like the batches of rows or tiles.
+
+    Args:
+        value (Any): The value.
+
+    Returns:
+        int: The number of bytes of all arrays in the value.
+    """
+    if isinstance(value, np.ndarray):
+        return value.nbytes
+    if isinstance(value, (list, tuple)):
+        return sum(payload_nbytes(v) for v in value)
+    return 0
+
+
+def _rows(args: tuple, kwargs: dict, result: Any) -> int:
+    # returned tensors report their first axis, inserted batches their length
+    if isinstance(result, np.ndarray):
+        return result.shape[0] if result.ndim > 0 else 1
+    for value in (*args, *kwargs.values()):
+        if isinstance(value, list):
+            return len(value)
+    return 0
+
+
+class MeteredContext(object):
+    """
+    Wraps a backend context and records every call of its public methods.
+
+    Args:
+        context (BaseContext): The wrapped backend context.
+        metrics (Metrics): The registry to record to.
+
+    """
+    def __init__(self, context: Any, metrics: Metrics):
+        self._context = context
+        self._metrics = metrics
+
+    def __getattr__(self, name: str) -> Any:
+        attr = getattr(self._context, name)
+        if name.startswith('_') or not callable(attr):
+            return attr
+
+        def metered(*args, **kwargs):
+            start = time.perf_counter()
+            try:
+                result = attr(*args, **kwargs)
+            except BaseException:
+                self._metrics.record(OperationEvent(name, time.perf_counter() - start, bytes_sent=payload_nbytes(args) + payload_nbytes(list(kwargs.values())), error=True))
+                raise
+
+            self._metrics.record(OperationEvent(
+                operation=name,
+                seconds=time.perf_counter() - start,
+                rows=_rows(args, kwargs, result),
+                bytes_sent=payload_nbytes(args) + payload_nbytes(list(kwargs.values())),
+                bytes_received=payload_nbytes(result),
+            ))
+            return result
+
+        return metered
+
+
+@contextmanager
+def metered(wrapper: ContextManager, metrics: Metrics) -> Iterator[MeteredContext]:
+    """
+    Enters the context manager of a backend and yields the metered context.
+    The time spent entering, i.e. borrowing the authenticated session, is recorded as ``session``.
+
+    Args:
+        wrapper (ContextManager): The context manager of the backend, like `ContextWrapper`.
+        metrics (Metrics): The registry to record to.
+
+    Yields:
+        MeteredContext: The metered backend context.
+    """
+    start = time.perf_counter()
+    try:
+        context = wrapper.__enter__()
+    except BaseException:
+        metrics.record(OperationEvent('session', time.perf_counter() - start, error=True))
+        raise
+    metrics.record(OperationEvent('session', time.perf_counter() - start))
+
+    try:
+        yield MeteredContext(context, metrics)
+    except BaseException as e:
+        if not wrapper.__exit__(type(e), e, e.__traceback__):
+            raise
+    else:
+        wrapper.__exit__(None, None, None)
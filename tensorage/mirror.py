@@ -0,0 +1,160 @@
+"""
+This module provides local mirrors of remote datasets.
+
+A mirror materializes a dataset into a local memory-mapped float32 file, along with a
+JSON sidecar recording the dataset id and the shape synced so far. Pulling the mirror
+again only loads the rows appended to the remote dataset since the last sync. The
+mirror is a `StoreSlicer`, thus it is sliced just like the remote dataset, but served
+from local disk.
+
+Example:
+
+    .. code-block:: python
+        # download the dataset once
+        local = store.mirror('my_dataset', '/data/my_dataset.f4')
+
+        for epoch in range(100):
+            for batch in local.iter_batches(512):
+                ...
+
+        # later, only pull the new rows
+        local.pull()
+"""
+from typing import List, Optional
+from dataclasses import dataclass, field
+import json
+import os
+
+import numpy as np
+
+from tensorage.store import StoreSlicer
+from tensorage.tiles import resolve_bounds
+from tensorage.types import Dataset
+
+
+@dataclass
+class MirrorSlicer(StoreSlicer):
+    """
+    A slicer serving a dataset from a local mirror file.
+
+    Args:
+        _store (TensorStore): The tensor store the dataset is pulled from.
+        key (str): The key of the mirrored dataset.
+        dataset (Optional[Dataset]): The dataset as synced to the mirror.
+        path (str): The path of the mirror file. The sidecar is stored next to it.
+
+    """
+    path: str = field(default='')
+    _data: Optional[np.ndarray] = field(default=None, init=False, repr=False)
+
+    def __post_init__(self):
+        if self.path == '':
+            raise ValueError('The MirrorSlicer needs the path of the mirror file.')
+
+        # use the dataset as recorded in the sidecar
+        if self.dataset is None and os.path.exists(self.sidecar):
+            self.dataset = self._read_sidecar()
+
+        super().__post_init__()
+
+    @property
+    def sidecar(self) -> str:
+        """
+        The path of the JSON sidecar, recording the synced dataset.
+        """
+        return f"{self.path}.json"
+
+    def _read_sidecar(self) -> Dataset:
+        with open(self.sidecar, 'r') as f:
+            return Dataset(**json.load(f))
+
+    def _write_sidecar(self, dataset: Dataset):
+        # replace the sidecar atomically, so that it never records rows not yet written
+        tmp = f"{self.sidecar}.tmp"
+        with open(tmp, 'w') as f:
+            json.dump(dict(id=dataset.id, key=dataset.key, shape=list(dataset.shape), ndim=dataset.ndim, type=dataset.type, is_shared=dataset.is_shared), f)
+        os.replace(tmp, self.sidecar)
+
+    def _open(self) -> np.ndarray:
+        # memory mapping an empty file is not possible
+        if self.dataset.shape[0] == 0 or int(np.prod(self.dataset.shape)) == 0:
+            return np.empty(self.dataset.shape, dtype=np.float32)
+        return np.memmap(self.path, dtype='<f4', mode='r', shape=tuple(self.dataset.shape))
+
+    @property
+    def data(self) -> np.ndarray:
+        """
+        The memory-mapped data of the mirror.
+        """
+        if self._data is None:
+            self._data = self._open()
+        return self._data
+
+    def pull(self) -> int:
+        """
+        Synchronizes the mirror with the remote dataset. Only rows appended since the last
+        sync are loaded. If the remote dataset was replaced or its inner shape changed,
+        the mirror is downloaded again.
+
+        Returns:
+            int: The number of rows loaded.
+        """
+        # always use the current remote metadata
+        self._store._invalidate(self.key)
+        remote = self._store.get_dataset(self.key)
+
+        # check how much of the dataset was synced already
+        synced = 0
+        if os.path.exists(self.sidecar) and os.path.exists(self.path):
+            local = self._read_sidecar()
+            if local.id == remote.id and list(local.shape[1:]) == list(remote.shape[1:]) and local.shape[0] <= remote.shape[0]:
+                synced = local.shape[0]
+
+        # the data file is rewritten from scratch
+        if synced == 0:
+            open(self.path, 'wb').close()
+
+        # load the new rows in batches of about chunk_size elements
+        remote_slicer = StoreSlicer(self._store, self.key, dataset=remote)
+        rows = max(1, self._store.chunk_size // max(1, int(np.prod(remote.shape[1:]))))
+        with open(self.path, 'r+b') as f:
+            f.truncate(synced * int(np.prod(remote.shape[1:])) * 4)
+            f.seek(0, os.SEEK_END)
+            for start in range(synced, remote.shape[0], rows):
+                batch = remote_slicer[slice(start, min(start + rows, remote.shape[0]))]
+                f.write(np.ascontiguousarray(batch, dtype='<f4').tobytes())
+            f.flush()
+            os.fsync(f.fileno())
+
+        # record the new state only after the data is on disk
+        self._write_sidecar(remote)
+        self.dataset = remote
+        self._data = None
+
+        return remote.shape[0] - synced
+
+    def _load(self, index: List[int], slices: List[List[int]], step: Optional[List[int]] = None, rows: Optional[List[int]] = None, out: Optional[np.ndarray] = None) -> np.ndarray:
+        """
+        Loads the tensor from the local mirror file, following the same index and slice
+        conventions as the database.
+
+        Args:
+            index (List[int]): The lower and upper database index along the first axis.
+            slices (List[List[int]]): The lower and upper database index along each inner axis.
+            step (Optional[List[int]]): The step along each axis. None loads every element.
+            rows (Optional[List[int]]): The sorted, unique database indices of the rows to load
+                instead of the index range.
+            out (Optional[np.ndarray]): The array to copy the tensor into, straight from the mirror file.
+
+        Returns:
+            np.ndarray: The tensor data.
+        """
+        bounds = resolve_bounds(self.dataset.shape, index[0], index[1], [s[0] for s in slices], [s[1] for s in slices])
+        step = step if step is not None else [1] * len(bounds)
+        inner = tuple(slice(low, up, st) for (low, up), st in zip(bounds[1:], step[1:]))
+        if rows is not None:
+            return np.array(self.data[[idx - 1 for idx in rows]][(slice(None), *inner)], dtype=np.float32)
+        if out is not None:
+            out[...] = self.data[(slice(bounds[0][0], bounds[0][1], step[0]), *inner)]
+            return out
+        return np.array(self.data[(slice(bounds[0][0], bounds[0][1], step[0]), *inner)], dtype=np.float32)
@@ -0,0 +1,93 @@
+"""
+This module provides the reductions of the TensorStore.
+
+A reduction aggregates a slice of a dataset along some of its axes, like the temporal
+mean of a raster. The `DatabaseContext` runs reductions server-side in the
+``tensor_float4_reduce`` database function, thus only the reduced tensor is transferred.
+Other contexts and tiled datasets load the slice and reduce it locally with numpy.
+
+Example:
+
+    .. code-block:: python
+        # temporal mean of the full raster
+        mean = store.reduce('raster', 'mean', axis=0)
+
+        # maximum of the first 100 steps within a window
+        peak = store.reduce('raster', 'max', axis=0, slices=(slice(0, 100), slice(10, 20), slice(10, 20)))
+"""
+from typing import Callable, Dict, List, Optional, Tuple, Union
+
+import numpy as np
+
+
+# the numpy equivalents of the reductions, all of them are computed in double precision
+REDUCTIONS: Dict[str, Callable[..., np.ndarray]] = {
+    'sum': np.sum,
+    'mean': np.mean,
+    'min': np.min,
+    'max': np.max,
+    'std': np.std,
+    'var': np.var,
+}
+
+
+def normalize_axis(axis: Union[None, int, Tuple[int, ...], List[int]], ndim: int) -> List[int]:
+    """
+    Get the sorted, non-negative axes of a reduction.
+
+    Args:
+        axis (Union[None, int, Tuple[int, ...], List[int]]): The axes. None reduces all axes.
+        ndim (int): The number of dimensions of the dataset.
+
+    Returns:
+        List[int]: The axes to reduce.
+
+    Raises:
+        ValueError: If an axis is out of bounds or given twice.
+    """
+    if axis is None:
+        return list(range(ndim))
+    if isinstance(axis, (int, np.integer)):
+        axis = [axis]
+
+    axes = []
+    for a in axis:
+        if not -ndim <= a < ndim:
+            raise ValueError(f"The axis {a} is out of bounds for a dataset of {ndim} dimensions.")
+        axes.append(int(a) % ndim)
+
+    if len(set(axes)) != len(axes):
+        raise ValueError(f"The axes {tuple(axis)} contain duplicates.")
+    return sorted(axes)
+
+
+def check_op(op: str) -> str:
+    """
+    Checks the name of a reduction.
+
+    Raises:
+        ValueError: If the reduction is unknown.
+    """
+    if op not in REDUCTIONS:
+        raise ValueError(f"Unknown reduction '{op}'. Available are: {', '.join(REDUCTIONS.keys())}")
+    return op
+
+
+def reduce_array(arr: np.ndarray, op: str, axis: Optional[List[int]]) -> np.ndarray:
+    """
+    Reduces a tensor locally, like the database does.
+
+    Args:
+        arr (np.ndarray): The tensor to reduce.
+        op (str): The name of the reduction.
+        axis (Optional[List[int]]): The axes to reduce. None reduces all axes.
+
+    Returns:
+        np.ndarray: The reduced float32 tensor.
+
+    Raises:
+        ValueError: If the tensor is empty.
+    """
+    if arr.size == 0:
+        raise ValueError('Cannot reduce an empty selection.')
+    return np.asarray(REDUCTIONS[check_op(op)](arr.astype(np.float64), axis=tuple(axis) if axis is not None else None), dtype=np.float32)
@@ -0,0 +1,176 @@
+"""
+This module provides the retry policy for uploads of the TensorStore.
+
+Failed uploads are classified by their error: an expired or invalid token refreshes the
+session, transient server and network errors are retried with exponential backoff, and
+a payload too large or a statement timeout splits the failing batch in half. If a
+retried batch reports a duplicate key after a server error or timeout, the failed attempt
+was committed already and the batch is not written again. After errors that rejected the
+request, like an invalid token or a payload too large, a duplicate key is a real conflict.
+
+Example:
+
+    .. code-block:: python
+        # retry up to 5 times, starting with a 1 second backoff
+        store = TensorStore(backend, retry=RetryPolicy(max_retries=5, backoff=1.0))
+
+        # disable retries
+        store = TensorStore(backend, retry=None)
+"""
+from typing import Callable, Optional
+from typing_extensions import Literal
+from dataclasses import dataclass
+import random
+import time
+
+import httpx
+from postgrest.exceptions import APIError
+
+from tensorage.tracing import span
+
+
+# PostgREST and Postgres error codes of expired or invalid tokens
+AUTH_ERRORS = {'PGRST301', 'PGRST302', 'PGRST303', '401', 401}
+
+# payloads too large for the gateway and statement timeouts of the database
+SPLIT_ERRORS = {'413', 413, '504', 504, '57014'}
+
+# server errors, connection failures and serialization conflicts, which may succeed on retry
+TRANSIENT_ERRORS = {'500', 500, '502', 502, '503', 503, '408', 408, '429', 429, '08000', '08003', '08006', '40001', '40P01', '53300'}
+
+# gateway timeouts, whose request may still be committed by the database
+TIMEOUT_ERRORS = {'504', 504}
+
+# a retried batch was committed by an attempt that did not report success
+UNIQUE_VIOLATION = '23505'
+
+
+ErrorKind = Literal['auth', 'split', 'transient', 'duplicate']
+
+
+def classify(error: BaseException) -> Optional[ErrorKind]:
+    """
+    Classifies an error raised by a backend call.
+
+    Args:
+        error (BaseException): The raised error.
+
+    Returns:
+        Optional[ErrorKind]: The kind of the error, or None if it cannot be retried.
+    """
+    if isinstance(error, APIError):
+        if error.code in AUTH_ERRORS or 'JWT expired' in str(error.message):
+            return 'auth'
+        if error.code in SPLIT_ERRORS:
+            return 'split'
+        if error.code in TRANSIENT_ERRORS:
+            return 'transient'
+        if error.code == UNIQUE_VIOLATION:
+            return 'duplicate'
+        return None
+
+    if isinstance(error, httpx.TimeoutException):
+        return 'split'
+    if isinstance(error, httpx.TransportError):
+        return 'transient'
+    return None
+
+
+def may_have_committed(error: BaseException) -> bool:
+    """
+    Checks if a failed request may have been committed nonetheless, which is the case
+    for server errors and timeouts. Requests rejected on auth or size errors wrote nothing.
+
+    Args:
+        error (BaseException): The raised error.
+
+    Returns:
+        bool: True, if the request may have been committed.
+    """
+    if isinstance(error, httpx.TimeoutException):
+        return True
+    if isinstance(error, APIError) and error.code in TIMEOUT_ERRORS:
+        return True
+    return classify(error) == 'transient'
+
+
+@dataclass
+class RetryPolicy(object):
+    """
+    The retry policy of uploads.
+
+    Args:
+        max_retries (int): The number of retries of each batch, before the error is raised.
+        backoff (float): The delay in seconds before the first retry, doubled on each further retry.
+        max_backoff (float): The maximum delay in seconds.
+        split (bool): If True, batches failing on size or timeout errors are split in half.
+
+    """
+    max_retries: int = 3
+    backoff: float = 0.5
+    max_backoff: float = 30.0
+    split: bool = True
+
+    def delay(self, attempt: int) -> float:
+        """
+        Get the delay before the given retry, with exponential backoff and jitter.
+
+        Args:
+            attempt (int): The number of the retry, starting at 0.
+
+        Returns:
+            float: The delay in seconds.
+        """
+        return min(self.max_backoff, self.backoff * 2**attempt) * random.uniform(0.5, 1.0)
+
+    def run(self, func: Callable[[], bool], refresh: Optional[Callable[[], object]] = None, on_retry: Optional[Callable[[], None]] = None, committed: bool = False, can_split: bool = True, on_error: Optional[Callable[[BaseException], None]] = None) -> Optional[ErrorKind]:
+        """
+        Calls the upload function until it succeeds or the retries are exhausted.
+
+        Args:
+            func (Callable[[], bool]): The upload of a batch.
+            refresh (Optional[Callable[[], object]]): Refreshes the session on auth errors.
+            on_retry (Optional[Callable[[], None]]): Called before each retry.
+            committed (bool): True, if an earlier failed attempt on the same rows may have been committed already.
+            can_split (bool): False, if the batch cannot be split any further. Size errors are retried instead.
+            on_error (Optional[Callable[[BaseException], None]]): Called with the error of each failed attempt.
+
+        Returns:
+            Optional[ErrorKind]: 'split' if the batch needs to be split, None if it was uploaded.
+
+        Raises:
+            Exception: The error of the last attempt, if it cannot be retried.
+        """
+        attempt = 0
+        while True:
+            try:
+                func()
+                return None
+            except Exception as e:
+                kind = classify(e)
+
+                # the rows were written by a failed attempt, that may have been committed
+                if kind == 'duplicate' and committed:
+                    return None
+                committed = committed or may_have_committed(e)
+                if on_error is not None:
+                    on_error(e)
+
+                # split the batch, if possible
+                if kind == 'split' and self.split and can_split:
+                    return kind
+
+                if kind not in ('auth', 'transient', 'split') or attempt >= self.max_retries:
+                    raise e
+
+                # refresh the token, before retrying
+                if kind == 'auth' and refresh is not None:
+                    refresh()
+
+                if on_retry is not None:
+                    on_retry()
+
+                delay = self.delay(attempt) if kind != 'auth' else 0
+                with span('retry', 'retry', attempt=attempt + 1, kind=kind, delay=delay):
+                    time.sleep(delay)
+                attempt += 1
@@ -6,6 +6,9 @@ The `BackendSession` class provides methods for logging in and out of the backen
 as well as for accessing the various backend contexts (database, storage, etc.). 
 It also provides a context manager (`ContextWrapper`) for managing the 
 lifetime of backend contexts.
+The `AsyncBackendSession` and `AsyncContextWrapper` classes provide the same 
+functionality for the asyncio-native contexts. The `LocalSession` provides the
+same contexts on a local SQLite database, without any network access.
 
 Example:
     .. code-block:: python
@@ -14,24 +17,53 @@ Example:
         with session.database() as db:
             db.insert_dataset(key='test', shape=[1, 2, 3], dim=3)
 
+        # or within a coroutine
+        session = AsyncBackendSession()
+        async with session.database() as db:
+            await db.insert_dataset(key='test', shape=[1, 2, 3], dim=3)
+
 """
 
-from typing import Any, TypeVar, Generic, Type
+from typing import Any, Iterator, TypeVar, Generic, Type, Optional
 from dataclasses import dataclass, field
+from contextlib import contextmanager
+import asyncio
+import sqlite3
+import threading
+import time
 
-from supabase import Client, create_client
+from supabase import Client, create_client, AsyncClient, acreate_client
 from gotrue.types import AuthResponse, User, Session
 from dotenv import load_dotenv
 
 from .store import TensorStore
-from .backend.base import BaseContext
+from .async_store import AsyncTensorStore
+from .backend.base import BaseContext, AsyncBaseContext
 from .backend.database import DatabaseContext
 from .backend.storage import StorageContext
+from .backend.async_database import AsyncDatabaseContext
+from .backend.async_storage import AsyncStorageContext
+from .backend.local import LocalContext
+from .tracing import span, traced
 
 load_dotenv()
 
 
 C = TypeVar('C', bound=BaseContext)
+A = TypeVar('A', bound=AsyncBaseContext)
+
+
+def _expires_in(session: Optional[Session]) -> Optional[float]:
+    """
+    Seconds until the access token of the given session expires.
+
+    :param session: The authenticated session, if any.
+    :return: The remaining lifetime of the token, or None if unknown.
+    """
+    expires_at = getattr(session, 'expires_at', None)
+    if expires_at is None:
+        return None
+    return expires_at - time.time()
 
 @dataclass
 class ContextWrapper(Generic[C]):
@@ -40,9 +72,10 @@ class ContextWrapper(Generic[C]):
 
     The `ContextWrapper` class is a generic context manager that takes a 
     backend context class as a type parameter. It provides a `__enter__` method 
-    that logs in the backend session if it is not already logged in, 
-    and instantiates the backend context with an authenticated session. 
-    It also provides a `__exit__` method that logs out the backend session.
+    that borrows the long-lived authenticated session of the `BackendSession` 
+    (logging in or refreshing the token only if needed), and instantiates the 
+    backend context with it. The session is not signed out on `__exit__`, 
+    so consecutive contexts do not cost any additional auth round trips.
 
     Example:
         .. code-block:: python
@@ -59,9 +92,10 @@ class ContextWrapper(Generic[C]):
         """
         Enter the context manager and return the backend context instance.
 
-        If the backend session is not already logged in, this method logs 
-        in the session using the `login_by_mail` method of the `BackendSession` 
-        instance. It then instantiates the backend context with an authenticated 
+        This method borrows the authenticated session using the `ensure_session` 
+        method of the `BackendSession` instance, which only logs in if there is no 
+        session yet and only refreshes the token if it is about to expire. 
+        It then instantiates the backend context with an authenticated 
         session, and returns the context instance.
 
         Example:
@@ -73,9 +107,9 @@ class ContextWrapper(Generic[C]):
 
         :return: The backend context instance.
         """
-        # login the session if it is not logged in
-        if not hasattr(self._session, '_session') or self._session._session is None:
-            self._session.login_by_mail()
+        # borrow the authenticated session, this does only hit the backend if needed
+        with span('ensure_session', 'auth'):
+            self._session.ensure_session()
         
         # instatiate the store with an authenticated Session
         context = self.Context(self._session)
@@ -84,9 +118,10 @@ class ContextWrapper(Generic[C]):
 
     def __exit__(self, *args):
         """
-        Exit the context manager and log out the backend session.
+        Exit the context manager and release the backend context.
 
-        This method logs out the backend session using the `logout` method of the `BackendSession` instance.
+        The session is only borrowed by the context, thus it is **not** logged out here.
+        Use the `logout` method of the `BackendSession` instance to end the session explicitly.
 
         Example:
             .. code-block:: python
@@ -96,8 +131,9 @@ class ContextWrapper(Generic[C]):
                     db.insert_dataset(key='test', shape=[1, 2, 3], dim=3)
 
         :param args: The exception type, value, and traceback (if any).
-        """        # logout the session
-        self._session.logout()
+        """
+        # the session is only borrowed, so there is nothing to clean up
+        pass
 
 
 @dataclass
@@ -119,14 +155,17 @@ class BackendSession(object):
 
     :ivar client: The backend client instance.
     :ivar token: The authentication token for the backend session.
+    :ivar refresh_margin: Seconds before the token expires, at which it is refreshed.
     """
     email: str
     password: str
     backend_url: str 
     backend_key: str = field(repr=False)
+    refresh_margin: int = field(default=60, repr=False)
     _client: Client = field(init=False, repr=False)
     _user: User = field(init=False, repr=False)
     _session: Session = field(init=False, repr=False)
+    _lock: threading.RLock = field(init=False, repr=False, default_factory=threading.RLock)
 
 
     @property
@@ -150,6 +189,7 @@ class BackendSession(object):
             self._client = create_client(self.backend_url, self.backend_key)
         return self._client
 
+    @traced('login', 'auth')
     def login_by_mail(self) -> AuthResponse:
         """
         Log in to the backend using email and password.
@@ -197,6 +237,7 @@ class BackendSession(object):
         # return response
         return response
 
+    @traced('refresh', 'auth')
     def refresh(self) -> AuthResponse:
         """
         Refresh the authentication token for the backend session.
@@ -213,20 +254,61 @@ class BackendSession(object):
 
         :return: An `AuthResponse` object containing the new authentication token and user information.
         """
-        # refresh
-        response = self.client.auth.refresh_session(self._session.refresh_token)
+        # refresh, concurrent uploads may refresh at the same time
+        with self._lock:
+            response = self.client.auth.refresh_session(self._session.refresh_token)
 
-        # renew tokens
-        self._session = response.session
+            # renew tokens
+            self._session = response.session
 
         # return response
         return response
     
+    def ensure_session(self) -> Session:
+        """
+        Get a valid authenticated session, logging in or refreshing only if needed.
+
+        The session is kept alive for the lifetime of the `BackendSession`. If there is 
+        no session yet, this method logs in using `login_by_mail`. If the access token 
+        expires within `refresh_margin` seconds, it is refreshed using `refresh`. 
+        Otherwise, the existing session is returned without contacting the backend.
+
+        Example:
+            .. code-block:: python
+
+                session = BackendSession('user@example.com', 'password', url, key)
+                session.ensure_session()   # signs in
+                session.ensure_session()   # no round trip
+
+        :return: The authenticated `Session`.
+        """
+        with self._lock:
+            # login the session if it is not logged in
+            if getattr(self, '_session', None) is None:
+                self.login_by_mail()
+
+            # refresh the token if it is about to expire
+            elif self.expires_in is not None and self.expires_in <= self.refresh_margin:
+                self.refresh()
+
+            return self._session
+
+    @property
+    def expires_in(self) -> Optional[float]:
+        """
+        Seconds until the access token of the current session expires.
+
+        :return: The remaining lifetime of the token, or None if unknown.
+        """
+        return _expires_in(getattr(self, '_session', None))
+
+    @traced('logout', 'auth')
     def logout(self):
         """
         Log out of the backend session.
 
         This method logs out of the backend session using the `auth.sign_out` method of the `supabase.Client` instance.
+        The client is reset to the anonymous key afterwards, and the next context will log in again.
 
         Example:
             .. code-block:: python
@@ -236,16 +318,27 @@ class BackendSession(object):
                 session.logout()
 
         """
-        if hasattr(self, '_client') and self._client is not None:
+        if getattr(self, '_session', None) is None:
+            return
+
+        if getattr(self, '_client', None) is not None:
             self.client.auth.sign_out()
 
+            # requests of the client are anonymous again, also those of storage contexts
+            self.client.postgrest.auth(self.backend_key)
+            self.client.storage._client.headers['Authorization'] = f"Bearer {self.backend_key}"
+
+        # forget the session
+        self._session = None
+        self._user = None
+
     def database(self) -> ContextWrapper[DatabaseContext]:
         """
         Get a context manager for the database context.
 
         This method returns a context manager (`ContextWrapper`) for the database context (`DatabaseContext`). 
-        The context manager handles the lifetime of the database context, including logging in and out of 
-        the backend session.
+        The context manager handles the lifetime of the database context, borrowing the 
+        authenticated backend session.
 
         Example:
             .. code-block:: python
@@ -263,8 +356,8 @@ class BackendSession(object):
         Get a context manager for the storage context.
 
         This method returns a context manager (`ContextWrapper`) for the storage context (`StorageContext`). 
-        The context manager handles the lifetime of the storage context, including logging in and out 
-        of the backend session.
+        The context manager handles the lifetime of the storage context, borrowing the 
+        authenticated backend session.
 
         Example:
             .. code-block:: python
@@ -315,3 +408,334 @@ class BackendSession(object):
         """
         # init a store
         return TensorStore(self)
+
+
+@dataclass
+class AsyncContextWrapper(Generic[A]):
+    """
+    An async context manager for managing the lifetime of asyncio-native backend contexts.
+
+    The `AsyncContextWrapper` borrows the long-lived session of an `AsyncBackendSession`
+    in the same way as the `ContextWrapper` does for the `BackendSession`.
+
+    Example:
+        .. code-block:: python
+
+            session = AsyncBackendSession()
+            async with AsyncContextWrapper(session, AsyncDatabaseContext) as db:
+                await db.insert_dataset(key='test', shape=[1, 2, 3], dim=3)
+
+    """
+    _session: 'AsyncBackendSession'
+    Context: Type[A]
+
+    async def __aenter__(self) -> A:
+        """
+        Enter the context manager and return the backend context instance.
+
+        :return: The backend context instance.
+        """
+        # borrow the authenticated session, this does only hit the backend if needed
+        await self._session.ensure_session()
+
+        # instatiate the context with an authenticated Session
+        return self.Context(self._session)
+
+    async def __aexit__(self, *args):
+        """
+        Exit the context manager. The session is only borrowed and not logged out.
+
+        :param args: The exception type, value, and traceback (if any).
+        """
+        # the session is only borrowed, so there is nothing to clean up
+        pass
+
+
+@dataclass
+class AsyncBackendSession(object):
+    """
+    A class for managing the backend session on top of the async Supabase client.
+
+    The `AsyncBackendSession` mirrors the `BackendSession`, but all methods talking to the 
+    backend are coroutines. Contexts can be used concurrently on one event loop, as they 
+    all borrow the same long-lived session.
+
+    Example:
+        .. code-block:: python
+
+            session = AsyncBackendSession('user@example.com', 'password', url, key)
+            async with session.database() as db:
+                keys = await db.list_dataset_keys()
+
+    :ivar client: The async backend client instance.
+    :ivar refresh_margin: Seconds before the token expires, at which it is refreshed.
+    """
+    email: str
+    password: str
+    backend_url: str 
+    backend_key: str = field(repr=False)
+    refresh_margin: int = field(default=60, repr=False)
+    _client: AsyncClient = field(init=False, repr=False, default=None)
+    _user: User = field(init=False, repr=False, default=None)
+    _session: Session = field(init=False, repr=False, default=None)
+    _lock: asyncio.Lock = field(init=False, repr=False, default=None)
+
+    @property
+    def client(self) -> AsyncClient:
+        """
+        Get the async backend client instance. The client is created by `connect`.
+
+        :return: The async backend client instance.
+        """
+        if self._client is None:
+            raise RuntimeError('The AsyncBackendSession is not connected. Await connect() or ensure_session() first.')
+        return self._client
+
+    async def connect(self) -> AsyncClient:
+        """
+        Create the async backend client instance, if it does not exist yet.
+
+        :return: The async backend client instance.
+        """
+        if self._client is None:
+            self._client = await acreate_client(self.backend_url, self.backend_key)
+        return self._client
+
+    async def login_by_mail(self) -> AuthResponse:
+        """
+        Log in to the backend using email and password.
+
+        :return: An `AuthResponse` object containing the authentication token and user information.
+        """
+        client = await self.connect()
+
+        # login
+        response = await client.auth.sign_in_with_password({'email': self.email, 'password': self.password})
+
+        # store user and session info
+        self._user = response.user
+        self._session = response.session
+
+        # return response
+        return response
+
+    async def register_by_mail(self, email: str, password: str) -> AuthResponse:
+        """
+        Register a new user account using email and password.
+
+        :param email: The email address of the user.
+        :param password: The password of the user.
+        :return: An `AuthResponse` object containing the authentication token and user information.
+        """
+        client = await self.connect()
+
+        # register
+        response = await client.auth.sign_up({'email': email, 'password': password})
+
+        # store user and session info
+        self._user = response.user
+        self._session = response.session
+
+        # return response
+        return response
+
+    async def refresh(self) -> AuthResponse:
+        """
+        Refresh the authentication token for the backend session.
+        Concurrent callers wait for each other, as each refresh token can only be used once.
+
+        :return: An `AuthResponse` object containing the new authentication token and user information.
+        """
+        async with self._get_lock():
+            return await self._refresh()
+
+    async def _refresh(self) -> AuthResponse:
+        """
+        Refresh the authentication token, the caller needs to hold the lock.
+        """
+        # refresh
+        response = await self.client.auth.refresh_session(self._session.refresh_token)
+
+        # renew tokens
+        self._session = response.session
+
+        # return response
+        return response
+
+    def _get_lock(self) -> asyncio.Lock:
+        """
+        Get the lock guarding login and refresh.
+        """
+        # the lock is created lazily to bind it to the running loop
+        if self._lock is None:
+            self._lock = asyncio.Lock()
+        return self._lock
+
+    async def ensure_session(self) -> Session:
+        """
+        Get a valid authenticated session, logging in or refreshing only if needed.
+        Concurrent callers on the same event loop wait for a single login or refresh.
+
+        :return: The authenticated `Session`.
+        """
+        async with self._get_lock():
+            # login the session if it is not logged in
+            if self._session is None:
+                await self.login_by_mail()
+
+            # refresh the token if it is about to expire
+            elif self.expires_in is not None and self.expires_in <= self.refresh_margin:
+                await self._refresh()
+
+            return self._session
+
+    @property
+    def expires_in(self) -> Optional[float]:
+        """
+        Seconds until the access token of the current session expires.
+
+        :return: The remaining lifetime of the token, or None if unknown.
+        """
+        return _expires_in(self._session)
+
+    async def logout(self):
+        """
+        Log out of the backend session and reset the client to the anonymous key.
+        """
+        if self._session is None:
+            return
+
+        if self._client is not None:
+            await self.client.auth.sign_out()
+
+            # requests of the client are anonymous again, also those of storage contexts
+            self.client.postgrest.auth(self.backend_key)
+            self.client.storage._client.headers['Authorization'] = f"Bearer {self.backend_key}"
+
+        # forget the session
+        self._session = None
+        self._user = None
+
+    def database(self) -> AsyncContextWrapper[AsyncDatabaseContext]:
+        """
+        Get an async context manager for the database context.
+
+        Example:
+            .. code-block:: python
+
+                async with session.database() as db:
+                    await db.insert_dataset(key='test', shape=[1, 2, 3], dim=3)
+
+        :return: An async context manager for the database context.
+        """
+        return AsyncContextWrapper(self, AsyncDatabaseContext)
+
+    def storage(self) -> AsyncContextWrapper[AsyncStorageContext]:
+        """
+        Get an async context manager for the storage context.
+
+        :return: An async context manager for the storage context.
+        """
+        return AsyncContextWrapper(self, AsyncStorageContext)
+
+    def __call__(self) -> AsyncTensorStore:
+        """
+        Get the async tensor store instance for the backend session.
+
+        :return: The async tensor store instance for the backend session.
+        """
+        return AsyncTensorStore(self)
+
+
+@dataclass
+class LocalSession(object):
+    """
+    A class for managing a local SQLite database as backend.
+
+    The `LocalSession` provides the same context managers as the `BackendSession`, 
+    but all of them return a `LocalContext` working on the local database. There is 
+    no authentication, thus it works offline and without any latency.
+
+    Example:
+        .. code-block:: python
+
+            session = LocalSession('tensors.db')
+            store = session()
+            store['test'] = np.array([[1, 2], [3, 4]])
+
+    :ivar path: The path of the SQLite database file. Use ':memory:' for a temporary database.
+    """
+    path: str = ':memory:'
+    _connection: Optional[sqlite3.Connection] = field(default=None, init=False, repr=False)
+    _lock: threading.RLock = field(init=False, repr=False, default_factory=threading.RLock)
+
+    @property
+    def connection(self) -> sqlite3.Connection:
+        """
+        Get the connection to the local database, which is opened on first use.
+
+        :return: The SQLite connection, shared by all contexts of this session.
+        """
+        with self._lock:
+            if self._connection is None:
+                self._connection = sqlite3.connect(self.path, check_same_thread=False)
+            return self._connection
+
+    @contextmanager
+    def transaction(self) -> Iterator[sqlite3.Connection]:
+        """
+        Run statements in a transaction. The connection is shared, thus concurrent 
+        contexts are serialized by a lock.
+
+        :return: A context manager yielding the SQLite connection.
+        """
+        with self._lock:
+            with self.connection as con:
+                yield con
+
+    def ensure_session(self):
+        """
+        There is no authentication for local databases, thus this does nothing.
+        """
+        return None
+
+    def logout(self):
+        """
+        Close the connection to the local database.
+        """
+        with self._lock:
+            if self._connection is not None:
+                self._connection.close()
+                self._connection = None
+
+    def local(self) -> ContextWrapper[LocalContext]:
+        """
+        Get a context manager for the local context.
+
+        :return: A context manager for the local context.
+        """
+        return ContextWrapper(self, LocalContext)
+
+    def database(self) -> ContextWrapper[LocalContext]:
+        """
+        The local database replaces the remote database, thus this is the same as `local`.
+
+        :return: A context manager for the local context.
+        """
+        return self.local()
+
+    def storage(self) -> ContextWrapper[LocalContext]:
+        """
+        The local database replaces the remote storage, thus this is the same as `local`.
+
+        :return: A context manager for the local context.
+        """
+        return self.local()
+
+    def __call__(self) -> TensorStore:
+        """
+        Get a tensor store working on the local database.
+
+        :return: The tensor store instance for the local session.
+        """
+        return TensorStore(self, engine='local')
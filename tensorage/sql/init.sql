@@ -6,6 +6,8 @@ public.datasets (
     key character varying not null,
     ndim smallint not null,
     shape int[] not null,
+    chunk_shape int[] null,
+    compressor character varying null,
     created_at timestamp with time zone null default now(),
     user_id uuid null,
     is_shared boolean not null default false,
@@ -52,6 +54,32 @@ AS PERMISSIVE FOR SELECT
 TO authenticated
 USING (is_shared)
 
+-- tiles_float4 table, holds the N-d tiles of datasets stored in the tiled layout as little-endian float32 buffers,
+-- compressed by the codec recorded in datasets.compressor
+create table
+public.tiles_float4 (
+    data_id bigint not null,
+    coords int[] not null,
+    tensor bytea not null,
+    user_id uuid not null,
+    is_shared boolean not null default false,
+    constraint tiles_float4_pkey primary key (data_id, coords, user_id),
+    constraint tiles_float4_data_id_fkey foreign key (data_id) references datasets (id) on delete cascade,
+    constraint tiles_float4_user_id_fkey foreign key (user_id) references users (id) on delete set null
+) tablespace pg_default;
+
+-- RLS policy
+ALTER TABLE public.tiles_float4 ENABLE ROW LEVEL SECURITY;
+CREATE POLICY "Allow all actions to the record owner" ON "public"."tiles_float4"
+AS PERMISSIVE FOR ALL
+TO authenticated
+USING (is_shared OR (auth.uid() = user_id))
+WITH CHECK (is_shared OR (auth.uid() = user_id));
+CREATE POLICY "Allow authenticated access to shared datasets" ON "public"."tiles_float4"
+AS PERMISSIVE FOR SELECT
+TO authenticated
+USING (is_shared)
+
 -- create the slicing database function
 CREATE OR REPLACE FUNCTION public.tensor_float4_slice(name character varying, index_low integer, index_up integer, slice_low integer[], slice_up integer[])
 RETURNS table(tensor float4[])
@@ -75,6 +103,272 @@ BEGIN
 END;
 $$ language plpgsql;
 
+-- create the binary slicing function, the slice is returned as base64 encoded big-endian float32 buffer along with its shape
+CREATE OR REPLACE FUNCTION public.tensor_float4_slice_binary(name character varying, index_low integer, index_up integer, slice_low integer[], slice_up integer[])
+RETURNS table(tensor text, shape integer[])
+AS
+$$
+DECLARE
+  query_string text;
+  i int;
+BEGIN
+  query_string := 'SELECT tensors_float4.index, tensors_float4.tensor';
+  FOR i IN 1..array_length(slice_low, 1) LOOP
+    query_string := query_string || '['|| slice_low[i] || ' : ' || slice_up[i] || ']';
+  END LOOP;
+  query_string := query_string || ' AS sliced FROM tensors_float4
+                   JOIN datasets ON datasets.id = tensors_float4.data_id
+                   WHERE datasets.key = ' || quote_literal(name) || '
+                   AND tensors_float4.index >= ' || index_low || '
+                   AND tensors_float4.index < ' || index_up ;
+
+  -- pack all elements in row-major order and derive the shape from the first sliced row
+  RETURN QUERY EXECUTE 'WITH rows AS (' || query_string || ')
+    SELECT
+      encode((SELECT string_agg(float4send(elements.value), ''''::bytea ORDER BY rows.index, elements.i)
+              FROM rows, unnest(rows.sliced) WITH ORDINALITY AS elements(value, i)), ''base64''),
+      ARRAY[(SELECT count(*)::integer FROM rows)] || (SELECT array_agg(array_length(head.sliced, d) ORDER BY d)
+              FROM (SELECT rows.sliced FROM rows LIMIT 1) AS head, generate_series(1, array_ndims(head.sliced)) AS d)';
+END;
+$$ language plpgsql;
+
+-- point reads of the rows at the given indices in a single query, the rows are returned in ascending order of their index,
+-- packed like tensor_float4_slice_binary
+CREATE OR REPLACE FUNCTION public.tensor_float4_take(name character varying, indices integer[], slice_low integer[], slice_up integer[])
+RETURNS table(tensor text, shape integer[])
+AS
+$$
+DECLARE
+  query_string text;
+  i int;
+BEGIN
+  query_string := 'SELECT tensors_float4.index, tensors_float4.tensor';
+  FOR i IN 1..array_length(slice_low, 1) LOOP
+    query_string := query_string || '['|| slice_low[i] || ' : ' || slice_up[i] || ']';
+  END LOOP;
+  query_string := query_string || ' AS sliced FROM tensors_float4
+                   JOIN datasets ON datasets.id = tensors_float4.data_id
+                   WHERE datasets.key = ' || quote_literal(name) || '
+                   AND tensors_float4.index = ANY(' || quote_literal(indices::text) || '::integer[])';
+
+  RETURN QUERY EXECUTE 'WITH rows AS (' || query_string || ')
+    SELECT
+      encode((SELECT string_agg(float4send(elements.value), ''''::bytea ORDER BY rows.index, elements.i)
+              FROM rows, unnest(rows.sliced) WITH ORDINALITY AS elements(value, i)), ''base64''),
+      ARRAY[(SELECT count(*)::integer FROM rows)] || (SELECT array_agg(array_length(head.sliced, d) ORDER BY d)
+              FROM (SELECT rows.sliced FROM rows LIMIT 1) AS head, generate_series(1, array_ndims(head.sliced)) AS d)';
+END;
+$$ language plpgsql;
+
+-- strided binary slicing, every steps[1]-th row and every steps[i]-th element along the inner axes, counted from the lower bounds.
+-- the slice is returned like tensor_float4_slice_binary
+CREATE OR REPLACE FUNCTION public.tensor_float4_slice_strided(name character varying, index_low integer, index_up integer, slice_low integer[], slice_up integer[], steps integer[])
+RETURNS table(tensor text, shape integer[])
+AS
+$$
+DECLARE
+  rows_query text;
+  dims integer[];
+  filter text := 'true';
+  shape integer[];
+  stride bigint;
+  i int;
+  j int;
+BEGIN
+  -- slice the rows like tensor_float4_slice_binary, only every steps[1]-th row is selected
+  rows_query := 'SELECT tensors_float4.index, tensors_float4.tensor';
+  FOR i IN 1..array_length(slice_low, 1) LOOP
+    rows_query := rows_query || '['|| slice_low[i] || ' : ' || slice_up[i] || ']';
+  END LOOP;
+  rows_query := rows_query || ' AS sliced FROM tensors_float4
+                 JOIN datasets ON datasets.id = tensors_float4.data_id
+                 WHERE datasets.key = ' || quote_literal(name) || '
+                 AND tensors_float4.index >= ' || index_low || '
+                 AND tensors_float4.index < ' || index_up || '
+                 AND (tensors_float4.index - ' || index_low || ') % ' || steps[1] || ' = 0';
+
+  -- the shape of the unstrided slice, derived from the first sliced row
+  EXECUTE 'WITH rows AS (' || rows_query || ')
+    SELECT ARRAY[(SELECT count(*)::integer FROM rows)] || (SELECT array_agg(array_length(head.sliced, d) ORDER BY d)
+      FROM (SELECT rows.sliced FROM rows LIMIT 1) AS head, generate_series(1, array_ndims(head.sliced)) AS d)'
+  INTO dims;
+
+  -- nothing selected
+  IF dims[1] = 0 OR array_length(dims, 1) IS NULL THEN
+    RETURN QUERY SELECT NULL::text, dims;
+    RETURN;
+  END IF;
+
+  -- keep the elements on the steps of the inner axes
+  shape := ARRAY[dims[1]];
+  FOR i IN 2..array_length(dims, 1) LOOP
+    stride := 1;
+    FOR j IN i + 1..array_length(dims, 1) LOOP
+      stride := stride * dims[j];
+    END LOOP;
+    filter := filter || ' AND ((e.i - 1) / ' || stride || ') % ' || dims[i] || ' % ' || steps[i] || ' = 0';
+    shape := shape || ((dims[i] + steps[i] - 1) / steps[i]);
+  END LOOP;
+
+  -- pack the remaining elements in row-major order
+  RETURN QUERY EXECUTE 'WITH rows AS (' || rows_query || ')
+    SELECT encode(string_agg(float4send(e.value), ''''::bytea ORDER BY rows.index, e.i), ''base64''), ' || quote_literal(shape::text) || '::integer[]
+    FROM rows, unnest(rows.sliced) WITH ORDINALITY AS e(value, i) WHERE ' || filter;
+END;
+$$ language plpgsql;
+
+-- reduce a slice along the given axes (0-based, the first axis are the rows) with sum, mean, min, max, std or var,
+-- the reduced tensor is returned as base64 encoded big-endian float32 buffer along with its shape
+CREATE OR REPLACE FUNCTION public.tensor_float4_reduce(name character varying, op character varying, axis integer[], index_low integer, index_up integer, slice_low integer[], slice_up integer[])
+RETURNS table(tensor text, shape integer[])
+AS
+$$
+DECLARE
+  rows_query text;
+  agg text;
+  dims integer[];
+  kept text[] := '{}';
+  kept_dims integer[] := '{}';
+  stride bigint;
+  i int;
+  j int;
+BEGIN
+  -- only known aggregates are put into the query
+  agg := CASE op WHEN 'sum' THEN 'sum' WHEN 'mean' THEN 'avg' WHEN 'min' THEN 'min' WHEN 'max' THEN 'max' WHEN 'std' THEN 'stddev_pop' WHEN 'var' THEN 'var_pop' END;
+  IF agg IS NULL THEN
+    RAISE EXCEPTION 'Unknown reduction: %', op;
+  END IF;
+
+  -- slice the rows like tensor_float4_slice_binary
+  rows_query := 'SELECT tensors_float4.index, tensors_float4.tensor';
+  FOR i IN 1..array_length(slice_low, 1) LOOP
+    rows_query := rows_query || '['|| slice_low[i] || ' : ' || slice_up[i] || ']';
+  END LOOP;
+  rows_query := rows_query || ' AS sliced FROM tensors_float4
+                 JOIN datasets ON datasets.id = tensors_float4.data_id
+                 WHERE datasets.key = ' || quote_literal(name) || '
+                 AND tensors_float4.index >= ' || index_low || '
+                 AND tensors_float4.index < ' || index_up;
+
+  -- the shape of the slice, derived from the first sliced row
+  EXECUTE 'WITH rows AS (' || rows_query || ')
+    SELECT ARRAY[(SELECT count(*)::integer FROM rows)] || (SELECT array_agg(array_length(head.sliced, d) ORDER BY d)
+      FROM (SELECT rows.sliced FROM rows LIMIT 1) AS head, generate_series(1, array_ndims(head.sliced)) AS d)'
+  INTO dims;
+
+  -- nothing to reduce
+  IF dims[1] = 0 OR array_length(dims, 1) IS NULL OR array_length(dims, 1) < 2 THEN
+    RETURN QUERY SELECT NULL::text, dims;
+    RETURN;
+  END IF;
+
+  -- the coordinate of each element along the kept axes, the first axis is the position of the row
+  FOR i IN 0..array_length(dims, 1) - 1 LOOP
+    CONTINUE WHEN i = ANY(axis);
+    IF i = 0 THEN
+      kept := kept || 'elements.r'::text;
+    ELSE
+      stride := 1;
+      FOR j IN i + 2..array_length(dims, 1) LOOP
+        stride := stride * dims[j];
+      END LOOP;
+      kept := kept || ('((elements.i - 1) / ' || stride || ') % ' || dims[i + 1]);
+    END IF;
+    kept_dims := kept_dims || dims[i + 1];
+  END LOOP;
+
+  rows_query := 'WITH rows AS (' || rows_query || '),
+    numbered AS (SELECT row_number() OVER (ORDER BY rows.index) - 1 AS r, rows.sliced FROM rows),
+    elements AS (SELECT numbered.r, e.value, e.i FROM numbered, unnest(numbered.sliced) WITH ORDINALITY AS e(value, i)) ';
+
+  -- all axes are reduced to a single value
+  IF array_length(kept, 1) IS NULL THEN
+    RETURN QUERY EXECUTE rows_query || 'SELECT encode(float4send(' || agg || '(elements.value::float8)::float4), ''base64''), ''{}''::integer[] FROM elements';
+    RETURN;
+  END IF;
+
+  -- group by the kept axes and pack the reduced values in row-major order
+  RETURN QUERY EXECUTE rows_query || 'SELECT encode(string_agg(float4send(reduced.value), ''''::bytea ORDER BY ' ||
+    (SELECT string_agg('reduced.k' || k, ', ' ORDER BY k) FROM generate_subscripts(kept, 1) AS k) || '), ''base64''), ' ||
+    quote_literal(kept_dims::text) || '::integer[]
+    FROM (SELECT ' || (SELECT string_agg(kept[k] || ' AS k' || k, ', ' ORDER BY k) FROM generate_subscripts(kept, 1) AS k) ||
+    ', ' || agg || '(elements.value::float8)::float4 AS value FROM elements GROUP BY ' ||
+    (SELECT string_agg(k::text, ', ' ORDER BY k) FROM generate_subscripts(kept, 1) AS k) || ') AS reduced';
+END;
+$$ language plpgsql;
+
+-- decode a packed little-endian float32 buffer into a float4 array of the given dimensions
+CREATE OR REPLACE FUNCTION public.float4_from_bytea(buf bytea, dims integer[])
+RETURNS float4[]
+AS
+$$
+DECLARE
+  query_string text;
+  result float4[];
+  i int;
+BEGIN
+  -- unpack the IEEE 754 words into (element, position) rows
+  query_string := 'SELECT CASE
+      WHEN e = 255 AND m = 0 THEN (CASE WHEN s = 1 THEN ''-Infinity'' ELSE ''Infinity'' END)::float4
+      WHEN e = 255 THEN ''NaN''::float4
+      WHEN e = 0 THEN ((1 - 2 * s) * m * 2.0::float8 ^ (-149))::float4
+      ELSE ((1 - 2 * s) * (1 + m / 8388608.0::float8) * 2.0::float8 ^ (e - 127))::float4
+    END AS a, g
+    FROM (
+      SELECT g,
+        get_byte($1, 4 * g + 3) >> 7 AS s,
+        ((get_byte($1, 4 * g + 3) & 127) << 1) | (get_byte($1, 4 * g + 2) >> 7) AS e,
+        ((get_byte($1, 4 * g + 2) & 127) << 16) | (get_byte($1, 4 * g + 1) << 8) | get_byte($1, 4 * g) AS m
+      FROM generate_series(0, length($1) / 4 - 1) AS g
+    ) AS words';
+
+  -- nest the elements along the inner dimensions, starting with the last one
+  FOR i IN REVERSE array_length(dims, 1)..2 LOOP
+    query_string := 'SELECT array_agg(a ORDER BY g) AS a, g / ' || dims[i] || ' AS g FROM (' || query_string || ') AS level' || i || ' GROUP BY g / ' || dims[i];
+  END LOOP;
+  query_string := 'SELECT array_agg(a ORDER BY g) FROM (' || query_string || ') AS level1';
+
+  EXECUTE query_string INTO result USING buf;
+  RETURN result;
+END;
+$$ language plpgsql immutable;
+
+-- create the binary insert function, each tensor is a base64 encoded little-endian float32 buffer
+CREATE OR REPLACE FUNCTION public.tensor_float4_insert(data_id bigint, index_offset integer, dims integer[], tensors text[])
+RETURNS void
+AS
+$$
+  INSERT INTO public.tensors_float4 (data_id, index, tensor, user_id)
+  SELECT tensor_float4_insert.data_id, tensor_float4_insert.index_offset + chunks.i, public.float4_from_bytea(decode(chunks.tensor, 'base64'), tensor_float4_insert.dims), auth.uid()
+  FROM unnest(tensor_float4_insert.tensors) WITH ORDINALITY AS chunks(tensor, i);
+$$ language sql;
+
+-- insert tiles, the coordinates of all tiles are passed as one flat array
+CREATE OR REPLACE FUNCTION public.tensor_float4_tiles_insert(data_id bigint, coords integer[], tensors text[])
+RETURNS void
+AS
+$$
+  INSERT INTO public.tiles_float4 (data_id, coords, tensor, user_id)
+  SELECT tensor_float4_tiles_insert.data_id, tensor_float4_tiles_insert.coords[(tiles.i - 1) * n.ndim + 1 : tiles.i * n.ndim], decode(tiles.tensor, 'base64'), auth.uid()
+  FROM unnest(tensor_float4_tiles_insert.tensors) WITH ORDINALITY AS tiles(tensor, i),
+       (SELECT array_length(tensor_float4_tiles_insert.coords, 1) / array_length(tensor_float4_tiles_insert.tensors, 1) AS ndim) AS n;
+$$ language sql;
+
+-- get all tiles within the range of tile coordinates, both bounds are inclusive
+CREATE OR REPLACE FUNCTION public.tensor_float4_tiles(data_id bigint, coords_low integer[], coords_up integer[])
+RETURNS table(coords integer[], tensor text)
+AS
+$$
+  SELECT tiles_float4.coords, encode(tiles_float4.tensor, 'base64')
+  FROM tiles_float4
+  WHERE tiles_float4.data_id = tensor_float4_tiles.data_id
+    AND tiles_float4.coords BETWEEN tensor_float4_tiles.coords_low AND tensor_float4_tiles.coords_up
+    AND NOT EXISTS (
+      SELECT 1 FROM generate_subscripts(tensor_float4_tiles.coords_low, 1) AS d
+      WHERE tiles_float4.coords[d] NOT BETWEEN tensor_float4_tiles.coords_low[d] AND tensor_float4_tiles.coords_up[d]
+    );
+$$ language sql stable;
+
 -- add usage statistics views
 create view
   public.user_usage_details as
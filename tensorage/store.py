@@ -20,18 +20,101 @@ Example:
         subset = store['my_dataset', :, 4, 4].flatten()
 """
 
-from typing import TYPE_CHECKING, Tuple, Union, List, Optional, Any
+from typing import TYPE_CHECKING, Dict, Iterable, Iterator, Tuple, Union, List, Optional, Any
 from typing_extensions import Literal
 from dataclasses import dataclass, field
+from concurrent.futures import ThreadPoolExecutor, Future, wait, FIRST_COMPLETED
+from collections import deque
+import itertools
 import warnings
+import time
 
 from tqdm import tqdm
 import numpy as np
 
 from tensorage.types import Dataset
+from tensorage.cache import ChunkCache, MetadataCache
+from tensorage.tiles import split_tiles, batch_tiles, row_chunk_shape
+from tensorage.codecs import Codec
+from tensorage.metrics import Metrics, metered
+from tensorage.tracing import enable as enable_tracing, traced
+from tensorage.retry import RetryPolicy, may_have_committed
+from tensorage.tuning import BatchTuner
+from tensorage.reduce import check_op, normalize_axis, reduce_array
+from tensorage.indexing import Selection, resolve_selection, apply_steps, contiguous_runs, write_into
 
 if TYPE_CHECKING:  # pragma: no cover
-    from tensorage.session import BackendSession
+    from tensorage.session import BackendSession, LocalSession
+    from tensorage.backend.base import BaseContext
+    from tensorage.mirror import MirrorSlicer
+    from types import EllipsisType
+
+
+# the default number of datasets read concurrently by get_many, each borrowing its own backend context
+GET_MANY_WORKERS = 8
+
+
+def split_batches(value: np.ndarray, chunk_size: int) -> Tuple[List[Tuple[int, np.ndarray]], int]:
+    """
+    Splits a tensor along the first axis into batches of about chunk_size elements for upload.
+    Each batch holds at least one row, even if the row has more than chunk_size elements.
+
+    Args:
+        value (np.ndarray): The tensor to split, at least 2D.
+        chunk_size (int): The number of elements above which the tensor is uploaded chunk-wise.
+
+    Returns:
+        Tuple[List[Tuple[int, np.ndarray]], int]: The batches along with their offset on the first axis, and the batch size.
+    """
+    # check if this should be uplaoded chunk-wise
+    if value.size > chunk_size:
+        # figure out a good batch size, for any number of dimensions
+        batch_size = max(1, chunk_size // max(1, int(np.prod(value.shape[1:]))))
+        
+        # create the index over the batch to determine the offset on upload
+        single_index = np.arange(0, value.shape[0], batch_size, dtype=int)
+        batch_index = list(zip(single_index, single_index[1:].tolist() + [value.shape[0]]))
+        
+        # build the 
+        batches = [(i * batch_size, value[up:low]) for i, (up, low) in enumerate(batch_index)]
+    else:
+        batches = [(0, value)]
+        batch_size = 1
+    
+    return batches, batch_size
+
+
+def _payload_bytes(offset: Optional[int], batch: Union[np.ndarray, list]) -> int:
+    # batches of rows have an offset, batches of tiles are lists of coordinates and tiles
+    return (batch.size if offset is not None else sum(tile.size for _, tile in batch)) * 4
+
+
+def rebatch(batches: Iterable[np.ndarray], rows: int) -> Iterator[np.ndarray]:
+    """
+    Regroups a stream of batches into batches of exactly rows elements along the first axis.
+    Only the last batch may be smaller. At most one output batch is buffered.
+
+    Args:
+        batches (Iterable[np.ndarray]): The batches of any size along the first axis.
+        rows (int): The number of elements along the first axis per output batch.
+
+    Yields:
+        np.ndarray: The next batch.
+    """
+    buffer, size = [], 0
+    for batch in batches:
+        while len(batch) > 0:
+            take = min(rows - size, len(batch))
+            buffer.append(batch[:take])
+            batch = batch[take:]
+            size += take
+
+            if size == rows:
+                yield buffer[0] if len(buffer) == 1 else np.concatenate(buffer)
+                buffer, size = [], 0
+
+    if size > 0:
+        yield buffer[0] if len(buffer) == 1 else np.concatenate(buffer)
 
 
 @dataclass
@@ -47,24 +130,92 @@ class TensorStore(object):
         quiet (bool): Whether to suppress output messages or not.
         engine (str): The engine to use for storing and retrieving tensor data.
         chunk_size (int): The chunk size to use for uploading tensor data.
+        chunk_shape (Optional[Tuple[int]]): If set, new datasets are stored in the tiled layout with tiles of this shape.
+        compressor (Optional[str]): The codec spec, like 'shuffle+zlib', to compress new datasets with.
+            Compressed datasets are stored in the tiled layout, by default with tiles of full rows.
+        max_workers (int): The number of batches uploaded concurrently. Defaults to 1 (sequential upload).
+        max_inflight_bytes (int): The maximum payload in bytes of all batches uploading at the same time.
+        request_bytes (Union[None, int, Literal['auto']]): If set, uploads target this payload in bytes per request
+            instead of chunk_size elements. 'auto' learns the payload from the observed throughput.
+        split_rows (bool): If True, new datasets with rows larger than a request are stored in the tiled layout,
+            with the rows split along their inner axes. By default, they are kept in rows, uploaded one row per request.
+        retry (Optional[RetryPolicy]): The retry policy of uploads. Expired tokens are refreshed, transient
+            errors retried and batches too large split in half. None raises the first error.
+        read_bytes (Optional[int]): The largest payload in bytes of a read request. Larger reads of datasets stored
+            in rows are split along the first axis into parts, loaded concurrently into one array. None reads in one request.
+        read_workers (int): The number of parts of a read loaded concurrently.
+        cache_size (int): The byte budget of the client-side row cache. Defaults to 0 (no cache).
+        metadata_ttl (float): The number of seconds dataset metadata and keys are cached. 0 disables the cache.
+        metrics (Union[bool, Metrics, None]): If True or a `Metrics` registry, every backend operation is recorded.
+            Defaults to None (no metrics).
+        trace (bool): If True, the operations of the store are traced. See `tensorage.tracing`.
 
     Raises:
         ValueError: If the backend session is not provided.
 
     """
-    backend: 'BackendSession' = field(repr=False)
+    backend: Union['BackendSession', 'LocalSession'] = field(repr=False)
     quiet: bool = field(default=False)
 
-    engine: Union[Literal['database'], Literal['storage']] = field(default='database')
+    engine: Union[Literal['database'], Literal['storage'], Literal['local']] = field(default='database')
 
     # some stuff for upload
     chunk_size: int = field(default=100000, repr=False)
+    chunk_shape: Optional[Tuple[int]] = field(default=None, repr=False)
+    compressor: Optional[str] = field(default=None, repr=False)
+    max_workers: int = field(default=1, repr=False)
+    max_inflight_bytes: int = field(default=64 * 2**20, repr=False)
+    request_bytes: Union[None, int, Literal['auto']] = field(default=None, repr=False)
+    split_rows: bool = field(default=False, repr=False)
+    retry: Optional[RetryPolicy] = field(default_factory=RetryPolicy, repr=False)
     allow_overwrite: bool = False
 
+    # reads larger than read_bytes are split into concurrent requests
+    read_bytes: Optional[int] = field(default=64 * 2**20, repr=False)
+    read_workers: int = field(default=4, repr=False)
+
+    # opt-in client-side cache for reads
+    cache_size: int = field(default=0, repr=False)
+    metadata_ttl: float = field(default=30.0, repr=False)
+
+    # opt-in per-operation metrics
+    metrics: Union[bool, Metrics, None] = field(default=None, repr=False)
+    trace: bool = field(default=False, repr=False)
+
     # add some internal metadata
     _keys: List[str] = field(default_factory=list, repr=False)
+    _cache: Optional[ChunkCache] = field(default=None, init=False, repr=False)
+    _metadata: Optional[MetadataCache] = field(default=None, init=False, repr=False)
+    _tuner: Optional[BatchTuner] = field(default=None, init=False, repr=False)
 
     def __post_init__(self):
+        # fail early on unknown codecs
+        if self.compressor is not None:
+            Codec.from_spec(self.compressor)
+
+        # create the row cache
+        if self.cache_size > 0:
+            self._cache = ChunkCache(self.cache_size)
+
+        # create the metadata cache
+        self._metadata = MetadataCache(self.metadata_ttl)
+
+        # the tuner is kept, so that later uploads start with the learned payload
+        if self.request_bytes == 'auto':
+            self._tuner = BatchTuner()
+        elif self.request_bytes is not None:
+            self._tuner = BatchTuner(target_bytes=int(self.request_bytes), adaptive=False, max_bytes=int(self.request_bytes))
+
+        # create the metrics registry
+        if self.metrics is True:
+            self.metrics = Metrics()
+        elif self.metrics is False:
+            self.metrics = None
+
+        # start tracing
+        if self.trace:
+            enable_tracing()
+
         # check if the schema is installed
         with self.backend.database() as db:
             if not db.check_schema_installed():
@@ -76,7 +227,156 @@ class TensorStore(object):
         self.keys()
 
     def get_context(self):
-        raise NotImplementedError
+        """
+        Get the context manager of the backend for the configured engine.
+        The 'local' engine needs a backend providing local contexts, like the `LocalSession`.
+        If metrics are enabled, the context records all its operations.
+        """
+        if self.engine == 'local':
+            wrapper = self.backend.local()
+        elif self.engine == 'storage':
+            wrapper = self.backend.storage()
+        else:
+            wrapper = self.backend.database()
+
+        if self.metrics is None:
+            return wrapper
+        return metered(wrapper, self.metrics)
+
+    def stats(self) -> Dict[str, Dict[str, float]]:
+        """
+        Get the cumulative counters of all backend operations, like the number of calls,
+        errors, retries, wall time, rows and bytes sent and received, along with the
+        counters of the row cache, if enabled.
+
+        Returns:
+            Dict[str, Dict[str, float]]: The counters of each operation. Empty if metrics are disabled.
+        """
+        stats = self.metrics.stats() if self.metrics is not None else dict()
+        if self._cache is not None:
+            stats['cache'] = self._cache.info()
+        return stats
+
+    @property
+    def cache(self) -> Optional[ChunkCache]:
+        """
+        The client-side row cache, if enabled by cache_size.
+
+        Returns:
+            Optional[ChunkCache]: The cache, or None if caching is disabled.
+        """
+        return self._cache
+
+    def _invalidate(self, key: str):
+        """
+        Removes the cached metadata and all cached rows of the dataset with the given key.
+
+        Args:
+            key (str): The unique identifier for the tensor.
+        """
+        self._metadata.invalidate(key)
+
+        if self._cache is not None:
+            self._cache.invalidate(key)
+
+    @traced('store.get_dataset')
+    def get_dataset(self, key: str) -> Dataset:
+        """
+        Retrieves the dataset metadata of the given key. The metadata is cached for metadata_ttl seconds.
+
+        Args:
+            key (str): The unique identifier for the tensor.
+
+        Returns:
+            Dataset: The dataset with the given key.
+        """
+        dataset = self._metadata.get_dataset(key)
+
+        if dataset is None:
+            with self.get_context() as db:
+                dataset = db.get_dataset(key)
+            self._metadata.put_dataset(dataset)
+
+        return dataset
+
+    def get_datasets(self, keys: List[str]) -> Dict[str, Dataset]:
+        """
+        Retrieves the dataset metadata of all given keys. Metadata missing in the cache is
+        loaded in a single query.
+
+        Args:
+            keys (List[str]): The unique identifiers of the tensors.
+
+        Returns:
+            Dict[str, Dataset]: The datasets by key.
+
+        Raises:
+            KeyError: If any of the datasets does not exist.
+        """
+        datasets = {key: self._metadata.get_dataset(key) for key in keys}
+
+        missing = [key for key, dataset in datasets.items() if dataset is None]
+        if len(missing) > 0:
+            with self.get_context() as db:
+                for dataset in db.get_datasets(missing):
+                    self._metadata.put_dataset(dataset)
+                    datasets[dataset.key] = dataset
+
+        unknown = [key for key, dataset in datasets.items() if dataset is None]
+        if len(unknown) > 0:
+            raise KeyError(f"Datasets not found: {', '.join(unknown)}")
+
+        return datasets
+
+    @traced('store.get_many')
+    def get_many(self, requests: Iterable[Union[str, Tuple[str, Tuple[Any, ...]]]], max_workers: Optional[int] = None) -> Dict[str, np.ndarray]:
+        """
+        Reads from several datasets at once, like a time window of all input variables of a model.
+        The metadata of all datasets is resolved in a single query and the reads run concurrently,
+        thus the latency follows the largest read instead of the sum of all reads.
+
+        Example:
+
+            .. code-block:: python
+                window = (slice(100, 124), )
+                inputs = store.get_many([('precip', window), ('temp', window), 'elevation'])
+
+        Args:
+            requests (Iterable[Union[str, Tuple[str, Tuple[Any, ...]]]]): The keys, or pairs of a key and
+                the index selecting from the dataset, like in StoreSlicer.__getitem__.
+            max_workers (Optional[int]): The number of concurrent reads. Defaults to one per dataset,
+                but at most GET_MANY_WORKERS (8), as each read borrows its own backend context.
+
+        Returns:
+            Dict[str, np.ndarray]: The tensor data by key.
+
+        Raises:
+            KeyError: If any of the datasets does not exist.
+            ValueError: If a key is requested more than once.
+        """
+        # normalize the requests into keys and index tuples
+        keys, indices = [], []
+        for request in requests:
+            key, index = (request, ()) if isinstance(request, str) else request
+            keys.append(key)
+            indices.append(index if isinstance(index, tuple) else (index, ))
+
+        if len(set(keys)) != len(keys):
+            raise ValueError('Each key can only be requested once.')
+        if len(keys) == 0:
+            return {}
+
+        datasets = self.get_datasets(keys)
+        slicers = [StoreSlicer(self, key, dataset=datasets[key]) for key in keys]
+
+        # read sequentially
+        workers = max_workers if max_workers is not None else min(len(keys), GET_MANY_WORKERS)
+        if workers <= 1:
+            return {slicer.key: slicer[index] for slicer, index in zip(slicers, indices)}
+
+        with ThreadPoolExecutor(max_workers=workers) as executor:
+            futures = [executor.submit(slicer.__getitem__, index) for slicer, index in zip(slicers, indices)]
+            return {slicer.key: future.result() for slicer, future in zip(slicers, futures)}
 
     def depr_get_select_indices(self, key: Union[str, Tuple[Union[str, slice, int]]]) -> Tuple[str, Tuple[int, int], List[Tuple[int, int]]]:
         """
@@ -162,26 +462,27 @@ class TensorStore(object):
         """
         return super().__dir__() + self._keys
 
-    def __setitem__(self, key: str, value: Union[List[list], np.ndarray]):
+    @traced('store.setitem')
+    def __setitem__(self, key: str, value: Union[List[list], np.ndarray, Any]):
         """
         Uploads a dataset into the backend with the given key and value.
+        Lazily sliceable sources, like h5py datasets or netCDF variables, are read
+        and uploaded batch by batch, without loading them into memory.
 
         Args:
             key (str): The unique identifier for the tensor.
-            value (Union[List[list], np.ndarray]): The tensor data to be set.
+            value (Union[List[list], np.ndarray, Any]): The tensor data to be set.
 
         Raises:
             ValueError: If the tensor with the given key does not exist in the database.
 
         """        
+        # stream lazily sliceable sources
+        if not isinstance(value, (list, np.ndarray)) and hasattr(value, 'shape') and hasattr(value, '__getitem__'):
+            return self._write_source(key, value)
+
         # check if the key is already in the database
-        if key in self.keys():
-            # check if we are allowed to overwrite
-            if not self.allow_overwrite:
-                raise ValueError(f"The key '{key}' already exists in the TensorStore. Set allow_overwrite=True to overwrite the existing dataset.")
-            
-            # otherwise delete the dataset
-            self.__delitem__(key)
+        self._check_overwrite(key)
 
         # first make a numpy array from it
         if isinstance(value, list):
@@ -197,36 +498,287 @@ class TensorStore(object):
         # get the dim
         dim = value.ndim
 
-        # check if this should be uplaoded chunk-wise
-        if value.size > self.chunk_size:
-            # figure out a good batch size
-            batch_size = self.chunk_size // np.multiply(*value.shape[1:])
-            
-            # create the index over the batch to determine the offset on upload
-            single_index = np.arange(0, value.shape[0], batch_size, dtype=int)
-            batch_index = list(zip(single_index, single_index[1:].tolist() + [value.shape[0]]))
-            
-            # build the 
-            batches = [(i * batch_size, value[up:low]) for i, (up, low) in enumerate(batch_index)]
+        # cached rows of an overwritten dataset are outdated
+        self._invalidate(key)
+
+        # the number of elements per request
+        size = self._request_size()
+
+        # upload in the tiled layout, compressed tiles cannot be sliced by the database
+        # and rows larger than a request are split into tiles along the inner axes, if enabled
+        if self._is_tiled(shape[1:], size):
+            chunk_shape = tuple(self.chunk_shape) if self.chunk_shape is not None else row_chunk_shape(shape, size)
+
+            with self.get_context() as db:
+                dataset = self._insert_dataset(db, key, shape, dim, chunk_shape)
+                if self._tuner is not None:
+                    self._upload_batches(db, dataset.id, ((None, batch) for batch in self._tuner.tile_batches(split_tiles(value, chunk_shape))), desc=f'Uploading {key} [tiles]')
+                else:
+                    batches = batch_tiles(split_tiles(value, chunk_shape), self.chunk_size)
+                    self._upload_batches(db, dataset.id, [(None, batch) for batch in batches], desc=f'Uploading {key} [{len(batches)} batches of tiles]')
+        elif self._tuner is not None:
+            # the batch size follows the tuner during the upload
+            with self.get_context() as db:
+                dataset = self._insert_dataset(db, key, shape, dim, None)
+                self._upload_batches(db, dataset.id, self._tuner.batches(value), desc=f'Uploading {key}')
         else:
-            batches = [(0, value)]
-            batch_size = 1
+            # split into batches for upload
+            batches, batch_size = split_batches(value, self.chunk_size)
 
-        # connect
-        with self.backend.database() as db:
-            # insert the dataset
-            dataset = db.insert_dataset(key, shape, dim)
+            # connect
+            with self.get_context() as db:
+                # insert the dataset
+                dataset = self._insert_dataset(db, key, shape, dim, None)
 
-            # make the iterator
-            _iterator = tqdm(batches, desc=f'Uploading {key} [{len(batches)} batches of {batch_size}]') if not self.quiet else batches
+                # insert the tensor
+                self._upload_batches(db, dataset.id, batches, desc=f'Uploading {key} [{len(batches)} batches of {batch_size}]')
 
-            # insert the tensor
-            for offset, batch in _iterator:
-                db.insert_tensor(dataset.id, [tensor for tensor in batch], offset=offset)
+        # finally write the new dataset through to the metadata cache
+        self._register(key, dataset)
+
+    @traced('store.write_stream')
+    def write_stream(self, key: str, batches: Iterable[np.ndarray], inner_shape: Tuple[int]):
+        """
+        Uploads a dataset from a stream of batches along the first axis, like a generator.
+        Only a few batches are held in memory at a time and the shape of the dataset is
+        finalized, once the stream is exhausted. If the upload fails, the dataset is removed.
+
+        Args:
+            key (str): The unique identifier for the tensor.
+            batches (Iterable[np.ndarray]): The batches along the first axis.
+            inner_shape (Tuple[int]): The shape of all axes except the first one.
+
+        Raises:
+            ValueError: If the key already exists and allow_overwrite is False, or a batch does not match inner_shape.
+        """
+        inner_shape = tuple(int(size) for size in inner_shape)
+
+        # check if the key is already in the database
+        self._check_overwrite(key)
+        self._invalidate(key)
+
+        # tiles along the first axis are uploaded block by block
+        size = self._request_size()
+        tiled = self._is_tiled(inner_shape, size)
+        if tiled:
+            chunk_shape = tuple(self.chunk_shape) if self.chunk_shape is not None else row_chunk_shape((0, *inner_shape), size)
+            rows = chunk_shape[0]
+        else:
+            chunk_shape = None
+            rows = max(1, size // int(np.prod(inner_shape)))
+
+        def validated():
+            for batch in batches:
+                batch = np.asarray(batch)
+                if batch.shape[1:] != inner_shape:
+                    raise ValueError(f"The batch of shape {batch.shape} does not match the inner shape {inner_shape}.")
+                yield batch
+
+        # count the rows while the stream is consumed
+        length = 0
+
+        def jobs():
+            nonlocal length
+            for i, block in enumerate(rebatch(validated(), rows)):
+                length += len(block)
+                if tiled:
+                    tiles = [((coords[0] + i, *coords[1:]), tile) for coords, tile in split_tiles(block, chunk_shape)]
+                    for batch in (self._tuner.tile_batches(tiles) if self._tuner is not None else batch_tiles(tiles, self.chunk_size)):
+                        yield None, batch
+                elif self._tuner is not None:
+                    # the batch size follows the tuner during the upload
+                    for offset, batch in self._tuner.batches(block):
+                        yield i * rows + offset, batch
+                else:
+                    yield i * rows, block
+
+        with self.get_context() as db:
+            dataset = self._insert_dataset(db, key, (0, *inner_shape), len(inner_shape) + 1, chunk_shape)
+            try:
+                self._upload_batches(db, dataset.id, jobs(), desc=f'Streaming {key}')
+
+                # finalize the shape
+                dataset.shape = [length, *inner_shape]
+                db.set_dataset_shape(dataset.id, dataset.shape)
+            except BaseException:
+                db.remove_dataset(key)
+                raise
+
+        # write the new dataset through to the metadata cache
+        self._register(key, dataset)
+
+    def _write_source(self, key: str, source: Any):
+        """
+        Uploads a lazily sliceable source, like np.memmap, h5py datasets or netCDF variables, batch by batch.
+
+        Args:
+            key (str): The unique identifier for the tensor.
+            source (Any): The source, needs a shape and numpy-style slicing along the first axis.
+        """
+        shape = tuple(source.shape)
+
+        # a 1D source becomes a single row
+        if len(shape) == 1:
+            return self.write_stream(key, [np.asarray(source[:]).reshape(1, -1)], shape)
+
+        # read about a request of elements at once
+        rows = max(1, self._request_size() // int(np.prod(shape[1:])))
+        self.write_stream(key, (np.asarray(source[start:start + rows]) for start in range(0, shape[0], rows)), shape[1:])
+
+    def _request_size(self) -> int:
+        """
+        Get the number of elements per upload request, following the tuner if request_bytes is set.
+        """
+        return self.chunk_size if self._tuner is None else max(1, self._tuner.target_bytes // 4)
+
+    def _is_tiled(self, inner_shape: Tuple[int, ...], size: int) -> bool:
+        """
+        Check if a new dataset with the given inner shape is stored in the tiled layout.
+        """
+        if self.chunk_shape is not None or self.compressor is not None:
+            return True
+        return self.split_rows and int(np.prod(inner_shape)) > size
+
+    def _check_overwrite(self, key: str):
+        """
+        Removes an existing dataset with the given key, if overwriting is allowed.
+
+        Raises:
+            ValueError: If the key already exists and allow_overwrite is False.
+        """
+        if key in self.keys():
+            # check if we are allowed to overwrite
+            if not self.allow_overwrite:
+                raise ValueError(f"The key '{key}' already exists in the TensorStore. Set allow_overwrite=True to overwrite the existing dataset.")
             
-            # finally update the keys
-            self._keys = db.list_dataset_keys()
+            # otherwise delete the dataset
+            self.__delitem__(key)
+
+    def _insert_dataset(self, db: 'BaseContext', key: str, shape: Tuple[int], dim: int, chunk_shape: Optional[Tuple[int]]) -> Dataset:
+        """
+        Inserts the dataset metadata, along with the tiled layout and compressor if used.
+        """
+        if chunk_shape is None:
+            return db.insert_dataset(key, shape, dim)
+        if self.compressor is not None:
+            return db.insert_dataset(key, shape, dim, chunk_shape=chunk_shape, compressor=self.compressor)
+        return db.insert_dataset(key, shape, dim, chunk_shape=chunk_shape)
+
+    def _register(self, key: str, dataset: Dataset):
+        """
+        Writes a new dataset through to the metadata cache and the keys.
+        """
+        self._metadata.put_dataset(dataset)
+        self._metadata.add_key(key)
+        if key not in self._keys:
+            self._keys = self._keys + [key]
+
+    def _upload_batches(self, db: 'BaseContext', data_id: int, batches: Iterable[Tuple[Optional[int], Union[np.ndarray, list]]], desc: str):
+        """
+        Uploads the batches of a dataset using up to max_workers concurrent requests.
+        A new batch is only started if the payload of all running batches stays below
+        max_inflight_bytes. Failing batches are retried or split following the retry
+        policy. The first batch failing for good cancels all batches not yet started
+        and its exception is raised.
+
+        Args:
+            db (BaseContext): The backend context used for the upload.
+            data_id (int): The id of the dataset the batches belong to.
+            batches (Iterable[Tuple[Optional[int], Union[np.ndarray, list]]]): The offsets along the first axis and the batches to upload.
+                Batches of tiles have no offset and are lists of tile coordinates and tiles. A generator is consumed lazily.
+            desc (str): The description of the progress bar.
+
+        Raises:
+            Exception: The exception of the first batch that failed to upload.
+        """
+        # make the progress bar
+        progress = tqdm(total=len(batches) if isinstance(batches, list) else None, desc=desc, disable=self.quiet)
+
+        def insert(offset: Optional[int], batch: Union[np.ndarray, list], committed: bool = False):
+            def call():
+                if offset is None:
+                    return db.insert_tiles(data_id, batch, compressor=self.compressor)
+                return db.insert_tensor(data_id, [tensor for tensor in batch], offset=offset)
+
+            if self.retry is None and self._tuner is None:
+                return call()
+
+            # the tuner learns from the throughput of each request
+            start = time.perf_counter()
+            if self.retry is None:
+                call()
+                kind = None
+            else:
+                operation = 'insert_tiles' if offset is None else 'insert_tensor'
+                on_retry = (lambda: self.metrics.record_retry(operation)) if self.metrics is not None else None
+
+                # the halves of a split batch may only be committed, if an attempt of the batch may be
+                errors = []
+                kind = self.retry.run(call, refresh=getattr(self.backend, 'refresh', None), on_retry=on_retry, committed=committed, can_split=len(batch) > 1, on_error=errors.append)
+                committed = committed or any(may_have_committed(e) for e in errors)
+
+            if kind is None:
+                if self._tuner is not None:
+                    self._tuner.observe(_payload_bytes(offset, batch), time.perf_counter() - start)
+                return True
+
+            # the batch is too large, upload it in two halves
+            if self._tuner is not None:
+                self._tuner.reject(_payload_bytes(offset, batch))
+            half = len(batch) // 2
+            insert(offset, batch[:half], committed=committed)
+            insert(offset + half if offset is not None else None, batch[half:], committed=committed)
+            return True
+
+        # upload sequentially
+        if self.max_workers <= 1:
+            for offset, batch in batches:
+                insert(offset, batch)
+                progress.update()
+            progress.close()
+            return
+
+        # upload concurrently and keep track of the payload of running batches
+        running = dict()
+        with ThreadPoolExecutor(max_workers=self.max_workers) as executor:
+            try:
+                for offset, batch in batches:
+                    nbytes = _payload_bytes(offset, batch)
+
+                    # wait until there is a free worker and enough payload left
+                    while running and (len(running) >= self.max_workers or sum(running.values()) + nbytes > self.max_inflight_bytes):
+                        self._finish_uploads(running, progress)
+
+                    # start the next batch
+                    future = executor.submit(insert, offset, batch)
+                    running[future] = nbytes
+                
+                # wait for the remaining batches
+                while running:
+                    self._finish_uploads(running, progress)
+            except BaseException:
+                # cancel all batches that did not start yet
+                for future in running:
+                    future.cancel()
+                raise
+            finally:
+                progress.close()
+
+    def _finish_uploads(self, running: dict, progress: tqdm):
+        """
+        Waits for at least one running upload to finish and re-raises its exception.
+
+        Args:
+            running (dict): The futures of the running uploads mapped to their payload.
+            progress (tqdm): The progress bar to update.
+        """
+        done, _ = wait(list(running.keys()), return_when=FIRST_COMPLETED)
+        for future in done:
+            running.pop(future)
+            future.result()
+            progress.update()
  
+    @traced('store.delitem')
     def __delitem__(self, key: str):
         """
         Deletes a tensor from the database with the given key.
@@ -237,9 +789,136 @@ class TensorStore(object):
         Raises:
             ValueError: If the tensor with the given key does not exist in the database.
         """
-        with self.backend.database() as db:
+        with self.get_context() as db:
             db.remove_dataset(key)
+
+        # remove the cached metadata and rows
+        self._invalidate(key)
+        self._metadata.remove_key(key)
+        self._keys = [k for k in self._keys if k != key]
+
+    @traced('store.append')
+    def append(self, key: str, value: Union[List[list], np.ndarray]):
+        """
+        Appends data along the first axis of an existing dataset.
+
+        Args:
+            key (str): The unique identifier for the tensor.
+            value (Union[List[list], np.ndarray]): The tensor data to be appended. The inner axes need to match the dataset.
+
+        Raises:
+            KeyError: If the dataset with the given key does not exist.
+            ValueError: If the dataset is stored in the tiled layout.
+        """
+        # the tiles along the first axis cannot be extended
+        if self.get_dataset(key).chunk_shape is not None:
+            raise ValueError(f"The dataset '{key}' is stored in the tiled layout and cannot be appended to.")
+
+        # first make a numpy array from it
+        value = np.asarray(value)
+
+        # make at least 2D 
+        if value.ndim == 1:
+            value = value.reshape(1, -1)
+
+        # split into batches for upload
+        batches, _ = split_batches(value, self.chunk_size)
+
+        with self.get_context() as db:
+            db.append_tensor(key, [batch for _, batch in batches])
+
+        # the cached metadata of the dataset changed
+        self._invalidate(key)
     
+    @traced('store.read_into')
+    def read_into(self, key: str, slices: Tuple[Any, ...], out: np.ndarray) -> np.ndarray:
+        """
+        Reads a selection of the dataset into a caller-provided array, like a reused
+        staging buffer. See StoreSlicer.read.
+
+        Args:
+            key (str): The unique identifier for the tensor.
+            slices (Tuple[Any, ...]): The index selecting the tensor data.
+            out (np.ndarray): A writeable float32 array of the shape of the selection.
+
+        Returns:
+            np.ndarray: The output array.
+
+        Raises:
+            TypeError: If out is not a writeable float32 ndarray.
+            ValueError: If out does not have the shape of the selection.
+        """
+        slices = slices if isinstance(slices, tuple) else (slices, )
+        return StoreSlicer(self, key).read(*slices, out=out)
+
+    @traced('store.reduce')
+    def reduce(self, key: str, op: str, axis: Union[None, int, Tuple[int, ...]] = None, slices: Tuple[Union[int, slice], ...] = ()) -> np.ndarray:
+        """
+        Reduces a slice of the dataset along the given axes. Datasets stored in rows are
+        reduced by the database, thus only the reduced tensor is transferred. Tiled
+        datasets and strided slices are loaded and reduced locally.
+        The axes refer to the dataset, thus axes indexed by an integer are kept with size 1
+        and each array index selects its positions along its own axis.
+
+        Args:
+            key (str): The unique identifier for the tensor.
+            op (str): The reduction, one of 'sum', 'mean', 'min', 'max', 'std' or 'var'.
+            axis (Union[None, int, Tuple[int, ...]]): The axes of the dataset to reduce. None reduces all axes.
+            slices (Tuple[Union[int, slice], ...]): The integers and slices selecting the part of the dataset to reduce.
+
+        Returns:
+            np.ndarray: The reduced tensor, in float32.
+
+        Raises:
+            ValueError: If the reduction or an axis is invalid, or the selection is empty.
+        """
+        check_op(op)
+        slicer = StoreSlicer(self, key)
+        axes = normalize_axis(axis, slicer.dataset.ndim)
+
+        selection = slicer.select(*slices)
+        if selection.empty:
+            raise ValueError('Cannot reduce an empty selection.')
+
+        # the tiles, strided slices and array indices cannot be reduced by the database
+        index, inner = selection.index, selection.slices
+        if slicer.dataset.chunk_shape is not None or selection.strided or selection.fancy:
+            box = selection.gather(slicer._load(index, inner, selection.steps, selection.rows))
+
+            # each array index selects its positions along its own axis
+            for i, inv in enumerate(selection.inverse):
+                if inv is not None:
+                    box = np.take(box, inv, axis=i)
+            reduced = reduce_array(box, op, axes)
+        else:
+            with self.get_context() as db:
+                reduced = db.reduce_tensor(key, op, axes, index[0], index[1], [s[0] for s in inner], [s[1] for s in inner])
+
+        # reverse the kept axes sliced with a negative step
+        kept = [flip for i, flip in enumerate(selection.flip) if i not in axes]
+        return reduced[tuple(slice(None, None, -1) if flip else slice(None) for flip in kept)]
+
+    def mirror(self, key: str, path: str) -> 'MirrorSlicer':
+        """
+        Mirrors the dataset into a local memory-mapped file and returns a slicer serving
+        it from local disk. If the file was mirrored before, only the rows appended to the
+        remote dataset since the last sync are loaded.
+
+        Args:
+            key (str): The unique identifier for the tensor.
+            path (str): The path of the local mirror file. A JSON sidecar is stored next to it.
+
+        Returns:
+            MirrorSlicer: The slicer of the local mirror.
+        """
+        from tensorage.mirror import MirrorSlicer
+
+        # pull the new rows
+        slicer = MirrorSlicer(self, key, path=path)
+        slicer.pull()
+
+        return slicer
+
     def __contains__(self, key: str) -> bool:
         """
         Checks if a tensor with the given key exists in the database.
@@ -269,22 +948,72 @@ class TensorStore(object):
         # return the length
         return len(keys)
 
-    def keys(self) -> List[str]:
+    @traced('store.keys')
+    def keys(self, refresh: bool = False) -> List[str]:
         """
         Retrieves a list of all dataset keys in the database.
+        The keys are cached for metadata_ttl seconds.
+
+        Args:
+            refresh (bool): If True, the keys are always loaded from the database.
 
         Returns:
             List[str]: A list of all dataset keys in the database.
         """
+        keys = None if refresh else self._metadata.get_keys()
+
         # get the keys from the database
-        with self.backend.database() as db:
-            keys = db.list_dataset_keys()
+        if keys is None:
+            with self.get_context() as db:
+                keys = db.list_dataset_keys()
+            self._metadata.put_keys(keys)
         
         # update the internal keys list
         self._keys = keys
 
         return keys
 
+    def refresh(self):
+        """
+        Drops all cached metadata and rows and reloads the list of dataset keys.
+        """
+        self._metadata.clear()
+        if self._cache is not None:
+            self._cache.clear()
+        self.keys(refresh=True)
+
+
+def _check_out(out: Any, shape: Tuple[int, ...]):
+    """
+    Validates a caller-provided output array.
+
+    Raises:
+        TypeError: If out is not a writeable float32 ndarray.
+        ValueError: If out does not have the given shape.
+    """
+    if not isinstance(out, np.ndarray) or out.dtype != np.float32:
+        raise TypeError(f"The output array needs to be a float32 numpy array, got {getattr(out, 'dtype', type(out).__name__)}.")
+    if not out.flags.writeable:
+        raise TypeError('The output array is read-only.')
+    if tuple(out.shape) != tuple(shape):
+        raise ValueError(f"The output array of shape {tuple(out.shape)} does not match the selection of shape {tuple(shape)}.")
+
+
+def _part_rows(read_bytes: Optional[int], row_bytes: int) -> Union[int, float]:
+    """
+    Get the number of rows along the first axis per read request.
+
+    Args:
+        read_bytes (Optional[int]): The largest payload of a read request. None does not split reads.
+        row_bytes (int): The payload of a single row in bytes.
+
+    Returns:
+        Union[int, float]: The number of rows, at least 1. Infinite, if reads are not split.
+    """
+    if read_bytes is None:
+        return float('inf')
+    return max(1, read_bytes // max(1, row_bytes))
+
 
 @dataclass
 class StoreSlicer:
@@ -303,87 +1032,268 @@ class StoreSlicer:
 
     def __post_init__(self):
         if self.dataset is None:
-            with self._store.backend.database() as db:
-                self.dataset = db.get_dataset(self.key)
+            self.dataset = self._store.get_dataset(self.key)
+
+    def select(self, *args: Union[int, slice, None, 'EllipsisType']) -> Selection:
+        """
+        Resolves NumPy basic indexing on the dataset, supporting negative indices, steps,
+        Ellipsis and None.
+
+        Args:
+            *args (Union[int, slice, None, EllipsisType]): The index.
+
+        Returns:
+            Selection: The resolved selection.
+        """
+        return resolve_selection(args, tuple(self.dataset.shape))
 
     def get_iloc_slices(self, *args: Union[int, Tuple[int], slice]) -> Tuple[str, Tuple[int, int], List[Tuple[int, int]]]:
         """
         Retrieves the index ranges to select from the tensor with the given key and iloc-style arguments.
+        The ranges are the bounding box of the selection, steps are not included.
 
         Args:
             *args (Union[int, Tuple[int], slice]): The iloc-style arguments to use for selecting the tensor data.
 
         Returns:
-            Tuple[str, Tuple[int, int], List[Tuple[int, int]]]: A tuple containing the key, the shape of the tensor, and a list of index ranges to select.
+            Tuple[str, Tuple[int, int], List[Tuple[int, int]]]: A tuple containing the key, the index along the
+                first axis (upper bound excluded) and the index along each inner axis (upper bound included).
 
         Raises:
-            ValueError: If the tensor with the given key does not exist in the database.
-        """        # check the length of the args
-        if len(args) == 0:
-            # use the dataset to load the full sample
-            return (
-                self.key, 
-                [1, self.dataset.shape[0] + 1], 
-                [[1, self.dataset.shape[i] + 1] for i in range(1, self.dataset.ndim)]
-            )
-
-        # slicing is actually needed
-        
-        # get the index
-        if isinstance(args[0], int):
-            index = [args[0] + 1, args[0] + 2]
-        elif isinstance(args[0], slice):
-            index = [args[0].start + 1 if args[0].start is not None else 1, args[0].stop + 1 if args[0].stop is not None else self.dataset.shape[0] + 1]
-        else:
-            raise KeyError('Batch index needs to be passed as int or slice.')
-
-        # get the slices
-        if len(args) == 1:
-            slices = [[1, self.dataset.shape[i] + 1] for i in range(1, self.dataset.ndim)]
-        else:  # 2 or more beyond index
-            slices = []
-            for i, arg in enumerate(args[1:]):
-                if isinstance(arg, int):
-                    slices.append([arg + 1, arg + 1])
-                elif isinstance(arg, slice):
-                    slices.append([arg.start + 1 if arg.start is not None else 1, arg.stop + 1 if arg.stop is not None else self.dataset.shape[i + 1] + 1])
-                else:
-                    raise KeyError('Slice needs to be passed as int or slice.')
-            
-            # maybe the user does not want to slice all dimensions, append the others
-            if len(slices) + 1 != self.dataset.ndim:   # +1 for the index
-                for i in range(len(slices) + 1, self.dataset.ndim):
-                    slices.append([1, self.dataset.shape[i] + 1])
+            KeyError: If an argument is neither an int nor a slice.
+            IndexError: If an integer index is out of bounds.
+        """
+        selection = self.select(*args)
 
         # finally return the full slice index for the database
         return (
             self.key,
-            index,
-            slices
+            selection.index,
+            selection.slices
         )
     
+    @traced('slicer.getitem')
     def __getitem__(self, args: Union[int, Tuple[int], slice]) -> np.ndarray:
         """
-        Retrieves a tensor from the database with the given iloc-style arguments.
+        Retrieves a tensor from the database with NumPy basic indexing. Steps are applied
+        by the backend, thus only the selected elements are transferred.
 
         Args:
-            args (Union[int, Tuple[int], slice]): The iloc-style arguments to use for selecting the tensor data.
+            args (Union[int, Tuple[int], slice]): The integers, slices, Ellipsis and None selecting the tensor data.
 
         Returns:
-            np.ndarray: The tensor data with the given iloc-style arguments.
+            np.ndarray: The selected tensor data, shaped like NumPy would.
 
         Raises:
-            ValueError: If the tensor with the given key does not exist in the database.
-        """        # get the slices
-        _, index, slices = self.get_iloc_slices(*args)
+            KeyError: If an argument is neither an int, slice, Ellipsis nor None.
+            IndexError: If an integer index is out of bounds.
+        """        # a single index or slice is not passed as tuple
+        if not isinstance(args, tuple):
+            args = (args, )
 
-        # load the tensor
-        with self._store.backend.database() as db:
-            # load the tensor
-            arr = db.get_tensor(self.key, index[0], index[1], [s[0] for s in slices], [s[1] for s in slices])
-        
         # TODO now we can transform to other libaries
-        return arr
+        return self.read(*args)
+
+    def read(self, *args: Any, out: Optional[np.ndarray] = None) -> np.ndarray:
+        """
+        Retrieves a tensor like __getitem__, optionally into a caller-provided array.
+        Selections of slices only are decoded straight into the output array, any other
+        selection is copied into it once.
+
+        Example:
+
+            .. code-block:: python
+                buffer = np.empty((64, 100, 5), dtype=np.float32)
+                for start in range(0, 6400, 64):
+                    store.foo.read(slice(start, start + 64), out=buffer)
+
+        Args:
+            *args (Any): The integers, slices, arrays, Ellipsis and None selecting the tensor data.
+            out (Optional[np.ndarray]): A writeable float32 array of the shape of the selection.
+                It may be a strided view. None returns a new array.
+
+        Returns:
+            np.ndarray: The selected tensor data, which is out if given.
+
+        Raises:
+            TypeError: If out is not a writeable float32 ndarray.
+            ValueError: If out does not have the shape of the selection.
+        """
+        selection = self.select(*args)
+
+        if out is not None:
+            _check_out(out, selection.shape)
+
+        # empty selections do not need the backend
+        if selection.empty:
+            return write_into(out, selection.finalize(np.empty(selection.box_shape, dtype=np.float32)))
+
+        # the loaded box is the selection, load it into the output
+        if out is not None and selection.direct:
+            return self._load(selection.index, selection.slices, selection.steps, out=out)
+
+        # load the box of selected elements
+        arr = self._load(selection.index, selection.slices, selection.steps, selection.rows)
+        return write_into(out, selection.finalize(arr))
+
+    def iter_batches(self, batch_size: int, *slices: Union[int, slice], prefetch: int = 1) -> Iterator[np.ndarray]:
+        """
+        Iterates over consecutive batches along the first axis of the tensor. While a batch
+        is processed, the next prefetch batches are already loaded in the background, thus
+        at most prefetch + 1 batches are held in memory.
+
+        Args:
+            batch_size (int): The number of elements along the first axis per batch.
+            *slices (Union[int, slice]): Slices applied to the inner axes of every batch.
+            prefetch (int): The number of batches loaded ahead. 0 loads each batch on request.
+
+        Yields:
+            np.ndarray: The next batch of the tensor.
+        """
+        if batch_size < 1:
+            raise ValueError(f"batch_size needs to be a positive integer, got {batch_size}.")
+
+        bounds = [(start, min(start + batch_size, self.dataset.shape[0])) for start in range(0, self.dataset.shape[0], batch_size)]
+
+        # load each batch on request
+        if prefetch <= 0:
+            for start, stop in bounds:
+                yield self[(slice(start, stop), *slices)]
+            return
+
+        pending: 'deque[Future]' = deque()
+        executor = ThreadPoolExecutor(max_workers=prefetch)
+        try:
+            for start, stop in bounds:
+                pending.append(executor.submit(self.__getitem__, (slice(start, stop), *slices)))
+
+                # keep prefetch batches loading, while the oldest one is handed out
+                if len(pending) > prefetch:
+                    yield pending.popleft().result()
+
+            while pending:
+                yield pending.popleft().result()
+        finally:
+            # the consumer stopped early, do not load any further batches
+            for future in pending:
+                future.cancel()
+            executor.shutdown(wait=True)
+
+    def _load(self, index: List[int], slices: List[List[int]], step: Optional[List[int]] = None, rows: Optional[List[int]] = None, out: Optional[np.ndarray] = None) -> np.ndarray:
+        """
+        Loads the tensor for the resolved database index and slices. If the store has a
+        row cache, only the rows missing in the cache are loaded from the backend and
+        the slices are applied locally.
+
+        Args:
+            index (List[int]): The lower and upper database index along the first axis.
+            slices (List[List[int]]): The lower and upper database index along each inner axis.
+            step (Optional[List[int]]): The step along each axis. None loads every element.
+            rows (Optional[List[int]]): The sorted, unique database indices of the rows to load
+                instead of the index range.
+            out (Optional[np.ndarray]): The array to load the tensor into. Not supported with rows.
+
+        Returns:
+            np.ndarray: The tensor data.
+        """
+        cache = self._store.cache
+
+        # without cache, let the backend slice the tensor
+        if cache is None:
+            with self._store.get_context() as db:
+                if rows is not None:
+                    return self._take(db, rows, [s[0] for s in slices], [s[1] for s in slices], step)
+                return self._fetch(db, index[0], index[1], [s[0] for s in slices], [s[1] for s in slices], step, out=out)
+
+        # the rows that exist in the requested range
+        steps = step if step is not None else [1] * self.dataset.ndim
+        indices = rows if rows is not None else range(index[0], min(index[1], self.dataset.shape[0] + 1), steps[0])
+        cached = {idx: cache.get(self.dataset, idx) for idx in indices}
+
+        # load the missing rows in runs of the same step, or all at once for an array index
+        missing = [idx for idx, row in cached.items() if row is None]
+        if len(missing) > 0 and rows is not None:
+            with self._store.get_context() as db:
+                full = self._take(db, missing, [1 for _ in self.dataset.shape[1:]], list(self.dataset.shape[1:]))
+                for idx, row in zip(missing, full):
+                    cache.put(self.dataset, idx, row)
+                    cached[idx] = row
+        elif len(missing) > 0:
+            with self._store.get_context() as db:
+                for low, up in contiguous_runs(missing, steps[0]):
+                    run_step = [steps[0]] + [1] * (self.dataset.ndim - 1) if steps[0] != 1 else None
+                    full = self._fetch(db, low, up, [1 for _ in self.dataset.shape[1:]], list(self.dataset.shape[1:]), run_step)
+                    for idx, row in zip(range(low, up, steps[0]), full):
+                        cache.put(self.dataset, idx, row)
+                        cached[idx] = row
+
+        # slice the inner axes like the database does, rows are copied straight into the output
+        inner = tuple(slice(low - 1, up, st) for (low, up), st in zip(slices, steps[1:]))
+        if out is not None:
+            for i, idx in enumerate(indices):
+                out[i] = cached[idx][inner]
+            return out
+
+        # assemble the tensor
+        arr = np.stack([cached[idx] for idx in indices]) if len(indices) > 0 else np.empty((0, *self.dataset.shape[1:]), dtype=np.float32)
+        return arr[(slice(None), *inner)]
+
+    def _fetch(self, db: 'BaseContext', index_low: int, index_up: int, slice_low: List[int], slice_up: List[int], step: Optional[List[int]] = None, out: Optional[np.ndarray] = None) -> np.ndarray:
+        """
+        Loads the tensor from the backend, using the tiles of the dataset if it is stored in the tiled layout.
+        The step and output array are only passed on, if there is one.
+        """
+        kwargs = dict(step=step) if step is not None else dict()
+        if self.dataset.chunk_shape is not None:
+            return write_into(out, db.get_tiled_tensor(self.dataset, index_low, index_up, slice_low, slice_up, **kwargs))
+
+        # the number of rows, which fit into a single request
+        steps = step if step is not None else [1] * self.dataset.ndim
+        rows = range(index_low, min(index_up, self.dataset.shape[0] + 1), steps[0])
+        inner = [len(range(low, up + 1, st)) for low, up, st in zip(slice_low, slice_up, steps[1:])]
+        per_part = _part_rows(self._store.read_bytes, int(np.prod(inner)) * 4)
+        if len(rows) <= per_part:
+            if out is not None:
+                return write_into(out, db.get_tensor(self.key, index_low, index_up, slice_low, slice_up, out=out, **kwargs))
+            return db.get_tensor(self.key, index_low, index_up, slice_low, slice_up, **kwargs)
+
+        # each part is decoded into the preallocated tensor at its offset
+        if out is None:
+            out = np.empty((len(rows), *inner), dtype=np.float32)
+
+        def load(offset: int):
+            part = rows[offset:offset + per_part]
+            target = out[offset:offset + len(part)]
+            write_into(target, db.get_tensor(self.key, part[0], part[-1] + 1, slice_low, slice_up, out=target, **kwargs))
+
+        offsets = range(0, len(rows), per_part)
+        if self._store.read_workers <= 1:
+            for offset in offsets:
+                load(offset)
+        else:
+            with ThreadPoolExecutor(max_workers=self._store.read_workers) as executor:
+                for future in [executor.submit(load, offset) for offset in offsets]:
+                    future.result()
+        return out
+
+    def _take(self, db: 'BaseContext', rows: List[int], slice_low: List[int], slice_up: List[int], step: Optional[List[int]] = None) -> np.ndarray:
+        """
+        Loads the rows at the given database indices. Rows are read in a single request,
+        tiled datasets load the tiles along the first axis touched by the rows.
+        The step along the inner axes is applied locally.
+        """
+        if self.dataset.chunk_shape is not None:
+            # one request per tile along the first axis
+            size = self.dataset.chunk_shape[0]
+            parts = []
+            for _, group in itertools.groupby(rows, key=lambda idx: (idx - 1) // size):
+                group = list(group)
+                tile = self._fetch(db, group[0], group[-1] + 1, slice_low, slice_up)
+                parts.append(tile[[idx - group[0] for idx in group]])
+            arr = np.concatenate(parts)
+        else:
+            arr = db.take_tensor(self.key, rows, slice_low, slice_up)
+        return apply_steps(arr, step)
 
     def __call__(self, *args: Union[int, Tuple[int], slice]) -> Tuple[str, Tuple[int, int], List[Tuple[int, int]]]:
         """
@@ -0,0 +1,184 @@
+"""
+This module provides the helpers for the tiled layout of datasets.
+
+A tiled dataset is stored as fixed-size N-d tiles of `chunk_shape`, each keyed by its
+coordinates in the tile grid. A slice is resolved into the range of tile coordinates
+it touches, so that only the tiles involved are loaded from the backend. Tiles at
+the upper edges of the dataset are smaller, if the shape is not a multiple of the
+chunk shape.
+
+Example:
+
+    .. code-block:: python
+        # store a raster in tiles of 100 x 64 x 64
+        store = TensorStore(backend, chunk_shape=(100, 64, 64))
+        store['raster'] = np.random.random((10000, 512, 512))
+
+        # a single-pixel time series loads only one column of tiles
+        series = store['raster', :, 4, 4]
+"""
+from typing import Iterator, List, Optional, Tuple
+import itertools
+
+import numpy as np
+
+
+Coords = Tuple[int, ...]
+
+
+def resolve_bounds(shape: Tuple[int], index_low: int, index_up: int, slice_low: List[int], slice_up: List[int]) -> List[Tuple[int, int]]:
+    """
+    Translates the database index and slices, as passed to get_tensor, into zero-based
+    half-open bounds along each axis, clamped to the shape of the dataset.
+    The index along the first axis excludes index_up, while the slices include slice_up.
+
+    Args:
+        shape (Tuple[int]): The shape of the dataset.
+        index_low (int): The lower index bound along the first axis.
+        index_up (int): The upper index bound along the first axis.
+        slice_low (List[int]): The lower slice bound along each inner axis.
+        slice_up (List[int]): The upper slice bound along each inner axis.
+
+    Returns:
+        List[Tuple[int, int]]: The lower (inclusive) and upper (exclusive) bound of each axis.
+    """
+    bounds = [(max(index_low - 1, 0), min(index_up - 1, shape[0]))]
+    for low, up, size in zip(slice_low, slice_up, shape[1:]):
+        bounds.append((max(low - 1, 0), min(up, size)))
+
+    # empty ranges have the lower bound as upper bound
+    return [(low, max(low, up)) for low, up in bounds]
+
+
+def tile_range(bounds: List[Tuple[int, int]], chunk_shape: Tuple[int]) -> Optional[Tuple[Coords, Coords]]:
+    """
+    Get the range of tile coordinates touched by the given bounds.
+
+    Args:
+        bounds (List[Tuple[int, int]]): The zero-based half-open bounds along each axis.
+        chunk_shape (Tuple[int]): The shape of the tiles.
+
+    Returns:
+        Optional[Tuple[Coords, Coords]]: The lower and upper (both inclusive) tile coordinates, or None if the bounds are empty.
+    """
+    if any(up <= low for low, up in bounds):
+        return None
+
+    coords_low = tuple(low // chunk for (low, _), chunk in zip(bounds, chunk_shape))
+    coords_up = tuple((up - 1) // chunk for (_, up), chunk in zip(bounds, chunk_shape))
+    return coords_low, coords_up
+
+
+def tile_shape(coords: Coords, shape: Tuple[int], chunk_shape: Tuple[int]) -> Tuple[int, ...]:
+    """
+    Get the shape of the tile at the given coordinates, which is smaller at the upper edges.
+
+    Args:
+        coords (Coords): The coordinates of the tile.
+        shape (Tuple[int]): The shape of the dataset.
+        chunk_shape (Tuple[int]): The shape of the tiles.
+
+    Returns:
+        Tuple[int, ...]: The shape of the tile.
+    """
+    return tuple(min(chunk, size - c * chunk) for c, size, chunk in zip(coords, shape, chunk_shape))
+
+
+def row_chunk_shape(shape: Tuple[int], chunk_size: int) -> Tuple[int, ...]:
+    """
+    Get a chunk shape of full rows along the first axis, holding about chunk_size elements.
+    If a single row holds more than chunk_size elements, the row is split along its
+    inner axes, starting with the leading ones.
+
+    Args:
+        shape (Tuple[int]): The shape of the dataset.
+        chunk_size (int): The number of elements per tile.
+
+    Returns:
+        Tuple[int, ...]: The chunk shape.
+    """
+    row = int(np.prod(shape[1:]))
+    if row <= chunk_size:
+        return (max(1, chunk_size // max(1, row)), *shape[1:])
+
+    # split the row, until the trailing axes fit into chunk_size
+    chunk = [1, *shape[1:]]
+    for i in range(1, len(chunk)):
+        rest = int(np.prod(chunk[i + 1:]))
+        if chunk[i] * rest <= chunk_size:
+            break
+        chunk[i] = max(1, chunk_size // rest)
+
+    return tuple(int(c) for c in chunk)
+
+
+def split_tiles(value: np.ndarray, chunk_shape: Tuple[int]) -> Iterator[Tuple[Coords, np.ndarray]]:
+    """
+    Splits a tensor into tiles of chunk_shape.
+
+    Args:
+        value (np.ndarray): The tensor to split.
+        chunk_shape (Tuple[int]): The shape of the tiles. Needs one entry per axis of the tensor.
+
+    Yields:
+        Tuple[Coords, np.ndarray]: The coordinates of the tile and the tile itself.
+
+    Raises:
+        ValueError: If the chunk shape does not match the dimensions of the tensor.
+    """
+    if len(chunk_shape) != value.ndim or any(chunk < 1 for chunk in chunk_shape):
+        raise ValueError(f"The chunk shape {tuple(chunk_shape)} needs one positive entry for each of the {value.ndim} axes of the tensor.")
+
+    grid = [range(-(-size // chunk)) for size, chunk in zip(value.shape, chunk_shape)]
+    for coords in itertools.product(*grid):
+        yield coords, value[tuple(slice(c * chunk, (c + 1) * chunk) for c, chunk in zip(coords, chunk_shape))]
+
+
+def batch_tiles(tiles: Iterator[Tuple[Coords, np.ndarray]], chunk_size: int) -> List[List[Tuple[Coords, np.ndarray]]]:
+    """
+    Groups tiles into upload batches of about chunk_size elements. Each batch holds at least one tile.
+
+    Args:
+        tiles (Iterator[Tuple[Coords, np.ndarray]]): The tiles to group.
+        chunk_size (int): The number of elements per batch.
+
+    Returns:
+        List[List[Tuple[Coords, np.ndarray]]]: The batches of tiles.
+    """
+    batches = []
+    size = 0
+    for coords, tile in tiles:
+        if len(batches) == 0 or size + tile.size > chunk_size:
+            batches.append([])
+            size = 0
+        batches[-1].append((coords, tile))
+        size += tile.size
+
+    return batches
+
+
+def assemble_tiles(bounds: List[Tuple[int, int]], chunk_shape: Tuple[int], tiles: List[Tuple[Coords, np.ndarray]]) -> np.ndarray:
+    """
+    Assembles the tensor within the given bounds from the tiles touching it.
+
+    Args:
+        bounds (List[Tuple[int, int]]): The zero-based half-open bounds along each axis.
+        chunk_shape (Tuple[int]): The shape of the tiles.
+        tiles (List[Tuple[Coords, np.ndarray]]): The coordinates of the tiles and the tiles.
+
+    Returns:
+        np.ndarray: The tensor within the bounds.
+    """
+    out = np.empty([up - low for low, up in bounds], dtype=np.float32)
+
+    for coords, tile in tiles:
+        src, dst = [], []
+        for (low, up), c, chunk, size in zip(bounds, coords, chunk_shape, tile.shape):
+            origin = c * chunk
+            start, stop = max(low, origin), min(up, origin + size)
+            src.append(slice(start - origin, stop - origin))
+            dst.append(slice(start - low, stop - low))
+
+        out[tuple(dst)] = tile[tuple(src)]
+
+    return out
@@ -0,0 +1,179 @@
+"""
+This module provides the opt-in phase-level tracing of the TensorStore.
+
+If tracing is enabled, the public operations of the store and their phases, like borrowing
+the session, authentication, serialization, the HTTP request and decoding, are recorded as
+nested spans. The spans can be exported in the Chrome trace-event format and opened in
+``chrome://tracing`` or https://ui.perfetto.dev.
+Tracing is enabled by ``TensorStore(trace=True)``, by `enable`, or by setting the
+``TENSORAGE_TRACE`` environment variable to the path the trace is written to on exit.
+If disabled, which is the default, a span costs a single global lookup.
+
+Example:
+
+    .. code-block:: python
+        store = TensorStore(backend, trace=True)
+        store['my_dataset'] = np.random.random((500, 10, 10))
+        store.my_dataset[0:12]
+
+        get_tracer().export('trace.json')
+"""
+from typing import Any, Callable, ContextManager, Dict, Iterator, List, Optional
+from contextlib import contextmanager, nullcontext
+from dataclasses import dataclass, field
+import functools
+import threading
+import atexit
+import json
+import time
+import os
+
+
+@dataclass
+class Tracer(object):
+    """
+    Records spans as complete events of the Chrome trace-event format.
+
+    Attributes:
+        events (List[Dict[str, Any]]): The recorded trace events.
+
+    """
+    events: List[Dict[str, Any]] = field(default_factory=list)
+    _start: float = field(default_factory=time.perf_counter, init=False, repr=False)
+    _lock: threading.Lock = field(default_factory=threading.Lock, init=False, repr=False)
+
+    @contextmanager
+    def span(self, name: str, cat: str = 'tensorage', **args: Any) -> Iterator[None]:
+        """
+        Records the enclosed code as a span. Spans of the same thread nest by time.
+
+        Args:
+            name (str): The name of the span.
+            cat (str): The category of the span, like 'network' or 'serialize'.
+            **args (Any): Further details shown along with the span.
+        """
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            end = time.perf_counter()
+            event = dict(name=name, cat=cat, ph='X', ts=(start - self._start) * 1e6, dur=(end - start) * 1e6, pid=os.getpid(), tid=threading.get_ident())
+            if len(args) > 0:
+                event['args'] = args
+            with self._lock:
+                self.events.append(event)
+
+    def to_chrome(self) -> Dict[str, Any]:
+        """
+        Get the recorded spans in the Chrome trace-event format.
+
+        Returns:
+            Dict[str, Any]: The trace, ready to be dumped as JSON.
+        """
+        with self._lock:
+            return dict(traceEvents=list(self.events), displayTimeUnit='ms')
+
+    def export(self, path: str):
+        """
+        Writes the recorded spans as Chrome trace JSON.
+
+        Args:
+            path (str): The path of the trace file.
+        """
+        with open(path, 'w') as f:
+            json.dump(self.to_chrome(), f)
+
+    def clear(self):
+        """
+        Drops all recorded spans.
+        """
+        with self._lock:
+            self.events.clear()
+
+
+# the active tracer, None if tracing is disabled
+_TRACER: Optional[Tracer] = None
+
+
+def enable(tracer: Optional[Tracer] = None) -> Tracer:
+    """
+    Enables tracing. An active tracer is kept, unless a new one is passed.
+
+    Args:
+        tracer (Optional[Tracer]): The tracer to record to.
+
+    Returns:
+        Tracer: The active tracer.
+    """
+    global _TRACER
+    if tracer is not None or _TRACER is None:
+        _TRACER = tracer if tracer is not None else Tracer()
+    return _TRACER
+
+
+def disable():
+    """
+    Disables tracing.
+    """
+    global _TRACER
+    _TRACER = None
+
+
+def get_tracer() -> Optional[Tracer]:
+    """
+    Get the active tracer.
+
+    Returns:
+        Optional[Tracer]: The active tracer, or None if tracing is disabled.
+    """
+    return _TRACER
+
+
+def span(name: str, cat: str = 'tensorage', **args: Any) -> ContextManager:
+    """
+    Records the enclosed code as span of the active tracer. Does nothing if tracing is disabled.
+
+    Args:
+        name (str): The name of the span.
+        cat (str): The category of the span, like 'network' or 'serialize'.
+        **args (Any): Further details shown along with the span.
+
+    Returns:
+        ContextManager: The span.
+    """
+    if _TRACER is None:
+        return nullcontext()
+    return _TRACER.span(name, cat, **args)
+
+
+def traced(name: str, cat: str = 'tensorage') -> Callable[[Callable], Callable]:
+    """
+    Decorates a function to be recorded as span of the active tracer.
+
+    Args:
+        name (str): The name of the span.
+        cat (str): The category of the span.
+
+    Returns:
+        Callable[[Callable], Callable]: The decorator.
+    """
+    def decorator(func: Callable) -> Callable:
+        @functools.wraps(func)
+        def wrapper(*args, **kwargs):
+            if _TRACER is None:
+                return func(*args, **kwargs)
+            with _TRACER.span(name, cat):
+                return func(*args, **kwargs)
+        return wrapper
+    return decorator
+
+
+def _export_on_exit(path: str):
+    if _TRACER is not None:
+        _TRACER.export(path)
+
+
+# enable tracing from the environment and write the trace on exit
+if os.environ.get('TENSORAGE_TRACE'):
+    enable()
+    atexit.register(_export_on_exit, os.environ['TENSORAGE_TRACE'])
@@ -0,0 +1,133 @@
+"""
+This module provides the auto-tuning of the upload batch size.
+
+The `BatchTuner` targets a payload size in bytes per request, instead of a fixed number
+of elements. In adaptive mode, it learns the best payload from the throughput observed
+during the upload: the target grows as long as the throughput improves considerably and
+steps back, once larger requests get slower. Requests rejected as too large lower the
+payload limit for the rest of the session.
+
+Example:
+
+    .. code-block:: python
+        # learn the payload per request, starting at 1 MB
+        store = TensorStore(backend, request_bytes='auto')
+
+        # send about 8 MB per request
+        store = TensorStore(backend, request_bytes=8 * 2**20)
+"""
+from typing import Iterator, List, Tuple
+from dataclasses import dataclass, field
+import threading
+
+import numpy as np
+
+from tensorage.tiles import Coords
+
+
+@dataclass
+class BatchTuner(object):
+    """
+    Tunes the payload of upload requests.
+
+    Args:
+        target_bytes (int): The current payload per request in bytes.
+        adaptive (bool): If True, the target is learned from the observed throughput.
+        min_bytes (int): The smallest target in adaptive mode.
+        max_bytes (int): The largest payload per request, lowered on requests rejected as too large.
+        factor (float): The factor the target is changed by in adaptive mode.
+
+    """
+    target_bytes: int = 2**20
+    adaptive: bool = True
+    min_bytes: int = 64 * 2**10
+    max_bytes: int = 64 * 2**20
+    factor: float = 2.0
+    _best: float = field(default=0.0, init=False, repr=False)
+    _lock: threading.Lock = field(default_factory=threading.Lock, init=False, repr=False)
+
+    def rows(self, row_bytes: int) -> int:
+        """
+        Get the number of rows along the first axis per request.
+
+        Args:
+            row_bytes (int): The payload of a single row in bytes.
+
+        Returns:
+            int: The number of rows, at least 1.
+        """
+        return max(1, self.target_bytes // max(1, row_bytes))
+
+    def observe(self, nbytes: int, seconds: float):
+        """
+        Records a successful request and adapts the target to its throughput.
+        Requests much smaller than the target, like the last batch, are ignored.
+
+        Args:
+            nbytes (int): The payload of the request in bytes.
+            seconds (float): The wall time of the request.
+        """
+        if not self.adaptive or seconds <= 0 or nbytes < self.target_bytes // 2:
+            return
+
+        throughput = nbytes / seconds
+        with self._lock:
+            # larger requests still pay off
+            if throughput > self._best * 1.1:
+                self._best = throughput
+                self.target_bytes = min(self.max_bytes, int(self.target_bytes * self.factor))
+
+            # larger requests got slower, step back
+            elif throughput < self._best * 0.8:
+                self.target_bytes = max(self.min_bytes, int(self.target_bytes / self.factor))
+
+    def reject(self, nbytes: int):
+        """
+        Records a request rejected as too large, which lowers the payload limit.
+
+        Args:
+            nbytes (int): The payload of the rejected request in bytes.
+        """
+        with self._lock:
+            self.max_bytes = max(4, min(self.max_bytes, nbytes // 2))
+            self.min_bytes = min(self.min_bytes, self.max_bytes)
+            self.target_bytes = min(self.target_bytes, self.max_bytes)
+
+    def batches(self, value: np.ndarray) -> Iterator[Tuple[int, np.ndarray]]:
+        """
+        Splits a tensor along the first axis into batches of about the current target.
+        The target is read for each batch, thus it follows the tuning during the upload.
+
+        Args:
+            value (np.ndarray): The tensor to split.
+
+        Yields:
+            Tuple[int, np.ndarray]: The offset along the first axis and the batch.
+        """
+        row_bytes = int(np.prod(value.shape[1:])) * 4
+        offset = 0
+        while offset < value.shape[0]:
+            rows = self.rows(row_bytes)
+            yield offset, value[offset:offset + rows]
+            offset += rows
+
+    def tile_batches(self, tiles: Iterator[Tuple[Coords, np.ndarray]]) -> Iterator[List[Tuple[Coords, np.ndarray]]]:
+        """
+        Groups tiles into batches of about the current target. Each batch holds at least one tile.
+
+        Args:
+            tiles (Iterator[Tuple[Coords, np.ndarray]]): The tiles to group.
+
+        Yields:
+            List[Tuple[Coords, np.ndarray]]: The next batch of tiles.
+        """
+        batch, size = [], 0
+        for coords, tile in tiles:
+            if len(batch) > 0 and size + tile.size * 4 > self.target_bytes:
+                yield batch
+                batch, size = [], 0
+            batch.append((coords, tile))
+            size += tile.size * 4
+
+        if len(batch) > 0:
+            yield batch
@@ -1,4 +1,4 @@
-from typing import Tuple
+from typing import Optional, Tuple
 from dataclasses import dataclass
 
 
@@ -10,3 +10,5 @@ class Dataset(object):
     ndim: int
     type: str
     is_shared: bool
+    chunk_shape: Optional[Tuple[int]] = None
+    compressor: Optional[str] = None
@@ -0,0 +1,202 @@
+import unittest
+from unittest.mock import AsyncMock, MagicMock, Mock
+import asyncio
+import time
+
+import numpy as np
+
+from tensorage.async_store import AsyncTensorStore
+from tensorage.session import AsyncBackendSession
+from tensorage.types import Dataset
+
+
+def mock_backend() -> MagicMock:
+    """Create a mocked async backend, that returns an AsyncMock context."""
+    backend = MagicMock()
+    db = AsyncMock()
+    backend.database.return_value.__aenter__.return_value = db
+    backend.storage.return_value.__aenter__.return_value = db
+    return backend
+
+
+class TestAsyncTensorStore(unittest.IsolatedAsyncioTestCase):
+    async def test_get_tensor_slice(self):
+        """
+        Test that the slices are resolved like in the TensorStore.
+        """
+        backend = mock_backend()
+        db = backend.database.return_value.__aenter__.return_value
+        db.get_dataset.return_value = Dataset(1, 'foo', [30, 100, 5], 3, 'float32', False)
+        db.get_tensor.return_value = np.random.random((10, 100, 1))
+
+        # create the store
+        store = AsyncTensorStore(backend)
+
+        # slice the data
+        data = await store.get('foo', slice(None, 10), slice(None), slice(2, 3))
+
+        # make sure the indices were passed correctly
+        db.get_tensor.assert_awaited_once_with('foo', 1, 11, [1, 3], [100, 3])
+        assert data.shape == (10, 100, 1)
+
+    async def test_concurrent_reads(self):
+        """
+        Test that many reads can run concurrently on the same loop.
+        """
+        backend = mock_backend()
+        db = backend.database.return_value.__aenter__.return_value
+        dataset = Dataset(1, 'foo', [30, 100, 5], 3, 'float32', False)
+
+        # every read takes 50ms
+        async def get_tensor(*args):
+            await asyncio.sleep(0.05)
+            return np.zeros((1, 100, 5))
+        db.get_tensor.side_effect = get_tensor
+
+        # create the store
+        store = AsyncTensorStore(backend)
+
+        # read 10 slices concurrently
+        start = time.perf_counter()
+        results = await asyncio.gather(*[store.get('foo', i, dataset=dataset) for i in range(10)])
+
+        # the reads did overlap
+        assert len(results) == 10
+        assert time.perf_counter() - start < 0.4
+        db.get_dataset.assert_not_awaited()
+
+    async def test_get_many(self):
+        """
+        Test that get_many resolves the metadata at once and reads concurrently.
+        """
+        backend = mock_backend()
+        db = backend.database.return_value.__aenter__.return_value
+        db.get_datasets.return_value = [Dataset(i, key, [30, 100, 5], 3, 'float32', False) for i, key in enumerate(['a', 'b', 'c', 'd'])]
+
+        # every read takes 50ms
+        async def get_tensor(*args):
+            await asyncio.sleep(0.05)
+            return np.zeros((1, 100, 5))
+        db.get_tensor.side_effect = get_tensor
+
+        store = AsyncTensorStore(backend)
+
+        start = time.perf_counter()
+        arrays = await store.get_many([(key, (0, )) for key in 'abcd'])
+        assert time.perf_counter() - start < 0.15
+        assert sorted(arrays.keys()) == ['a', 'b', 'c', 'd']
+        assert arrays['a'].shape == (100, 5)
+        db.get_dataset.assert_not_awaited()
+
+    async def test_set_tensor_batches(self):
+        """
+        Test that all batches are uploaded with the correct offsets.
+        """
+        backend = mock_backend()
+        db = backend.database.return_value.__aenter__.return_value
+        db.list_dataset_keys.return_value = []
+        db.insert_dataset.return_value = Dataset(2, 'bar', (30, 10, 10), 3, 'float32', False)
+
+        # create the store with a small chunk size
+        store = AsyncTensorStore(backend, chunk_size=10 * 10 * 2, max_workers=3)
+        await store.set('bar', np.random.random((30, 10, 10)))
+
+        # make sure all batches were uploaded
+        offsets = sorted(call.kwargs['offset'] for call in db.insert_tensor.await_args_list)
+        assert offsets == list(range(0, 30, 2))
+
+    async def test_overwrite_not_allowed(self):
+        """
+        Test that a ValueError is raised if the key exists.
+        """
+        backend = mock_backend()
+        db = backend.database.return_value.__aenter__.return_value
+        db.list_dataset_keys.return_value = ['bar']
+
+        store = AsyncTensorStore(backend)
+        with self.assertRaises(ValueError):
+            await store.set('bar', np.zeros((10, 10)))
+
+    async def test_iter_batches(self):
+        """
+        Test that the batches cover the first axis.
+        """
+        backend = mock_backend()
+        db = backend.database.return_value.__aenter__.return_value
+        db.get_dataset.return_value = Dataset(1, 'foo', [25, 4], 2, 'float32', False)
+        db.get_tensor.side_effect = lambda key, low, up, slice_low, slice_up: np.zeros((up - low, 4))
+
+        store = AsyncTensorStore(backend)
+        sizes = [batch.shape[0] async for batch in store.iter_batches('foo', 10)]
+
+        assert sizes == [10, 10, 5]
+
+
+class TestAsyncBackendSession(unittest.IsolatedAsyncioTestCase):
+    async def test_single_login_for_concurrent_contexts(self):
+        """
+        Test that concurrent contexts wait for one login and never sign out.
+        """
+        client = MagicMock()
+        auth_response = Mock()
+        auth_response.session = Mock(access_token='token', expires_at=time.time() + 3600)
+        client.auth.sign_in_with_password = AsyncMock(return_value=auth_response)
+        client.auth.sign_out = AsyncMock()
+
+        session = AsyncBackendSession('test_email', 'test_password', 'https://test.com', 'test_key')
+        session._client = client
+
+        async def use():
+            async with session.database():
+                await asyncio.sleep(0)
+
+        await asyncio.gather(*[use() for _ in range(5)])
+
+        client.auth.sign_in_with_password.assert_awaited_once()
+        client.auth.sign_out.assert_not_awaited()
+
+    async def test_logout_resets_clients(self):
+        """
+        Test that the logout makes the database and storage clients anonymous again.
+        """
+        client = MagicMock()
+        client.auth.sign_out = AsyncMock()
+        client.storage._client.headers = {'Authorization': 'Bearer token'}
+
+        session = AsyncBackendSession('test_email', 'test_password', 'https://test.com', 'test_key')
+        session._client = client
+        session._session = Mock(access_token='token', expires_at=time.time() + 3600)
+        await session.logout()
+
+        client.postgrest.auth.assert_called_with('test_key')
+        assert client.storage._client.headers['Authorization'] == 'Bearer test_key'
+        assert session._session is None
+
+    async def test_concurrent_refresh(self):
+        """
+        Test that concurrent refreshes wait for each other and never reuse a refresh token.
+        """
+        used = []
+
+        async def refresh_session(refresh_token):
+            used.append(refresh_token)
+            await asyncio.sleep(0)
+            response = Mock()
+            response.session = Mock(access_token='token', refresh_token=f"refresh_{len(used)}", expires_at=time.time() + 3600)
+            return response
+
+        client = MagicMock()
+        client.auth.refresh_session = refresh_session
+
+        session = AsyncBackendSession('test_email', 'test_password', 'https://test.com', 'test_key')
+        session._client = client
+        session._session = Mock(access_token='token', refresh_token='refresh_0', expires_at=time.time() - 1)
+
+        await asyncio.gather(session.refresh(), session.refresh(), session.ensure_session())
+
+        # the waiting session was refreshed by then
+        assert used == ['refresh_0', 'refresh_1']
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -1,15 +1,17 @@
 import unittest
-from unittest.mock import Mock, patch, mock_open
+from unittest.mock import MagicMock, Mock, patch, mock_open
 import json
 
 from tensorage.auth import link_to, login, signup, SUPA_FILE, _get_auth_info
 from tensorage.store import TensorStore
+from tensorage.session import BackendSession
 
 backend_config = dict(SUPABASE_URL='https://test.com', SUPABASE_KEY='test_key')
 backend_config_json = json.dumps(backend_config)
 
 # when running tests, remove stuff loaded from local .env files
 import os
+import time
 if 'SUPABASE_URL' in os.environ:
     os.environ.pop('SUPABASE_URL')
 if 'SUPABASE_KEY' in os.environ:
@@ -105,3 +107,70 @@ class TestBackendSession(unittest.TestCase):
         # assert backend_url and backend_key
         self.assertEqual(backend_url, backend_config['SUPABASE_URL'])
         self.assertEqual(backend_key, backend_config['SUPABASE_KEY'])
+
+
+class TestSessionReuse(unittest.TestCase):
+    def setUp(self):
+        # mock a client that returns a session valid for one hour
+        self.client = MagicMock()
+        self.auth_response = Mock()
+        self.auth_response.session = Mock(access_token='test_access_token', refresh_token='test_refresh_token', expires_at=time.time() + 3600)
+        self.client.auth.sign_in_with_password.return_value = self.auth_response
+
+        # create the session and inject the client
+        self.session = BackendSession('test_email', 'test_password', 'https://test.com', 'test_key')
+        self.session._client = self.client
+
+    @patch('tensorage.session.DatabaseContext')
+    def test_contexts_borrow_session(self, context):
+        """
+        Test that consecutive contexts sign in only once and never sign out.
+        """
+        with self.session.database():
+            pass
+        with self.session.database():
+            pass
+
+        # assert there was only one login and no logout
+        self.client.auth.sign_in_with_password.assert_called_once()
+        self.client.auth.sign_out.assert_not_called()
+        self.client.auth.refresh_session.assert_not_called()
+
+    def test_refresh_before_expiry(self):
+        """
+        Test that the token is refreshed, once it is about to expire.
+        """
+        self.session.ensure_session()
+
+        # let the token expire within the refresh margin
+        self.session._session.expires_at = time.time() + self.session.refresh_margin / 2
+        refresh_response = Mock()
+        refresh_response.session = Mock(access_token='new_access_token', expires_at=time.time() + 3600)
+        self.client.auth.refresh_session.return_value = refresh_response
+
+        session = self.session.ensure_session()
+
+        # assert the token was refreshed instead of signing in again
+        self.client.auth.refresh_session.assert_called_once_with('test_refresh_token')
+        self.client.auth.sign_in_with_password.assert_called_once()
+        self.assertEqual(session.access_token, 'new_access_token')
+
+    def test_logout_resets_session(self):
+        """
+        Test that the logout signs out and the next context signs in again.
+        """
+        self.session.ensure_session()
+
+        # storage contexts authorize the storage client with the user token
+        self.client.storage._client.headers = {'Authorization': 'Bearer test_access_token'}
+        self.session.logout()
+
+        # assert the session was forgotten and both clients are anonymous again
+        self.client.auth.sign_out.assert_called_once()
+        self.client.postgrest.auth.assert_called_with('test_key')
+        self.assertEqual(self.client.storage._client.headers['Authorization'], 'Bearer test_key')
+        self.assertIsNone(self.session._session)
+
+        # the next call logs in again
+        self.session.ensure_session()
+        self.assertEqual(self.client.auth.sign_in_with_password.call_count, 2)
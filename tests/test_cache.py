@@ -0,0 +1,136 @@
+import unittest
+from unittest.mock import patch
+
+import numpy as np
+
+from tensorage.cache import ChunkCache, MetadataCache
+from tensorage.types import Dataset
+
+
+class TestChunkCache(unittest.TestCase):
+    def setUp(self) -> None:
+        self.foo = Dataset(1, 'foo', [30, 10], 2, 'float32', False)
+        self.bar = Dataset(2, 'bar', [30, 10], 2, 'float32', False)
+        self.row = np.ones(10, dtype=np.float32)
+        return super().setUp()
+
+    def test_hit_and_miss(self):
+        """
+        Test that the counters track hits and misses.
+        """
+        cache = ChunkCache(max_bytes=1000)
+
+        assert cache.get(self.foo, 1) is None
+        cache.put(self.foo, 1, self.row)
+        np.testing.assert_array_equal(cache.get(self.foo, 1), self.row)
+
+        info = cache.info()
+        assert info['hits'] == 1
+        assert info['misses'] == 1
+        assert info['rows'] == 1
+        assert info['nbytes'] == self.row.nbytes
+
+    def test_lru_eviction(self):
+        """
+        Test that the least recently used rows are evicted once the byte budget is exceeded.
+        """
+        # room for two rows
+        cache = ChunkCache(max_bytes=2 * self.row.nbytes)
+
+        cache.put(self.foo, 1, self.row)
+        cache.put(self.foo, 2, self.row)
+
+        # use the first row, so that the second one is evicted
+        cache.get(self.foo, 1)
+        cache.put(self.foo, 3, self.row)
+
+        assert cache.get(self.foo, 1) is not None
+        assert cache.get(self.foo, 2) is None
+        assert cache.get(self.foo, 3) is not None
+        assert cache.nbytes == 2 * self.row.nbytes
+
+        # rows larger than the cache are never stored
+        cache.put(self.foo, 4, np.ones(100, dtype=np.float32))
+        assert cache.get(self.foo, 4) is None
+
+    def test_owned_rows(self):
+        """
+        Test that rows are not stored as views into the fetched batch.
+        """
+        batch = np.ones((100, 10), dtype=np.float32)
+        cache = ChunkCache(max_bytes=1000)
+        cache.put(self.foo, 1, batch[0])
+
+        row = cache.get(self.foo, 1)
+        assert not np.shares_memory(row, batch)
+        assert row.base is None
+
+    def test_invalidate(self):
+        """
+        Test that invalidating a key only removes the rows of that dataset.
+        """
+        cache = ChunkCache(max_bytes=1000)
+        cache.put(self.foo, 1, self.row)
+        cache.put(self.bar, 1, self.row)
+
+        cache.invalidate('foo')
+
+        assert cache.get(self.foo, 1) is None
+        assert cache.get(self.bar, 1) is not None
+        assert cache.nbytes == self.row.nbytes
+
+        # clear everything
+        cache.clear()
+        assert cache.info()['rows'] == 0
+        assert cache.hits == 0
+
+
+class TestMetadataCache(unittest.TestCase):
+    def test_ttl_expiry(self):
+        """
+        Test that datasets and keys expire after the TTL.
+        """
+        cache = MetadataCache(ttl=10)
+        dataset = Dataset(1, 'foo', [30, 10], 2, 'float32', False)
+
+        with patch('tensorage.cache.time.monotonic', return_value=100.0):
+            cache.put_dataset(dataset)
+            cache.put_keys(['foo'])
+
+        with patch('tensorage.cache.time.monotonic', return_value=105.0):
+            assert cache.get_dataset('foo') == dataset
+            assert cache.get_keys() == ['foo']
+
+        with patch('tensorage.cache.time.monotonic', return_value=111.0):
+            assert cache.get_dataset('foo') is None
+            assert cache.get_keys() is None
+
+    def test_write_through(self):
+        """
+        Test that added and removed keys are written through to the cached keys.
+        """
+        cache = MetadataCache(ttl=10)
+        cache.put_keys(['foo'])
+        cache.put_dataset(Dataset(1, 'foo', [30, 10], 2, 'float32', False))
+
+        cache.add_key('bar')
+        assert cache.get_keys() == ['foo', 'bar']
+
+        cache.remove_key('foo')
+        assert cache.get_keys() == ['bar']
+        assert cache.get_dataset('foo') is None
+
+    def test_disabled(self):
+        """
+        Test that a TTL of 0 disables the cache.
+        """
+        cache = MetadataCache(ttl=0)
+        cache.put_keys(['foo'])
+        cache.put_dataset(Dataset(1, 'foo', [30, 10], 2, 'float32', False))
+
+        assert cache.get_keys() is None
+        assert cache.get_dataset('foo') is None
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,74 @@
+import unittest
+import zlib
+
+import numpy as np
+
+from tensorage.codecs import Codec, encode_chunks, decode_chunks
+
+
+class TestCodecs(unittest.TestCase):
+    def setUp(self) -> None:
+        # a smooth field compresses well
+        self.field = np.cumsum(np.random.random((50, 20, 20)), axis=0).astype(np.float32)
+        return super().setUp()
+
+    def test_spec(self):
+        """
+        Test parsing and formatting of codec specs.
+        """
+        codec = Codec.from_spec('shuffle+zlib:9')
+        assert codec == Codec(name='zlib', level=9, shuffle=True)
+        assert codec.spec == 'shuffle+zlib:9'
+        assert Codec.from_spec('lzma').spec == 'lzma'
+
+        with self.assertRaises(ValueError):
+            Codec.from_spec('snappy')
+        with self.assertRaises(ValueError):
+            Codec.from_spec('zlib:fast')
+
+    def test_roundtrip(self):
+        """
+        Test that all standard library codecs decode what they encoded.
+        """
+        for spec in ('zlib', 'lzma', 'shuffle+zlib', 'shuffle+lzma:1'):
+            codec = Codec.from_spec(spec)
+            buf = codec.encode(self.field)
+            np.testing.assert_array_equal(codec.decode(buf, self.field.shape), self.field)
+
+    def test_shuffle_improves_ratio(self):
+        """
+        The byte-shuffle makes smooth fields compress better.
+        """
+        plain = len(Codec.from_spec('zlib').encode(self.field))
+        shuffled = len(Codec.from_spec('shuffle+zlib').encode(self.field))
+        assert shuffled < plain
+
+    def test_zstd_optional(self):
+        """
+        The zstd codec needs the zstandard package.
+        """
+        try:
+            import zstandard  # noqa: F401
+        except ImportError:
+            with self.assertRaises(ImportError):
+                Codec.from_spec('zstd').encode(self.field)
+        else:  # pragma: no cover
+            codec = Codec.from_spec('shuffle+zstd')
+            np.testing.assert_array_equal(codec.decode(codec.encode(self.field), self.field.shape), self.field)
+
+    def test_chunks_in_pool(self):
+        """
+        Encoding and decoding many chunks keeps the order.
+        """
+        codec = Codec.from_spec('shuffle+zlib')
+        chunks = [self.field[i] for i in range(len(self.field))]
+
+        buffers = encode_chunks(codec, chunks)
+        assert zlib.decompress(buffers[0]) is not None
+
+        decoded = decode_chunks(codec, buffers, [c.shape for c in chunks])
+        np.testing.assert_array_equal(np.stack(decoded), self.field)
+
+
+if __name__ == '__main__':
+    unittest.main()
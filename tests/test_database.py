@@ -1,8 +1,10 @@
 import unittest
 from unittest.mock import MagicMock, Mock
 
+import base64
+
 from postgrest.exceptions import APIError
-from tensorage.backend.database import DatabaseContext
+from tensorage.backend.database import DatabaseContext, encode_float4
 import numpy as np
 
 
@@ -18,7 +20,7 @@ class TestDatabaseContext(unittest.TestCase):
         mock_dataset_response = MagicMock()
         mock_dataset_response.data = [{'id': 1, 'key': 'test', 'shape': [1, 2, 3], 'ndim': 3, 'is_shared': False, 'type': 'float32'}]
         tensor_mock = MagicMock()
-        tensor_mock.data = [{'tensor': np.random.random((1, 2, 3)).astype(np.float32)}]
+        tensor_mock.data = [{'tensor': base64.b64encode(np.random.random((1, 2, 3)).astype('>f4').tobytes()).decode(), 'shape': [1, 2, 3]}]
 
         # mock insert and select method
         self.mock_backend.client.table.return_value.select.return_value.eq.return_value.execute.return_value = mock_dataset_response
@@ -80,6 +82,45 @@ class TestDatabaseContext(unittest.TestCase):
 
         self.assertTrue(return_val)
 
+    def test_insert_tensor_binary(self):
+        # create two chunks
+        data = [np.random.random((2, 3)), np.random.random((2, 3))]
+
+        # call the insert tensor method
+        self.db_context.insert_tensor(data_id=42, data=data, offset=10)
+
+        # get the payload passed to the database function
+        name, params = self.mock_backend.client.rpc.call_args[0]
+        self.assertEqual(name, 'tensor_float4_insert')
+        self.assertEqual(params['index_offset'], 10)
+        self.assertEqual(params['dims'], [2, 3])
+
+        # assert the buffers decode to the original float32 data
+        for expected, encoded in zip(data, params['tensors']):
+            decoded = np.frombuffer(base64.b64decode(encoded), dtype='<f4').reshape(2, 3)
+            np.testing.assert_array_equal(decoded, expected.astype(np.float32))
+
+    def test_encode_float4_payload(self):
+        # the binary payload is much smaller than the JSON float array
+        chunk = np.random.random((100, 100))
+        self.assertEqual(len(base64.b64decode(encode_float4(chunk))), chunk.size * 4)
+
+    def test_insert_tensor_json_fallback(self):
+        # mock a database without the binary insert function
+        def raise_api_error(*args):
+            raise APIError({'message': 'Could not find the function', 'code': 'PGRST202'})
+
+        mock_backend = MagicMock()
+        mock_backend.client.rpc.return_value.execute.side_effect = raise_api_error
+
+        # call the insert tensor method
+        db_context = DatabaseContext(mock_backend)
+        db_context.insert_tensor(data_id=42, data=[np.ones((2, 3))])
+
+        # assert the JSON insert was used
+        rows = mock_backend.client.table.return_value.insert.call_args[0][0]
+        self.assertEqual(rows[0]['tensor'], np.ones((2, 3)).tolist())
+
     def test_insert_tensor_exception(self):
         # create a mock APIError that will be raised when the insert does not work
         def raise_api_error():
@@ -87,7 +128,7 @@ class TestDatabaseContext(unittest.TestCase):
 
         # here we need an extra backend to mock the APIError
         mock_backend = MagicMock()
-        mock_backend.client.table.return_value.insert.return_value.execute.side_effect = raise_api_error
+        mock_backend.client.rpc.return_value.execute.side_effect = raise_api_error
 
         # create a DatabaseContext instance and call the insert_tensor method
         db_context = DatabaseContext(mock_backend)
@@ -104,6 +145,50 @@ class TestDatabaseContext(unittest.TestCase):
         # assert it is an array
         self.assertTrue(isinstance(response, np.ndarray))
         self.assertEqual(response.shape, (1, 2, 3))
+        self.assertEqual(response.dtype, np.float32)
+
+    def test_get_tensor_decode(self):
+        # mock the packed buffer of the database
+        data = np.arange(24, dtype=np.float32).reshape(4, 2, 3)
+        response = MagicMock()
+        response.data = [{'tensor': base64.b64encode(data.astype('>f4').tobytes()).decode(), 'shape': [4, 2, 3]}]
+        self.mock_backend.client.rpc.return_value.execute.return_value = response
+
+        # call the get tensor method
+        tensor = self.db_context.get_tensor(key='test', index_low=1, index_up=5, slice_low=[1, 1], slice_up=[2, 3])
+
+        # assert the binary function was used and the data is decoded correctly
+        self.assertEqual(self.mock_backend.client.rpc.call_args[0][0], 'tensor_float4_slice_binary')
+        np.testing.assert_array_equal(tensor, data)
+
+    def test_get_tensor_out(self):
+        # mock the packed buffer of the database
+        data = np.arange(24, dtype=np.float32).reshape(4, 2, 3)
+        response = MagicMock()
+        response.data = [{'tensor': base64.b64encode(data.astype('>f4').tobytes()).decode(), 'shape': [4, 2, 3]}]
+        self.mock_backend.client.rpc.return_value.execute.return_value = response
+
+        # decode into every other row of a buffer
+        buffer = np.zeros((8, 2, 3), dtype=np.float32)
+        tensor = self.db_context.get_tensor(key='test', index_low=1, index_up=5, slice_low=[1, 1], slice_up=[2, 3], out=buffer[::2])
+
+        self.assertTrue(np.shares_memory(tensor, buffer))
+        np.testing.assert_array_equal(buffer[::2], data)
+        np.testing.assert_array_equal(buffer[1::2], 0)
+
+        with self.assertRaises(ValueError):
+            self.db_context.get_tensor(key='test', index_low=1, index_up=5, slice_low=[1, 1], slice_up=[2, 3], out=buffer)
+
+    def test_get_tensor_empty(self):
+        # mock an empty slice
+        response = MagicMock()
+        response.data = [{'tensor': None, 'shape': [0]}]
+        self.mock_backend.client.rpc.return_value.execute.return_value = response
+
+        # call the get tensor method
+        tensor = self.db_context.get_tensor(key='test', index_low=5, index_up=5, slice_low=[1, 1], slice_up=[2, 3])
+
+        self.assertEqual(tensor.shape, (0, 2, 3))
 
     def test_get_dataset_keys(self):
         # crate mocked dataset keys
@@ -141,8 +226,9 @@ class TestDatabaseContext(unittest.TestCase):
         # call the append tensor method
         db.append_tensor(key='test', data=[np.random.random((16, 2, 3)).astype(np.float32)])
 
-        # make sure the client.table.insert method was called the exact amount of times
-        self.assertEquals(len(mock_backend.client.table.return_value.insert.mock_calls), 4)
+        # make sure the binary insert function was called the exact amount of times
+        self.assertEqual(mock_backend.client.rpc.call_count, 2)
+        self.assertEqual(mock_backend.client.rpc.call_args[0][0], 'tensor_float4_insert')
 
         # make sure the update function was called with the correct shape
         mock_backend.client.table.return_value.update.assert_called_once_with({'shape': (26, 2, 3)})
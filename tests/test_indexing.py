@@ -0,0 +1,183 @@
+import unittest
+from unittest.mock import MagicMock, patch
+import base64
+
+import numpy as np
+from postgrest.exceptions import APIError
+
+from tensorage.backend.database import DatabaseContext
+from tensorage.indexing import contiguous_runs, resolve_selection
+from tensorage.session import LocalSession
+from tensorage.store import TensorStore
+
+
+# the keys are compared against numpy
+KEYS = [
+    (),
+    (slice(None, None, 3), ),
+    (slice(-5, None), ),
+    (slice(None, None, -2), 1),
+    (Ellipsis, -1),
+    (None, slice(2, 5)),
+    (slice(3, 20, 4), slice(1, None, 2), slice(None, None, -3)),
+    (-1, Ellipsis, None),
+    (slice(5, 5), ),
+    (slice(10, 2), 3),
+    ([3, 1, 3, 25], ),
+    (np.arange(30) % 4 == 0, slice(1, 4)),
+    (slice(2, 9), [4, 0]),
+    ([[1, 2], [5, 6]], -1),
+    ([1, 5], [2, 3]),
+    ([2, 7], slice(None), [0, 4]),
+    (np.array([-1, 0]), slice(None, None, 2)),
+    ([], ),
+]
+
+
+class TestIndexing(unittest.TestCase):
+    def setUp(self) -> None:
+        self.data = np.random.random((30, 6, 5)).astype(np.float32)
+        return super().setUp()
+
+    def test_resolve_selection(self):
+        """
+        The selection holds the bounding box in database indices and the steps.
+        """
+        sel = resolve_selection((slice(None, None, 3), 2), (30, 6, 5))
+        assert sel.index == [1, 29]
+        assert sel.slices == [[3, 3], [1, 5]]
+        assert sel.steps == [3, 1, 1]
+        assert sel.box_shape == (10, 1, 5)
+
+        # negative steps load the same elements ascending
+        sel = resolve_selection((slice(None, 3, -2), ), (30, 6, 5))
+        assert sel.index == [6, 31]
+        assert sel.flip == [True, False, False]
+
+        # plain slices have no steps
+        assert resolve_selection((slice(2, 4), ), (30, 6, 5)).steps is None
+
+        with self.assertRaises(IndexError):
+            resolve_selection((30, ), (30, 6, 5))
+        with self.assertRaises(IndexError):
+            resolve_selection((0, 0, 0, 0), (30, 6, 5))
+        with self.assertRaises(IndexError):
+            resolve_selection((Ellipsis, Ellipsis), (30, 6, 5))
+        with self.assertRaises(KeyError):
+            resolve_selection((0, 'a'), (30, 6, 5))
+        with self.assertRaises(KeyError):
+            resolve_selection(([0.5], ), (30, 6, 5))
+        with self.assertRaises(IndexError):
+            resolve_selection(([0, 30], ), (30, 6, 5))
+        with self.assertRaises(IndexError):
+            resolve_selection((np.ones(5, dtype=bool), ), (30, 6, 5))
+
+        # array indices load the unique rows only
+        sel = resolve_selection(([7, -1, 7], ), (30, 6, 5))
+        assert sel.rows == [8, 30]
+        assert sel.box_shape == (2, 6, 5)
+
+    def test_contiguous_runs(self):
+        """
+        Sorted indices are grouped into runs of indices, which are step apart.
+        """
+        assert contiguous_runs([1, 2, 3, 7, 9, 10]) == [(1, 4), (7, 8), (9, 11)]
+        assert contiguous_runs([1, 4, 7, 9], step=3) == [(1, 8), (9, 10)]
+        assert contiguous_runs([]) == []
+
+    def test_store_indexing(self):
+        """
+        Reads of rows, tiles and cached rows follow numpy basic indexing.
+        """
+        for kwargs in (dict(), dict(chunk_shape=(7, 4, 5)), dict(cache_size=2**20)):
+            store = TensorStore(LocalSession(), engine='local', quiet=True, **kwargs)
+            store['foo'] = self.data
+
+            for key in KEYS:
+                expected = self.data[key]
+                actual = store[('foo', *key)]
+                assert actual.shape == expected.shape, (kwargs, key)
+                np.testing.assert_array_equal(actual, expected)
+
+    def test_store_fancy_indexing(self):
+        """
+        Integer arrays and boolean masks on the local database follow numpy, for rows, tiles and cached rows.
+        """
+        rows = np.array([17, 2, 2, -1, 9])
+        mask = self.data[:, 0, 0] > 0.5
+        inner_mask = np.array([True, False, True, True, False, True])
+        keys = [
+            (rows, ),
+            (mask, ),
+            (rows, slice(1, 5), 3),
+            (mask, 2),
+            ([3, 8, 1, 0], inner_mask),
+            (slice(None, None, 2), [5, 0, 5]),
+            (rows.reshape(1, 5), Ellipsis, [[-1], [0]]),
+            (Ellipsis, np.arange(5) % 2 == 1),
+        ]
+
+        for kwargs in (dict(), dict(chunk_shape=(4, 3, 5)), dict(cache_size=2**20), dict(read_bytes=6 * 5 * 4 * 3)):
+            store = TensorStore(LocalSession(), engine='local', quiet=True, **kwargs)
+            store['foo'] = self.data
+
+            # the cache holds some of the rows, so that the others are loaded
+            store['foo', 5:12]
+
+            for key in keys:
+                np.testing.assert_array_equal(store.foo[key], self.data[key], err_msg=str(kwargs))
+                np.testing.assert_array_equal(store[('foo', *key)], self.data[key], err_msg=str(kwargs))
+
+            # served entirely from the cache on the second read
+            np.testing.assert_array_equal(store.foo[rows], self.data[rows])
+            if store.cache is not None:
+                assert store.cache.hits > 0
+
+    def test_take_single_request(self):
+        """
+        The rows of an array index are loaded in a single request.
+        """
+        backend = MagicMock()
+        rows = np.random.random((3, 6, 5)).astype('>f4')
+        backend.client.rpc.return_value.execute.return_value.data = [{'tensor': base64.b64encode(rows.tobytes()).decode(), 'shape': [3, 6, 5]}]
+
+        db = DatabaseContext(backend)
+        np.testing.assert_array_equal(db.take_tensor('foo', [2, 8, 21], [1, 1], [6, 5]), rows)
+        backend.client.rpc.assert_called_once_with('tensor_float4_take', {'name': 'foo', 'indices': [2, 8, 21], 'slice_low': [1, 1], 'slice_up': [6, 5]})
+
+        # the store requests the unique rows and restores the requested order
+        store = TensorStore(LocalSession(), engine='local', quiet=True)
+        store['foo'] = self.data
+        with patch('tensorage.backend.local.LocalContext.get_tensor') as get_tensor:
+            np.testing.assert_array_equal(store['foo', [20, 1, 20, 7]], self.data[[20, 1, 20, 7]])
+            get_tensor.assert_not_called()
+
+        # array indices are reduced along their own axis
+        np.testing.assert_allclose(store.reduce('foo', 'mean', axis=0, slices=([20, 1, 20, 7], )), self.data[[20, 1, 20, 7]].mean(axis=0), rtol=1e-5)
+
+    def test_database_strided(self):
+        """
+        Strided slices are loaded by the database and strided locally on outdated schemas.
+        """
+        backend = MagicMock()
+        strided = np.random.random((5, 3, 5)).astype('>f4')
+        backend.client.rpc.return_value.execute.return_value.data = [{'tensor': base64.b64encode(strided.tobytes()).decode(), 'shape': [5, 3, 5]}]
+
+        db = DatabaseContext(backend)
+        np.testing.assert_array_equal(db.get_tensor('foo', 1, 30, [1, 1], [6, 5], step=[6, 2, 1]), strided)
+        backend.client.rpc.assert_called_with('tensor_float4_slice_strided', {'name': 'foo', 'index_low': 1, 'index_up': 30, 'slice_low': [1, 1], 'slice_up': [6, 5], 'steps': [6, 2, 1]})
+
+        # an outdated schema strides the full slice
+        def rpc(name, params):
+            if name == 'tensor_float4_slice_strided':
+                raise APIError({'message': 'not found', 'code': 'PGRST202'})
+            mock = MagicMock()
+            mock.execute.return_value.data = [{'tensor': base64.b64encode(self.data.astype('>f4').tobytes()).decode(), 'shape': list(self.data.shape)}]
+            return mock
+        backend.client.rpc.side_effect = rpc
+
+        np.testing.assert_array_equal(db.get_tensor('foo', 1, 31, [1, 1], [6, 5], step=[6, 2, 1]), self.data[::6, ::2])
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,110 @@
+import unittest
+import os
+import tempfile
+
+import numpy as np
+
+from tensorage import open_local
+from tensorage.session import LocalSession
+from tensorage.store import TensorStore
+
+
+class TestLocalContext(unittest.TestCase):
+    def setUp(self) -> None:
+        self.store = open_local()
+        self.store.quiet = True
+        self.data = np.random.random((30, 8, 5)).astype(np.float32)
+        return super().setUp()
+
+    def test_roundtrip(self):
+        """
+        Write a dataset into the local database and read it back.
+        """
+        self.store['foo'] = self.data
+
+        assert 'foo' in self.store
+        assert len(self.store) == 1
+        np.testing.assert_array_equal(self.store['foo'], self.data)
+        np.testing.assert_array_equal(self.store.foo[4:9, 2], self.data[4:9, 2])
+        np.testing.assert_array_equal(self.store['foo', :, 3, 1], self.data[:, 3, 1])
+
+        # remove the dataset again
+        del self.store['foo']
+        assert 'foo' not in self.store
+        assert self.store.keys(refresh=True) == []
+
+    def test_append(self):
+        """
+        Appended rows continue the first axis.
+        """
+        self.store['foo'] = self.data[:20]
+        self.store.append('foo', self.data[20:])
+
+        assert self.store.get_dataset('foo').shape == [30, 8, 5]
+        np.testing.assert_array_equal(self.store['foo'], self.data)
+
+        with self.assertRaises(KeyError):
+            self.store.append('bar', self.data)
+
+    def test_tiled_and_compressed(self):
+        """
+        The tiled layout and compression work on the local database.
+        """
+        store = TensorStore(LocalSession(), engine='local', chunk_shape=(7, 3, 5), compressor='shuffle+zlib', quiet=True)
+        store['foo'] = self.data
+
+        np.testing.assert_array_equal(store['foo'], self.data)
+        np.testing.assert_array_equal(store['foo', 5:17, 4], self.data[5:17, 4])
+
+    def test_read_into(self):
+        """
+        Reads are written into a caller-provided array.
+        """
+        for kwargs in (dict(), dict(chunk_shape=(7, 3, 5)), dict(cache_size=2**20), dict(read_bytes=4 * 8 * 5 * 4)):
+            store = TensorStore(LocalSession(), engine='local', quiet=True, **kwargs)
+            store['foo'] = self.data
+
+            # slices are loaded straight into the buffer
+            buffer = np.zeros((10, 8, 5), dtype=np.float32)
+            assert store.read_into('foo', (slice(10, 20), ), out=buffer) is buffer
+            np.testing.assert_array_equal(buffer, self.data[10:20])
+
+            # a strided view of the buffer
+            staging = np.zeros((20, 8, 5), dtype=np.float32)
+            store.foo.read(slice(None, None, 3), out=staging[:10])
+            np.testing.assert_array_equal(staging[:10], self.data[::3])
+
+            # other selections are copied into the buffer
+            buffer = np.zeros((30, 5), dtype=np.float32)
+            store.foo.read(slice(None, None, -1), 2, out=buffer)
+            np.testing.assert_array_equal(buffer, self.data[::-1, 2])
+
+        with self.assertRaises(ValueError):
+            store.read_into('foo', (slice(0, 5), ), out=np.zeros((4, 8, 5), dtype=np.float32))
+        with self.assertRaises(TypeError):
+            store.read_into('foo', (slice(0, 5), ), out=np.zeros((5, 8, 5)))
+
+    def test_concurrent_stream(self):
+        """
+        Concurrent uploads of a stream share the connection safely.
+        """
+        store = TensorStore(LocalSession(), engine='local', chunk_size=80, max_workers=4, quiet=True)
+        store.write_stream('foo', (self.data[i:i + 4] for i in range(0, 30, 4)), (8, 5))
+
+        np.testing.assert_array_equal(store['foo'], self.data)
+
+    def test_persistent_file(self):
+        """
+        The datasets are persisted in the database file.
+        """
+        with tempfile.TemporaryDirectory() as tmp:
+            path = os.path.join(tmp, 'tensors.db')
+            session = LocalSession(path)
+            session()['foo'] = self.data
+            session.logout()
+
+            np.testing.assert_array_equal(open_local(path)['foo'], self.data)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,77 @@
+import unittest
+
+import numpy as np
+
+from tensorage.metrics import Metrics, OperationEvent, payload_nbytes
+from tensorage.session import LocalSession
+from tensorage.store import TensorStore
+
+
+class TestMetrics(unittest.TestCase):
+    def test_record(self):
+        """
+        Events are summed up per operation and passed to the callbacks.
+        """
+        events = []
+        metrics = Metrics()
+        metrics.add_callback(events.append)
+
+        metrics.record(OperationEvent('get_tensor', 0.5, rows=10, bytes_received=400))
+        metrics.record(OperationEvent('get_tensor', 0.25, rows=5, bytes_received=200, error=True))
+
+        stats = metrics.stats()['get_tensor']
+        assert stats['calls'] == 2
+        assert stats['errors'] == 1
+        assert stats['seconds'] == 0.75
+        assert stats['rows'] == 15
+        assert stats['bytes_received'] == 600
+        assert len(events) == 2
+
+        metrics.reset()
+        assert metrics.stats() == {}
+
+    def test_payload_nbytes(self):
+        """
+        The payload of batches of rows and tiles is counted.
+        """
+        rows = [np.zeros((4, 5), dtype=np.float32) for _ in range(3)]
+        tiles = [((0, 0), np.zeros((2, 2), dtype=np.float32)), ((0, 1), np.zeros((2, 1), dtype=np.float32))]
+
+        assert payload_nbytes(rows) == 3 * 4 * 5 * 4
+        assert payload_nbytes(tiles) == 6 * 4
+        assert payload_nbytes('foo') == 0
+
+    def test_store_stats(self):
+        """
+        The store records the backend operations if metrics are enabled.
+        """
+        store = TensorStore(LocalSession(), engine='local', quiet=True, metrics=True)
+        data = np.random.random((20, 5)).astype(np.float32)
+        store['foo'] = data
+        store['foo', 2:6]
+
+        stats = store.stats()
+        assert stats['insert_tensor']['rows'] == 20
+        assert stats['insert_tensor']['bytes_sent'] == data.nbytes
+        assert stats['get_tensor']['rows'] == 4
+        assert stats['get_tensor']['bytes_received'] == 4 * 5 * 4
+        assert stats['session']['calls'] >= 2
+
+        # failing operations are counted as errors
+        with self.assertRaises(KeyError):
+            store['bar']
+        assert store.stats()['get_dataset']['errors'] == 1
+
+    def test_store_stats_disabled(self):
+        """
+        Without metrics, the contexts are not wrapped and there are no stats.
+        """
+        store = TensorStore(LocalSession(), engine='local', quiet=True)
+        store['foo'] = np.ones((3, 3))
+
+        assert store.metrics is None
+        assert store.stats() == {}
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,81 @@
+import unittest
+from unittest.mock import MagicMock
+import tempfile
+import os
+
+import numpy as np
+
+from tensorage.store import TensorStore
+from tensorage.types import Dataset
+
+
+class TestMirror(unittest.TestCase):
+    def setUp(self) -> None:
+        # create the backend serving a remote dataset
+        self.backend = MagicMock()
+        self.db = self.backend.database.return_value.__enter__.return_value
+        self.db.list_dataset_keys.return_value = ['foo']
+
+        self.remote = np.random.random((30, 4, 3)).astype(np.float32)
+        self.db.get_dataset.side_effect = lambda key: Dataset(1, 'foo', list(self.remote.shape), 3, 'float32', False)
+        self.db.get_tensor.side_effect = lambda key, low, up, slice_low, slice_up: self.remote[low - 1:up - 1]
+
+        self.tmp = tempfile.TemporaryDirectory()
+        self.path = os.path.join(self.tmp.name, 'foo.f4')
+        return super().setUp()
+
+    def tearDown(self) -> None:
+        self.tmp.cleanup()
+        return super().tearDown()
+
+    def test_mirror_and_read(self):
+        """
+        Mirror a dataset and read it through the slicer API without requests.
+        """
+        store = TensorStore(self.backend, chunk_size=60)
+        local = store.mirror('foo', self.path)
+
+        # 5 rows per request
+        assert self.db.get_tensor.call_count == 6
+        assert os.path.exists(f"{self.path}.json")
+
+        # reading does not hit the backend
+        self.db.get_tensor.reset_mock()
+        np.testing.assert_array_equal(local[2:8, 1], self.remote[2:8, 1])
+        np.testing.assert_array_equal(np.concatenate(list(local.iter_batches(7))), self.remote)
+        self.db.get_tensor.assert_not_called()
+
+    def test_incremental_pull(self):
+        """
+        Only the appended rows are pulled, also by a new store after a restart.
+        """
+        TensorStore(self.backend, chunk_size=60).mirror('foo', self.path)
+
+        # append rows to the remote dataset
+        self.remote = np.concatenate([self.remote, np.ones((4, 4, 3), dtype=np.float32)])
+        self.db.get_tensor.reset_mock()
+
+        local = TensorStore(self.backend, chunk_size=60).mirror('foo', self.path)
+        self.db.get_tensor.assert_called_once()
+        assert self.db.get_tensor.call_args[0][1:3] == (31, 35)
+        np.testing.assert_array_equal(local[:], self.remote)
+
+        # nothing new to pull
+        assert local.pull() == 0
+
+    def test_replaced_dataset(self):
+        """
+        A replaced remote dataset is downloaded again.
+        """
+        store = TensorStore(self.backend, chunk_size=60)
+        local = store.mirror('foo', self.path)
+
+        self.remote = np.zeros((3, 4, 3), dtype=np.float32)
+        self.db.get_dataset.side_effect = lambda key: Dataset(2, 'foo', list(self.remote.shape), 3, 'float32', False)
+
+        assert local.pull() == 3
+        np.testing.assert_array_equal(local[:], self.remote)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,89 @@
+import unittest
+from unittest.mock import MagicMock
+import base64
+
+import numpy as np
+from postgrest.exceptions import APIError
+
+from tensorage.backend.database import DatabaseContext
+from tensorage.reduce import normalize_axis, reduce_array
+from tensorage.session import LocalSession
+from tensorage.store import TensorStore
+
+
+class TestReduce(unittest.TestCase):
+    def setUp(self) -> None:
+        self.data = np.random.random((30, 6, 5)).astype(np.float32)
+        return super().setUp()
+
+    def test_normalize_axis(self):
+        """
+        Axes are sorted and negative axes count from the end.
+        """
+        assert normalize_axis(None, 3) == [0, 1, 2]
+        assert normalize_axis(-1, 3) == [2]
+        assert normalize_axis((2, 0), 3) == [0, 2]
+
+        with self.assertRaises(ValueError):
+            normalize_axis(3, 3)
+        with self.assertRaises(ValueError):
+            normalize_axis((1, -2), 3)
+
+    def test_reduce_array(self):
+        """
+        The local reduction follows numpy and rejects empty selections.
+        """
+        np.testing.assert_allclose(reduce_array(self.data, 'mean', [0]), self.data.mean(axis=0), rtol=1e-6)
+        assert reduce_array(self.data, 'max', None).shape == ()
+
+        with self.assertRaises(ValueError):
+            reduce_array(self.data, 'median', [0])
+        with self.assertRaises(ValueError):
+            reduce_array(self.data[:0], 'sum', [0])
+
+    def test_store_reduce(self):
+        """
+        Reduce datasets in rows and tiles of the local database.
+        """
+        for chunk_shape in (None, (7, 3, 5)):
+            store = TensorStore(LocalSession(), engine='local', quiet=True, chunk_shape=chunk_shape)
+            store['foo'] = self.data
+
+            np.testing.assert_allclose(store.reduce('foo', 'mean', axis=0), self.data.mean(axis=0), rtol=1e-5)
+            np.testing.assert_allclose(store.reduce('foo', 'std', axis=(1, 2)), self.data.std(axis=(1, 2)), rtol=1e-5)
+            np.testing.assert_allclose(store.reduce('foo', 'sum'), self.data.sum(), rtol=1e-5)
+            np.testing.assert_allclose(store.reduce('foo', 'min', axis=0, slices=(slice(5, 10), slice(1, 3))), self.data[5:10, 1:3].min(axis=0))
+
+        with self.assertRaises(ValueError):
+            store.reduce('foo', 'median')
+
+    def test_database_reduce(self):
+        """
+        The database context reduces in the database and falls back to a local reduction.
+        """
+        backend = MagicMock()
+        response = MagicMock()
+        reduced = np.random.random((6, 5)).astype('>f4')
+        response.data = [{'tensor': base64.b64encode(reduced.tobytes()).decode(), 'shape': [6, 5]}]
+        backend.client.rpc.return_value.execute.return_value = response
+
+        db = DatabaseContext(backend)
+        result = db.reduce_tensor('foo', 'mean', [0], 1, 31, [1, 1], [6, 5])
+
+        np.testing.assert_array_equal(result, reduced)
+        backend.client.rpc.assert_called_with('tensor_float4_reduce', {'name': 'foo', 'op': 'mean', 'axis': [0], 'index_low': 1, 'index_up': 31, 'slice_low': [1, 1], 'slice_up': [6, 5]})
+
+        # an outdated schema reduces the loaded slice
+        def rpc(name, params):
+            if name == 'tensor_float4_reduce':
+                raise APIError({'message': 'not found', 'code': 'PGRST202'})
+            mock = MagicMock()
+            mock.execute.return_value.data = [{'tensor': base64.b64encode(self.data.astype('>f4').tobytes()).decode(), 'shape': list(self.data.shape)}]
+            return mock
+        backend.client.rpc.side_effect = rpc
+
+        np.testing.assert_allclose(db.reduce_tensor('foo', 'max', [0, 2], 1, 31, [1, 1], [6, 5]), self.data.max(axis=(0, 2)))
+
+
+if __name__ == '__main__':
+    unittest.main()
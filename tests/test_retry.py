@@ -0,0 +1,146 @@
+import unittest
+from unittest.mock import MagicMock
+
+import httpx
+import numpy as np
+from postgrest.exceptions import APIError
+
+from tensorage.retry import RetryPolicy, classify, may_have_committed
+from tensorage.store import TensorStore
+from tensorage.types import Dataset
+
+
+def api_error(code):
+    return APIError({'message': 'failed', 'code': code})
+
+
+class TestRetryPolicy(unittest.TestCase):
+    def test_classify(self):
+        """
+        Errors are classified by their code.
+        """
+        assert classify(api_error('PGRST301')) == 'auth'
+        assert classify(api_error(413)) == 'split'
+        assert classify(api_error('57014')) == 'split'
+        assert classify(api_error(502)) == 'transient'
+        assert classify(api_error('23505')) == 'duplicate'
+        assert classify(api_error('42P01')) is None
+        assert classify(httpx.ReadTimeout('timeout')) == 'split'
+        assert classify(httpx.ConnectError('refused')) == 'transient'
+        assert classify(RuntimeError('foo')) is None
+
+        # only server errors and timeouts may have been committed
+        assert may_have_committed(api_error(502)) and may_have_committed(api_error(504))
+        assert may_have_committed(httpx.ReadTimeout('timeout'))
+        assert not may_have_committed(api_error(401)) and not may_have_committed(api_error(413))
+
+    def test_backoff(self):
+        """
+        The delay doubles on each retry up to max_backoff.
+        """
+        policy = RetryPolicy(backoff=1.0, max_backoff=5.0)
+        assert 0.5 <= policy.delay(0) <= 1.0
+        assert 2.0 <= policy.delay(2) <= 4.0
+        assert policy.delay(10) <= 5.0
+
+    def test_run(self):
+        """
+        Transient errors are retried until the retries are exhausted.
+        """
+        policy = RetryPolicy(max_retries=2, backoff=0)
+        func = MagicMock(side_effect=[api_error(503), True])
+        assert policy.run(func) is None
+        assert func.call_count == 2
+
+        func = MagicMock(side_effect=api_error(503))
+        with self.assertRaises(APIError):
+            policy.run(func)
+        assert func.call_count == 3
+
+        # other errors are raised right away
+        func = MagicMock(side_effect=api_error('42P01'))
+        with self.assertRaises(APIError):
+            policy.run(func)
+        assert func.call_count == 1
+
+
+class TestStoreRetry(unittest.TestCase):
+    def setUp(self) -> None:
+        self.backend = MagicMock()
+        self.db = self.backend.database.return_value.__enter__.return_value
+        self.data = np.random.random((8, 10))
+        self.db.insert_dataset.return_value = Dataset(1, 'foo', self.data.shape, self.data.ndim, 'float32', False)
+        return super().setUp()
+
+    def test_refresh_on_expired_token(self):
+        """
+        An expired token refreshes the session and the batch is uploaded again.
+        """
+        self.db.insert_tensor.side_effect = [api_error('PGRST301'), True]
+
+        store = TensorStore(self.backend, quiet=True, retry=RetryPolicy(backoff=0))
+        store['foo'] = self.data
+
+        self.backend.refresh.assert_called_once()
+        assert self.db.insert_tensor.call_count == 2
+
+    def test_split_too_large(self):
+        """
+        A batch too large is split in half until it is accepted.
+        """
+        def insert_tensor(data_id, batch, offset=0):
+            if len(batch) > 2:
+                raise api_error(413)
+            uploaded.append((offset, len(batch)))
+            return True
+        uploaded = []
+        self.db.insert_tensor.side_effect = insert_tensor
+
+        store = TensorStore(self.backend, quiet=True, retry=RetryPolicy(backoff=0))
+        store['foo'] = self.data
+
+        assert sorted(uploaded) == [(0, 2), (2, 2), (4, 2), (6, 2)]
+
+    def test_duplicate_after_failure(self):
+        """
+        A batch written by an attempt that timed out is not written again.
+        """
+        self.db.insert_tensor.side_effect = [api_error(502), api_error('23505')]
+
+        store = TensorStore(self.backend, quiet=True, retry=RetryPolicy(backoff=0))
+        store['foo'] = self.data
+
+        assert self.db.insert_tensor.call_count == 2
+
+    def test_duplicate_after_rejection(self):
+        """
+        A duplicate key after a rejected attempt is a real conflict and raised.
+        """
+        self.db.insert_tensor.side_effect = [api_error(401), api_error('23505')]
+
+        store = TensorStore(self.backend, quiet=True, retry=RetryPolicy(backoff=0))
+        with self.assertRaises(APIError):
+            store['foo'] = self.data
+
+        # the halves of a batch too large were not written either
+        self.db.insert_tensor.side_effect = [api_error(413), api_error('23505')]
+        with self.assertRaises(APIError):
+            store['bar'] = self.data
+
+        # unless the batch timed out
+        self.db.insert_tensor.side_effect = [api_error(504), api_error('23505'), True]
+        store['baz'] = self.data
+
+    def test_retry_disabled(self):
+        """
+        Without a retry policy, the first error is raised.
+        """
+        self.db.insert_tensor.side_effect = [api_error(502), True]
+
+        store = TensorStore(self.backend, quiet=True, retry=None)
+        with self.assertRaises(APIError):
+            store['foo'] = self.data
+
+
+if __name__ == '__main__':
+    unittest.main()
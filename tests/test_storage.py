@@ -0,0 +1,92 @@
+import unittest
+from unittest.mock import MagicMock, patch
+
+import numpy as np
+from storage3.utils import StorageException
+
+from tensorage.backend.storage import StorageContext
+
+
+class TestStorageContext(unittest.TestCase):
+    def setUp(self) -> None:
+        self.data = np.random.random((30, 6, 5)).astype(np.float32)
+
+        self.missing = set()
+
+        # each object holds the index of its row, which is decoded into the row
+        def download(path: str) -> bytes:
+            if path == 'foo/dataset.json':
+                return b'{"id": "foo", "key": "foo", "shape": [30, 6, 5], "ndim": 3, "type": "float32", "is_shared": false}'
+            index = int(path.split('index_')[1].split('.')[0])
+            if index > len(self.data) or index in self.missing:
+                raise StorageException({'statusCode': 404, 'error': 'not_found', 'message': 'Object not found'})
+            return str(index).encode()
+
+        self.backend = MagicMock()
+        self.backend.client.storage.from_.return_value.download.side_effect = download
+        self.db = StorageContext(self.backend)
+        return super().setUp()
+
+    def decode(self, content: bytes) -> np.ndarray:
+        return self.data[int(content) - 1]
+
+    def test_get_tensor(self):
+        """
+        Only the objects of the selected rows are downloaded and sliced.
+        """
+        with patch('tensorage.backend.storage.decode_netcdf', side_effect=self.decode):
+            np.testing.assert_array_equal(self.db.get_tensor('foo', 5, 10, [2, 1], [4, 5]), self.data[4:9, 1:4])
+
+            paths = sorted(call.args[0] for call in self.backend.client.storage.from_.return_value.download.call_args_list)
+            assert paths == sorted(['foo/dataset.json', *[f"foo/index_{i}.nc" for i in range(5, 10)]])
+
+            # steps along all axes
+            np.testing.assert_array_equal(self.db.get_tensor('foo', 1, 31, [1, 1], [6, 5], step=[4, 2, 3]), self.data[::4, ::2, ::3])
+
+            # rows past the end of the dataset are not requested
+            download = self.backend.client.storage.from_.return_value.download
+            download.reset_mock()
+            np.testing.assert_array_equal(self.db.get_tensor('foo', 25, 40, [1, 1], [6, 5]), self.data[24:])
+            assert download.call_count == 1 + 6
+
+            # a missing object within the dataset is an error
+            self.missing.add(12)
+            with self.assertRaises(FileNotFoundError):
+                self.db.get_tensor('foo', 10, 15, [1, 1], [6, 5])
+            with self.assertRaises(FileNotFoundError):
+                self.db.get_tensor('foo', 1, 31, [1, 1], [6, 5], out=np.zeros((30, 6, 5), dtype=np.float32))
+            self.missing.clear()
+
+            # the rows are written into the output array
+            out = np.zeros((10, 6, 5), dtype=np.float32)
+            assert self.db.get_tensor('foo', 11, 21, [1, 1], [6, 5], out=out) is out
+            np.testing.assert_array_equal(out, self.data[10:20])
+
+    def test_list_dataset_keys(self):
+        """
+        The dataset keys are the folders of the bucket, listed in pages.
+        """
+        bucket = self.backend.client.storage.from_.return_value
+        folders = [{'name': f"data_{i}", 'id': None} for i in range(1500)]
+        bucket.list.side_effect = lambda path, options: folders[options['offset']:options['offset'] + options['limit']]
+
+        assert self.db.list_dataset_keys() == [f"data_{i}" for i in range(1500)]
+        assert bucket.list.call_count == 2
+
+    def test_append_tensor(self):
+        """
+        Appended rows continue the first axis and update the metadata.
+        """
+        bucket = self.backend.client.storage.from_.return_value
+        bucket.download.side_effect = lambda path: b'{"id": "foo", "key": "foo", "shape": [30, 6, 5], "ndim": 3, "type": "float32", "is_shared": false}'
+
+        with patch('tensorage.backend.storage.encode_netcdf', return_value=b''):
+            self.db.append_tensor('foo', [self.data[:2]])
+
+        paths = [call.args[0] for call in bucket.upload.call_args_list]
+        assert paths == ['foo/index_31.nc', 'foo/index_32.nc', 'foo/dataset.json']
+        assert b'[32, 6, 5]' in bucket.upload.call_args.args[1]
+
+
+if __name__ == '__main__':
+    unittest.main()
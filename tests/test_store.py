@@ -1,10 +1,12 @@
 import unittest
 from unittest.mock import MagicMock, patch
+from concurrent.futures import ThreadPoolExecutor
+import threading
 import warnings
 
 import numpy as np
 
-from tensorage.store import TensorStore, StoreSlicer
+from tensorage.store import GET_MANY_WORKERS, TensorStore, StoreSlicer
 from tensorage.types import Dataset
 
 # when running tests, remove stuff loaded from local .env files
@@ -110,6 +112,70 @@ class TestTensorStore(unittest.TestCase):
         expected_batch_size = int(np.ceil(data.shape[0] / 2))
         assert backend.database.return_value.__enter__.return_value.insert_tensor.call_count == expected_batch_size
 
+    def test_create_tensor_concurrent_batches(self):
+        """
+        Upload the batches with multiple workers and assert that every offset was uploaded once.
+        """
+        # create a mock backend
+        backend = MagicMock()
+
+        # create the store with a small chunk size and multiple workers
+        store = TensorStore(backend, quiet=True, max_workers=4)
+        store.chunk_size = 10 * 10 * 2
+
+        # create the dataset
+        data = np.random.random((30, 10, 10))
+        backend.database.return_value.__enter__.return_value.insert_dataset.return_value = Dataset(15, 'test3', data.shape, data.ndim, 'float32', False)
+
+        # record the uploads thread-safe
+        lock = threading.Lock()
+        uploaded = []
+        def insert_tensor(data_id, batch, offset=0):
+            with lock:
+                uploaded.append((offset, len(batch)))
+            return True
+        backend.database.return_value.__enter__.return_value.insert_tensor.side_effect = insert_tensor
+
+        # create the tensor
+        store['test3'] = data
+
+        # assert all batches were uploaded
+        assert sorted(uploaded) == [(offset, 2) for offset in range(0, 30, 2)]
+
+    def test_concurrent_upload_failure(self):
+        """
+        Make one batch fail and assert that the error is raised and the remaining batches are cancelled.
+        """
+        # create a mock backend
+        backend = MagicMock()
+
+        # create the store with a tiny in-flight limit
+        store = TensorStore(backend, quiet=True, max_workers=2, max_inflight_bytes=1)
+        store.chunk_size = 10 * 10
+
+        # create the dataset
+        data = np.random.random((30, 10, 10))
+        backend.database.return_value.__enter__.return_value.insert_dataset.return_value = Dataset(16, 'test4', data.shape, data.ndim, 'float32', False)
+
+        # fail on the third batch
+        lock = threading.Lock()
+        uploaded = []
+        def insert_tensor(data_id, batch, offset=0):
+            if offset == 2:
+                raise RuntimeError('upload failed')
+            with lock:
+                uploaded.append(offset)
+            return True
+        backend.database.return_value.__enter__.return_value.insert_tensor.side_effect = insert_tensor
+
+        # the first failure is raised
+        with self.assertRaises(RuntimeError) as err:
+            store['test4'] = data
+        assert 'upload failed' in str(err.exception)
+
+        # the batches after the failure were not uploaded
+        assert len(uploaded) < 29
+
     def test_overwrite_dataset(self):
         """
         Mock the backend as if a key already exists and assert that the remove_dataset
@@ -256,7 +322,7 @@ class TestTensorStore(unittest.TestCase):
         data = store['foo']
 
         # make sure the indices were passed correctly
-        backend.database.return_value.__enter__.return_value.get_tensor.assert_called_once_with('foo', 1, 31, [1, 1], [101, 6])
+        backend.database.return_value.__enter__.return_value.get_tensor.assert_called_once_with('foo', 1, 31, [1, 1], [100, 5])
 
         # assert that the data has the correct shape
         assert data.shape == (30, 100, 5)
@@ -288,7 +354,7 @@ class TestTensorStore(unittest.TestCase):
         data = foo_slice()
 
         # make sure the indices were passed correctly
-        backend.database.return_value.__enter__.return_value.get_tensor.assert_called_once_with('foo', 1, 31, [1, 1], [101, 6])
+        backend.database.return_value.__enter__.return_value.get_tensor.assert_called_once_with('foo', 1, 31, [1, 1], [100, 5])
 
         # assert that the data has the correct shape
         assert data.shape == (30, 100, 5)
@@ -315,10 +381,10 @@ class TestTensorStore(unittest.TestCase):
         data = store.foo[:, 10:30, 4]
 
         # make sure the indices were passed correctly
-        backend.database.return_value.__enter__.return_value.get_tensor.assert_called_once_with('foo', 1, 31, [11, 5], [31, 5])
+        backend.database.return_value.__enter__.return_value.get_tensor.assert_called_once_with('foo', 1, 31, [11, 5], [30, 5])
 
-        # assert that the data has the correct shape
-        assert data.shape == (30, 20, 1)
+        # the integer index drops the last axis
+        assert data.shape == (30, 20)
 
     def test_tensor_slice_without_attr(self):
          # create the backend
@@ -331,7 +397,7 @@ class TestTensorStore(unittest.TestCase):
         backend.database.return_value.__enter__.return_value.get_dataset.return_value = Dataset(1, 'foo', [30, 100, 5], 3, 'float32', False)
 
         # mock the get_tensor function for the full dataset
-        backend.database.return_value.__enter__.return_value.get_tensor.return_value = np.random.random((10, 100, 2))
+        backend.database.return_value.__enter__.return_value.get_tensor.return_value = np.random.random((10, 100, 1))
 
         # create the store
         store = TensorStore(backend)
@@ -340,10 +406,262 @@ class TestTensorStore(unittest.TestCase):
         data = store['foo', :10, :, 2:3]
 
         # make sure the indices were passed correctly
-        backend.database.return_value.__enter__.return_value.get_tensor.assert_called_once_with('foo', 1, 11, [1, 3], [101, 4])
+        backend.database.return_value.__enter__.return_value.get_tensor.assert_called_once_with('foo', 1, 11, [1, 3], [100, 3])
 
         # assert that the data has the correct shape
-        assert data.shape == (10, 100, 2)
+        assert data.shape == (10, 100, 1)
+
+    def test_cached_tensor_reads(self):
+        """
+        Test that repeated reads are served from the row cache and only missing rows are loaded.
+        """
+        # create the backend
+        backend = MagicMock()
+        db = backend.database.return_value.__enter__.return_value
+
+        # mock the dataset and serve full rows of the requested range
+        data = np.random.random((30, 100, 5)).astype(np.float32)
+        db.get_dataset.return_value = Dataset(1, 'foo', [30, 100, 5], 3, 'float32', False)
+        db.get_tensor.side_effect = lambda key, low, up, slice_low, slice_up: data[low - 1:up - 1]
+
+        # create the store with a cache
+        store = TensorStore(backend, cache_size=2**20)
+
+        # the first read loads the full rows
+        arr = store['foo', :10, :, 2]
+        db.get_tensor.assert_called_once_with('foo', 1, 11, [1, 1], [100, 5])
+        np.testing.assert_array_equal(arr, data[:10, :, 2])
+
+        # the cached rows do not keep the fetched batch alive
+        assert not any(np.shares_memory(row, data) for row in store.cache._rows.values())
+
+        # the second read is served from the cache
+        arr = store['foo', 2:8, 4:9]
+        assert db.get_tensor.call_count == 1
+        assert arr.shape == (6, 5, 5)
+        np.testing.assert_array_equal(arr, data[2:8, 4:9])
+
+        # an overlapping read only loads the missing rows
+        store['foo', 5:15]
+        assert db.get_tensor.call_count == 2
+        assert db.get_tensor.call_args[0][1:3] == (11, 16)
+        assert store.cache.hits == 11
+
+        # deleting the dataset invalidates the cache
+        del store['foo']
+        store['foo', 5:15]
+        assert db.get_tensor.call_count == 3
+        assert db.get_tensor.call_args[0][1:3] == (6, 16)
+
+    def test_metadata_cache(self):
+        """
+        Test that slicing in a loop does not load the dataset metadata or keys again.
+        """
+        # create the backend
+        backend = MagicMock()
+        db = backend.database.return_value.__enter__.return_value
+        db.list_dataset_keys.return_value = ['foo']
+        db.get_dataset.return_value = Dataset(1, 'foo', [30, 100, 5], 3, 'float32', False)
+
+        # create the store
+        store = TensorStore(backend)
+
+        for i in range(5):
+            assert 'foo' in store
+            store.foo[i]
+        assert len(store) == 1
+
+        # the keys were only loaded on init, the dataset once
+        db.list_dataset_keys.assert_called_once()
+        db.get_dataset.assert_called_once()
+
+        # the own mutations are written through
+        store['bar'] = np.ones((10, 10))
+        assert 'bar' in store
+        del store['foo']
+        assert 'foo' not in store
+        db.list_dataset_keys.assert_called_once()
+
+        # a refresh loads the keys again
+        store.refresh()
+        assert db.list_dataset_keys.call_count == 2
+
+    def test_metadata_cache_disabled(self):
+        """
+        Test that a TTL of 0 loads the metadata on every access.
+        """
+        # create the backend
+        backend = MagicMock()
+        db = backend.database.return_value.__enter__.return_value
+        db.list_dataset_keys.return_value = ['foo']
+        db.get_dataset.return_value = Dataset(1, 'foo', [30, 100, 5], 3, 'float32', False)
+
+        # create the store
+        store = TensorStore(backend, metadata_ttl=0)
+
+        store.foo[0]
+        store.foo[1]
+        assert 'foo' in store
+
+        assert db.get_dataset.call_count == 2
+        assert db.list_dataset_keys.call_count == 2
+
+    def test_get_many(self):
+        """
+        Test that get_many resolves the metadata in one query and reads all datasets.
+        """
+        # create the backend
+        backend = MagicMock()
+        db = backend.database.return_value.__enter__.return_value
+        db.get_datasets.return_value = [Dataset(1, 'foo', [30, 4], 2, 'float32', False), Dataset(2, 'bar', [30, 4], 2, 'float32', False)]
+
+        # serve the requested rows
+        data = {'foo': np.random.random((30, 4)).astype(np.float32), 'bar': np.random.random((30, 4)).astype(np.float32)}
+        db.get_tensor.side_effect = lambda key, low, up, slice_low, slice_up: data[key][low - 1:up - 1, slice_low[0] - 1:slice_up[0]]
+
+        # create the store
+        store = TensorStore(backend)
+
+        arrays = store.get_many([('foo', (slice(5, 10), )), ('bar', slice(5, 10))])
+        db.get_datasets.assert_called_once_with(['foo', 'bar'])
+        db.get_dataset.assert_not_called()
+        np.testing.assert_array_equal(arrays['foo'], data['foo'][5:10])
+        np.testing.assert_array_equal(arrays['bar'], data['bar'][5:10])
+
+        # the metadata is cached now
+        store.get_many(['foo', 'bar'], max_workers=1)
+        assert db.get_datasets.call_count == 1
+
+        with self.assertRaises(KeyError):
+            store.get_many(['baz'])
+        with self.assertRaises(ValueError):
+            store.get_many(['foo', 'foo'])
+
+        # the default number of concurrent reads is capped
+        db.get_datasets.return_value = [Dataset(i, f"data_{i}", [30, 4], 2, 'float32', False) for i in range(20)]
+        db.get_tensor.side_effect = lambda key, low, up, slice_low, slice_up: data['foo'][low - 1:up - 1, slice_low[0] - 1:slice_up[0]]
+        with patch('tensorage.store.ThreadPoolExecutor', wraps=ThreadPoolExecutor) as executor:
+            arrays = store.get_many([f"data_{i}" for i in range(20)])
+            executor.assert_called_once_with(max_workers=GET_MANY_WORKERS)
+        assert len(arrays) == 20
+
+    def test_split_reads(self):
+        """
+        Test that reads larger than read_bytes are loaded in parts into one tensor.
+        """
+        # create the backend
+        backend = MagicMock()
+        db = backend.database.return_value.__enter__.return_value
+        db.get_dataset.return_value = Dataset(1, 'foo', [30, 4], 2, 'float32', False)
+
+        # serve the requested rows
+        data = np.random.random((30, 4)).astype(np.float32)
+        db.get_tensor.side_effect = lambda key, low, up, slice_low, slice_up, step=[1, 1], out=None: data[low - 1:up - 1:step[0], slice_low[0] - 1:slice_up[0]:step[1]]
+
+        # 7 rows of 2 elements per request
+        store = TensorStore(backend, read_bytes=7 * 2 * 4)
+
+        np.testing.assert_array_equal(store['foo', 2:27, 1:3], data[2:27, 1:3])
+        assert [call[0][1:3] for call in db.get_tensor.call_args_list] == [(3, 10), (10, 17), (17, 24), (24, 28)]
+
+        # steps are kept within the parts
+        db.get_tensor.reset_mock()
+        np.testing.assert_array_equal(store['foo', ::2, 1:3], data[::2, 1:3])
+        assert db.get_tensor.call_count == 3
+
+        # small reads are loaded at once
+        db.get_tensor.reset_mock()
+        store['foo', :5, 1:3]
+        db.get_tensor.assert_called_once()
+
+    def test_iter_batches_prefetch(self):
+        """
+        Test that iter_batches yields consecutive batches in order and passes the inner slices.
+        """
+        # create the backend
+        backend = MagicMock()
+        db = backend.database.return_value.__enter__.return_value
+        db.list_dataset_keys.return_value = ['foo']
+        db.get_dataset.return_value = Dataset(1, 'foo', [25, 4], 2, 'float32', False)
+
+        # serve the requested rows
+        data = np.arange(100, dtype=np.float32).reshape(25, 4)
+        db.get_tensor.side_effect = lambda key, low, up, slice_low, slice_up: data[low - 1:up - 1, slice_low[0] - 1:slice_up[0]]
+
+        # create the store
+        store = TensorStore(backend)
+
+        # iterate with prefetch
+        batches = list(store.foo.iter_batches(10, 2, prefetch=2))
+        assert [b.shape[0] for b in batches] == [10, 10, 5]
+        np.testing.assert_array_equal(np.concatenate(batches), data[:, 2])
+        assert all(call[0][3:] == ([3], [3]) for call in db.get_tensor.call_args_list)
+
+        # without prefetch, the batches are loaded on request
+        db.get_tensor.reset_mock()
+        iterator = store.foo.iter_batches(5, prefetch=0)
+        next(iterator)
+        assert db.get_tensor.call_count == 1
+        iterator.close()
+
+        with self.assertRaises(ValueError):
+            next(store.foo.iter_batches(0))
+
+    def test_write_stream(self):
+        """
+        Test that a stream of uneven batches is regrouped, uploaded with the correct offsets
+        and the shape is finalized at the end.
+        """
+        # create a mock backend
+        backend = MagicMock()
+        db = backend.database.return_value.__enter__.return_value
+        db.insert_dataset.return_value = Dataset(3, 'stream', [0, 5], 2, 'float32', False)
+
+        # 20 elements per upload are 4 rows
+        store = TensorStore(backend, chunk_size=20, quiet=True)
+
+        data = np.random.random((11, 5))
+        store.write_stream('stream', (data[i:i + 3] for i in range(0, 11, 3)), (5, ))
+
+        db.insert_dataset.assert_called_once_with('stream', (0, 5), 2)
+        offsets = [call[1]['offset'] for call in db.insert_tensor.call_args_list]
+        assert offsets == [0, 4, 8]
+        np.testing.assert_array_equal(np.concatenate([call[0][1] for call in db.insert_tensor.call_args_list]), data)
+        db.set_dataset_shape.assert_called_once_with(3, [11, 5])
+        assert 'stream' in store
+
+        # a batch with the wrong inner shape removes the dataset again
+        with self.assertRaises(ValueError):
+            store.write_stream('broken', [np.ones((2, 5)), np.ones((2, 4))], (5, ))
+        db.remove_dataset.assert_called_once_with('broken')
+
+    def test_write_lazy_source(self):
+        """
+        Test that a lazily sliceable source is read batch by batch.
+        """
+        class Source:
+            def __init__(self, data):
+                self.data = data
+                self.shape = data.shape
+                self.reads = []
+
+            def __getitem__(self, idx):
+                self.reads.append(idx)
+                return self.data[idx]
+
+        # create a mock backend
+        backend = MagicMock()
+        db = backend.database.return_value.__enter__.return_value
+        db.insert_dataset.return_value = Dataset(4, 'lazy', [0, 4, 5], 3, 'float32', False)
+
+        # 40 elements per read are 2 rows
+        store = TensorStore(backend, chunk_size=40, quiet=True)
+        source = Source(np.random.random((7, 4, 5)))
+        store['lazy'] = source
+
+        assert source.reads == [slice(0, 2), slice(2, 4), slice(4, 6), slice(6, 8)]
+        assert db.insert_tensor.call_count == 4
+        db.set_dataset_shape.assert_called_once_with(4, [7, 4, 5])
 
     def test_missing_key(self):
         """
@@ -410,17 +728,17 @@ class TestTensorStore(unittest.TestCase):
         # test slice options without slicing
         _, idx, slc = slicer.get_iloc_slices()
         assert idx == [1, 31]
-        assert slc == [[1, 101], [1, 21], [1, 6]]
+        assert slc == [[1, 100], [1, 20], [1, 5]]
         
         # pass only 1 argument, along first axis
         _, idx, slc = slicer.get_iloc_slices(10)
         assert idx == [11, 12]
-        assert slc == [[1, 101], [1, 21], [1, 6]]
+        assert slc == [[1, 100], [1, 20], [1, 5]]
 
         # pass more than one argument, but lack one dimension
         _, idx, slc = slicer.get_iloc_slices(10, slice(5, 7))
         assert idx == [11, 12]
-        assert slc == [[6, 8], [1, 21], [1, 6]]
+        assert slc == [[6, 7], [1, 20], [1, 5]]
 
     def test_slicer_argument_errors(self):
         """
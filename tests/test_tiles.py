@@ -0,0 +1,137 @@
+import unittest
+from unittest.mock import MagicMock
+
+import numpy as np
+
+from tensorage.backend.database import DatabaseContext, encode_float4
+from tensorage.store import TensorStore
+from tensorage.tiles import resolve_bounds, tile_range, split_tiles, batch_tiles, assemble_tiles, row_chunk_shape
+from tensorage.types import Dataset
+
+
+class TestTiles(unittest.TestCase):
+    def test_split_and_assemble(self):
+        """
+        Split a tensor into tiles, including smaller edge tiles, and cut a slice out of them.
+        """
+        data = np.random.random((10, 7, 5)).astype(np.float32)
+        tiles = list(split_tiles(data, (4, 3, 5)))
+
+        # 3 x 3 x 1 tiles, the last ones along the first two axes are smaller
+        assert len(tiles) == 9
+        assert dict(tiles)[(2, 2, 0)].shape == (2, 1, 5)
+
+        # cut out a slice from the touched tiles only
+        bounds = [(3, 9), (2, 4), (1, 2)]
+        coords_low, coords_up = tile_range(bounds, (4, 3, 5))
+        assert coords_low == (0, 0, 0)
+        assert coords_up == (2, 1, 0)
+
+        touched = [(c, t) for c, t in tiles if all(low <= x <= up for x, low, up in zip(c, coords_low, coords_up))]
+        assert len(touched) == 6
+        np.testing.assert_array_equal(assemble_tiles(bounds, (4, 3, 5), touched), data[3:9, 2:4, 1:2])
+
+    def test_resolve_bounds(self):
+        """
+        The database index excludes the upper bound, the slices include it. Both are clamped.
+        """
+        assert resolve_bounds([30, 100, 5], 1, 31, [11, 5], [31, 5]) == [(0, 30), (10, 31), (4, 5)]
+        assert resolve_bounds([30, 100, 5], 1, 50, [1, 1], [101, 6]) == [(0, 30), (0, 100), (0, 5)]
+        assert tile_range([(0, 0), (0, 10)], (4, 4)) is None
+
+    def test_batch_tiles(self):
+        """
+        Tiles are grouped by chunk_size elements, with at least one tile per batch.
+        """
+        tiles = list(split_tiles(np.ones((8, 8)), (4, 4)))
+        assert [len(b) for b in batch_tiles(tiles, 40)] == [2, 2]
+        assert [len(b) for b in batch_tiles(tiles, 1)] == [1, 1, 1, 1]
+
+    def test_row_chunk_shape(self):
+        """
+        Tiles hold full rows, unless a single row exceeds chunk_size.
+        """
+        assert row_chunk_shape((100, 10, 10), 1000) == (10, 10, 10)
+        assert row_chunk_shape((100, 50), 1000) == (20, 50)
+        assert row_chunk_shape((2, 1000, 1000), 100000) == (1, 100, 1000)
+        assert row_chunk_shape((2, 10, 10**6), 10**5) == (1, 1, 10**5)
+
+    def test_get_tiled_tensor(self):
+        """
+        Mock the tile RPC and check that only the touched tiles are requested.
+        """
+        data = np.random.random((10, 7, 5)).astype(np.float32)
+        dataset = Dataset(1, 'foo', [10, 7, 5], 3, 'float32', False, chunk_shape=[4, 3, 5])
+        tiles = dict(split_tiles(data, (4, 3, 5)))
+
+        def tiles_rpc(name, params):
+            rows = [{'coords': list(c), 'tensor': encode_float4(t)} for c, t in tiles.items() if all(low <= x <= up for x, low, up in zip(c, params['coords_low'], params['coords_up']))]
+            response = MagicMock()
+            response.execute.return_value.data = rows
+            return response
+
+        backend = MagicMock()
+        backend.client.rpc.side_effect = tiles_rpc
+        db = DatabaseContext(backend)
+
+        # a single pixel time series
+        arr = db.get_tiled_tensor(dataset, 1, 11, [5, 5], [5, 5])
+        assert backend.client.rpc.call_args[0][1]['coords_low'] == [0, 1, 0]
+        assert backend.client.rpc.call_args[0][1]['coords_up'] == [2, 1, 0]
+        np.testing.assert_array_equal(arr, data[:, 4:5, 4:5])
+
+    def test_compressed_tiles_roundtrip(self):
+        """
+        Compressed tiles are encoded on insert and decoded on read.
+        """
+        data = np.random.random((10, 7, 5)).astype(np.float32)
+        dataset = Dataset(1, 'foo', [10, 7, 5], 3, 'float32', False, chunk_shape=[4, 7, 5], compressor='shuffle+zlib')
+
+        # insert the tiles and keep the payload
+        backend = MagicMock()
+        db = DatabaseContext(backend)
+        db.insert_tiles(1, list(split_tiles(data, (4, 7, 5))), compressor='shuffle+zlib')
+        payload = backend.client.rpc.call_args[0][1]
+        assert payload['coords'] == [0, 0, 0, 1, 0, 0, 2, 0, 0]
+
+        # serve the stored tiles back
+        backend.client.rpc.return_value.execute.return_value.data = [{'coords': [i, 0, 0], 'tensor': t} for i, t in enumerate(payload['tensors'])]
+        np.testing.assert_array_equal(db.get_tiled_tensor(dataset, 3, 9, [2, 1], [4, 5]), data[2:8, 1:4])
+
+    def test_store_tiled_upload(self):
+        """
+        A store with chunk_shape records the chunk shape and uploads tiles.
+        """
+        backend = MagicMock()
+        db = backend.database.return_value.__enter__.return_value
+        db.insert_dataset.return_value = Dataset(1, 'foo', (10, 7, 5), 3, 'float32', False, chunk_shape=[4, 3, 5])
+
+        store = TensorStore(backend, chunk_shape=(4, 3, 5), quiet=True)
+        store['foo'] = np.random.random((10, 7, 5))
+
+        db.insert_dataset.assert_called_once_with('foo', (10, 7, 5), 3, chunk_shape=(4, 3, 5))
+        db.insert_tensor.assert_not_called()
+        assert sum(len(call[0][1]) for call in db.insert_tiles.call_args_list) == 9
+
+        # a compressor stores full rows in tiles by default
+        store = TensorStore(backend, compressor='shuffle+zlib', chunk_size=70, quiet=True)
+        store['bar'] = np.random.random((10, 7, 5))
+        db.insert_dataset.assert_called_with('bar', (10, 7, 5), 3, chunk_shape=(2, 7, 5), compressor='shuffle+zlib')
+        assert db.insert_tiles.call_args[1]['compressor'] == 'shuffle+zlib'
+
+        # streamed blocks are tiled with the correct coordinates
+        db.insert_tiles.reset_mock()
+        store = TensorStore(backend, chunk_shape=(4, 7, 5), quiet=True)
+        store.write_stream('baz', [np.ones((3, 7, 5)), np.ones((6, 7, 5))], (7, 5))
+        coords = [c for call in db.insert_tiles.call_args_list for c, _ in call[0][1]]
+        assert coords == [(0, 0, 0), (1, 0, 0), (2, 0, 0)]
+        db.set_dataset_shape.assert_called_with(1, [9, 7, 5])
+
+        # appending to tiled datasets is not supported
+        db.get_dataset.return_value = db.insert_dataset.return_value
+        with self.assertRaises(ValueError):
+            store.append('foo', np.ones((2, 7, 5)))
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,99 @@
+import unittest
+from unittest.mock import MagicMock
+import base64
+import json
+import os
+import tempfile
+
+import numpy as np
+
+from tensorage import tracing
+from tensorage.backend.database import DatabaseContext
+from tensorage.session import LocalSession
+from tensorage.store import TensorStore
+
+
+class TestTracing(unittest.TestCase):
+    def tearDown(self) -> None:
+        tracing.disable()
+        return super().tearDown()
+
+    def test_disabled(self):
+        """
+        Without an active tracer, spans do not record anything.
+        """
+        assert tracing.get_tracer() is None
+        with tracing.span('foo'):
+            pass
+        assert tracing.get_tracer() is None
+
+    def test_nested_spans(self):
+        """
+        Spans nest by time and are exported as Chrome trace JSON.
+        """
+        tracer = tracing.enable()
+        with tracing.span('outer'):
+            with tracing.span('inner', 'network', rpc='foo'):
+                pass
+
+        inner, outer = tracer.events
+        assert inner['name'] == 'inner' and inner['args'] == {'rpc': 'foo'}
+        assert outer['ts'] <= inner['ts']
+        assert outer['ts'] + outer['dur'] >= inner['ts'] + inner['dur']
+
+        with tempfile.TemporaryDirectory() as tmp:
+            path = os.path.join(tmp, 'trace.json')
+            tracer.export(path)
+            with open(path) as f:
+                trace = json.load(f)
+        assert [e['name'] for e in trace['traceEvents']] == ['inner', 'outer']
+        assert all(e['ph'] == 'X' for e in trace['traceEvents'])
+
+    def test_store_trace(self):
+        """
+        The store traces its public operations and borrowing the session.
+        """
+        store = TensorStore(LocalSession(), engine='local', quiet=True, trace=True)
+        store['foo'] = np.ones((4, 3))
+        store['foo', 1:3]
+
+        names = [e['name'] for e in tracing.get_tracer().events]
+        for name in ('store.setitem', 'slicer.getitem', 'store.get_dataset', 'ensure_session'):
+            assert name in names
+
+    def test_method_spans(self):
+        """
+        Each public method of the store is traced under its own name.
+        """
+        store = TensorStore(LocalSession(), engine='local', quiet=True)
+        store['foo'] = np.ones((4, 3), dtype=np.float32)
+
+        tracer = tracing.enable(tracing.Tracer())
+        store.reduce('foo', 'sum', axis=0)
+        names = [e['name'] for e in tracer.events]
+        assert 'store.reduce' in names and 'store.read_into' not in names
+
+        tracer = tracing.enable(tracing.Tracer())
+        store.read_into('foo', (slice(0, 2), ), out=np.zeros((2, 3), dtype=np.float32))
+        names = [e['name'] for e in tracer.events]
+        assert 'store.read_into' in names and 'store.reduce' not in names
+
+    def test_database_phases(self):
+        """
+        The database context traces auth, network and decoding phases.
+        """
+        backend = MagicMock()
+        response = MagicMock()
+        response.data = [{'tensor': base64.b64encode(np.ones((2, 3), dtype='>f4').tobytes()).decode(), 'shape': [2, 3]}]
+        backend.client.rpc.return_value.execute.return_value = response
+
+        tracer = tracing.enable()
+        DatabaseContext(backend).get_tensor('foo', 1, 3, [1], [3])
+        DatabaseContext(backend).insert_tensor(1, [np.ones(3)])
+
+        names = [e['name'] for e in tracer.events]
+        assert names == ['setup_auth', 'request', 'decode', 'setup_auth', 'serialize', 'request']
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,136 @@
+import unittest
+from unittest.mock import MagicMock
+
+import numpy as np
+
+from tensorage.session import LocalSession
+from tensorage.store import TensorStore, split_batches
+from tensorage.tuning import BatchTuner
+from tensorage.types import Dataset
+
+
+class TestBatchTuner(unittest.TestCase):
+    def test_split_batches(self):
+        """
+        The batch size works for any number of dimensions and rows larger than chunk_size.
+        """
+        for shape in [(10, 7), (10, 3, 4), (10, 2, 3, 4)]:
+            value = np.ones(shape)
+            batches, batch_size = split_batches(value, 20)
+            row = int(np.prod(shape[1:]))
+            assert batch_size == max(1, 20 // row)
+            assert [offset for offset, _ in batches] == list(range(0, 10, batch_size))
+            assert sum(len(batch) for _, batch in batches) == 10
+
+    def test_adaptive_target(self):
+        """
+        The target grows while the throughput improves and steps back once it drops.
+        """
+        tuner = BatchTuner(target_bytes=1000, min_bytes=100, max_bytes=10000)
+
+        tuner.observe(1000, 1.0)
+        assert tuner.target_bytes == 2000
+        tuner.observe(2000, 1.0)
+        assert tuner.target_bytes == 4000
+
+        # same throughput, the target is kept
+        tuner.observe(4000, 2.0)
+        assert tuner.target_bytes == 4000
+
+        # slower, step back
+        tuner.observe(4000, 4.0)
+        assert tuner.target_bytes == 2000
+
+        # small last batches are ignored
+        tuner.observe(10, 100.0)
+        assert tuner.target_bytes == 2000
+
+    def test_reject(self):
+        """
+        A rejected request lowers the payload limit.
+        """
+        tuner = BatchTuner(target_bytes=8000, max_bytes=10000)
+        tuner.reject(8000)
+        assert tuner.max_bytes == 4000
+        assert tuner.target_bytes == 4000
+
+        tuner.observe(4000, 0.1)
+        assert tuner.target_bytes == 4000
+
+    def test_batches(self):
+        """
+        The batches follow the target, which may change during the upload.
+        """
+        tuner = BatchTuner(target_bytes=40, adaptive=False)
+        batches = tuner.batches(np.ones((10, 5), dtype=np.float32))
+
+        assert next(batches)[1].shape == (2, 5)
+        tuner.target_bytes = 80
+        offset, batch = next(batches)
+        assert offset == 2 and batch.shape == (4, 5)
+        assert sum(len(b) for _, b in batches) == 4
+
+    def test_store_request_bytes(self):
+        """
+        Uploads targeting a payload per request, also for rows larger than the payload.
+        """
+        data = np.random.random((20, 6, 5)).astype(np.float32)
+        for request_bytes in ('auto', 64, 400):
+            store = TensorStore(LocalSession(), engine='local', quiet=True, request_bytes=request_bytes)
+            store['foo'] = data
+            np.testing.assert_array_equal(store['foo'], data)
+
+        # rows of 120 bytes fit into requests of 400 bytes
+        assert store.get_dataset('foo').chunk_shape is None
+
+        # larger rows are kept in rows and uploaded one row per request
+        store = TensorStore(LocalSession(), engine='local', quiet=True, request_bytes=64)
+        store['foo'] = data
+        assert store.get_dataset('foo').chunk_shape is None
+
+        # unless they are split into tiles explicitly
+        store = TensorStore(LocalSession(), engine='local', quiet=True, request_bytes=64, split_rows=True)
+        store['foo'] = data
+        assert store.get_dataset('foo').chunk_shape == [1, 3, 5]
+        np.testing.assert_array_equal(store['foo'], data)
+
+    def test_large_rows(self):
+        """
+        Rows larger than a request get the same layout from every entry point and can be appended to.
+        """
+        data = np.random.random((20, 6, 5)).astype(np.float32)
+        for kwargs in (dict(chunk_size=10), dict(request_bytes=64)):
+            store = TensorStore(LocalSession(), engine='local', quiet=True, **kwargs)
+            store['foo'] = data[:10]
+            store.append('foo', data[10:])
+            store.write_stream('bar', (data[i:i + 3] for i in range(0, 20, 3)), (6, 5))
+
+            assert store.get_dataset('foo').chunk_shape is None
+            assert store.get_dataset('bar').chunk_shape is None
+            np.testing.assert_array_equal(store['foo'], data)
+            np.testing.assert_array_equal(store['bar'], data)
+
+            # opting in splits the rows of streams as well
+            store = TensorStore(LocalSession(), engine='local', quiet=True, split_rows=True, **kwargs)
+            store.write_stream('bar', (data[i:i + 3] for i in range(0, 20, 3)), (6, 5))
+            assert store.get_dataset('bar').chunk_shape is not None
+            np.testing.assert_array_equal(store['bar'], data)
+
+    def test_large_rows_storage(self):
+        """
+        The storage engine, which has no tiled layout, uploads large rows one by one.
+        """
+        backend = MagicMock()
+        db = backend.storage.return_value.__enter__.return_value
+        db.insert_dataset.return_value = Dataset('foo', 'foo', [4, 6, 5], 3, 'float32', False)
+
+        store = TensorStore(backend, engine='storage', quiet=True, chunk_size=10)
+        store['foo'] = np.ones((4, 6, 5), dtype=np.float32)
+
+        db.insert_tiles.assert_not_called()
+        db.insert_dataset.assert_called_once_with('foo', (4, 6, 5), 3)
+        assert db.insert_tensor.call_count == 4
+
+
+if __name__ == '__main__':
+    unittest.main()